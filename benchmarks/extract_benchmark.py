@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+# Compares extraction wall time of a runner-sized archive between the tarfile
+# fallback and the external decoders used by faugus-proton-downloader.
+#
+#   python3 benchmarks/extract_benchmark.py --size-mb 512 --cores 1 2 4 0
+
+import argparse
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def load_downloader():
+    spec = importlib.util.spec_from_file_location("faugus_proton_downloader", ROOT / "faugus_proton_downloader.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def make_tree(root, size_mb):
+    # Roughly what a Proton build looks like: many small text files and a few large binaries
+    root.mkdir(parents=True)
+    written = 0
+    index = 0
+    target = size_mb * 1024 * 1024
+    while written < target:
+        directory = root / f"lib{index % 16}"
+        directory.mkdir(exist_ok=True)
+        if index % 8 == 0:
+            data = os.urandom(4 * 1024 * 1024)
+        else:
+            data = ("\n".join(f"symbol_{index}_{i} = 0x{i:08x}" for i in range(4000))).encode()
+        (directory / f"file{index}.bin").write_bytes(data)
+        written += len(data)
+        index += 1
+
+def make_archive(tree, archive):
+    tar_path = archive.with_suffix("")
+    with tarfile.open(tar_path, "w") as tar:
+        tar.add(tree, arcname=tree.name)
+    if archive.name.endswith(".xz"):
+        # Multi-threaded compression writes independent blocks, which is what
+        # allows xz to decompress in parallel
+        command = ["xz", "-T0", "-6", "-f", str(tar_path)]
+    else:
+        command = ["gzip", "-6", "-f", str(tar_path)]
+    subprocess.run(command, check=True)
+
+def time_extract(downloader, archive, workdir, threads):
+    os.environ["FAUGUS_DECOMPRESS_THREADS"] = str(threads)
+    output = workdir / f"out-{threads}"
+    shutil.rmtree(output, ignore_errors=True)
+    output.mkdir()
+    backend = downloader.find_decompressor(archive.name)
+    start = time.perf_counter()
+    with open(archive, "rb") as f:
+        downloader.extract_archive(f, archive.name, output)
+    elapsed = time.perf_counter() - start
+    shutil.rmtree(output)
+    if not backend:
+        return elapsed, "tarfile"
+    return elapsed, " ".join([os.path.basename(backend[0])] + backend[1:])
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark runner archive extraction")
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--format", choices=["xz", "gz"], default="xz")
+    parser.add_argument("--cores", type=int, nargs="+", default=[1, 2, 4, 0],
+                        help="thread counts to test; 1 uses tarfile, 0 uses every core")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    downloader = load_downloader()
+    with tempfile.TemporaryDirectory(prefix="faugus-extract-") as tmp:
+        workdir = Path(tmp)
+        archive = workdir / f"proton-bench.tar.{args.format}"
+        make_tree(workdir / "proton-bench", args.size_mb)
+        make_archive(workdir / "proton-bench", archive)
+        shutil.rmtree(workdir / "proton-bench")
+
+        results = []
+        for threads in args.cores:
+            times = []
+            backend = ""
+            for _ in range(args.runs):
+                elapsed, backend = time_extract(downloader, archive, workdir, threads)
+                times.append(elapsed)
+            result = {
+                "threads": threads or os.cpu_count(),
+                "backend": backend,
+                "best": min(times),
+                "mean": sum(times) / len(times),
+            }
+            results.append(result)
+            print(f"{result['threads']:>3} threads  {backend:<20} best {result['best']:.2f}s  mean {result['mean']:.2f}s")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "archive": archive.name,
+                "size_mb": args.size_mb,
+                "cpu_count": os.cpu_count(),
+                "python": sys.version.split()[0],
+                "results": results,
+            }, f, indent=4)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+
+# Times the launcher's library code paths against synthetic games.json files of
+# different sizes, in every interface mode, on an offscreen display.
+#
+#   python3 benchmarks/ui_benchmark.py --sizes 100 1000 10000 --json ui.json
+#
+# Without a display, Xvfb or broadwayd is started for the duration of the run.
+
+import argparse
+import importlib.util
+import json
+import os
+import shutil
+import socket
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULT_PREFIX = "BENCHMARK-RESULT "
+SEARCH_QUERY = "game 12"
+FIRST_FRAME_TIMEOUT = 60
+
+def make_png(width, height, rgb):
+    # A solid color PNG, enough for GdkPixbuf to decode and scale
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    row = b"\0" + bytes(rgb) * width
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(row * height))
+            + chunk(b"IEND", b""))
+
+def make_library(config_home, size, mode, art):
+    faugus_dir = config_home / "faugus-launcher"
+    icons_dir = faugus_dir / "icons"
+    banners_dir = faugus_dir / "banners"
+    for directory in (faugus_dir, icons_dir, banners_dir):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    icon = make_png(64, 64, (200, 60, 60))
+    banner = make_png(230, 345, (60, 60, 200))
+
+    games = []
+    for index in range(size):
+        gameid = f"game-{index}"
+        banner_path = ""
+        if art:
+            (icons_dir / f"{gameid}.ico").write_bytes(icon)
+            banner_path = str(banners_dir / f"{gameid}.png")
+            Path(banner_path).write_bytes(banner)
+        games.append({
+            "gameid": gameid, "title": f"Game {index}", "path": f"/games/{gameid}/game.exe",
+            "prefix": f"/prefixes/{gameid}", "launch_arguments": "", "game_arguments": "", "mangohud": "",
+            "gamemode": "", "disable_hidraw": "", "protonfix": "", "runner": "GE-Proton", "addapp_checkbox": "",
+            "addapp": "", "addapp_bat": "", "banner": banner_path, "lossless": "",
+        })
+
+    with open(faugus_dir / "games.json", "w", encoding="utf-8") as f:
+        json.dump(games, f, ensure_ascii=False, indent=4)
+    with open(faugus_dir / "config.ini", "w") as f:
+        f.write(f"interface-mode={mode}\n")
+
+def free_display_number():
+    for number in range(90, 200):
+        if not os.path.exists(f"/tmp/.X11-unix/X{number}") and not os.path.exists(f"/tmp/.X{number}-lock"):
+            return number
+    raise RuntimeError("no free display number")
+
+def start_display(backend):
+    # Returns the environment for the children and the display server to stop afterwards
+    if backend == "auto":
+        if os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"):
+            backend = "current"
+        elif shutil.which("Xvfb"):
+            backend = "xvfb"
+        elif shutil.which("broadwayd"):
+            backend = "broadway"
+        else:
+            raise SystemExit("No display found, install Xvfb or broadwayd")
+
+    env = dict(os.environ)
+    if backend == "current":
+        return env, None
+
+    number = free_display_number()
+    if backend == "xvfb":
+        server = subprocess.Popen(["Xvfb", f":{number}", "-screen", "0", "1920x1080x24", "-nolisten", "tcp"],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        env.update({"DISPLAY": f":{number}", "GDK_BACKEND": "x11"})
+        ready = lambda: os.path.exists(f"/tmp/.X11-unix/X{number}")
+    else:
+        server = subprocess.Popen(["broadwayd", f":{number}"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        env.update({"BROADWAY_DISPLAY": f":{number}", "GDK_BACKEND": "broadway"})
+        ready = lambda: port_open(8080 + number)
+    env.pop("WAYLAND_DISPLAY", None)
+
+    deadline = time.monotonic() + 10
+    while not ready():
+        if server.poll() is not None or time.monotonic() > deadline:
+            server.kill()
+            raise SystemExit(f"Failed to start the {backend} display")
+        time.sleep(0.05)
+    return env, server
+
+def port_open(port):
+    try:
+        socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+        return True
+    except OSError:
+        return False
+
+def summarize(times):
+    return {"best": min(times), "median": statistics.median(times), "max": max(times)}
+
+def run_child(params):
+    # Runs in a fresh interpreter, so the launcher module reads the synthetic XDG dirs on import
+    sys.argv = [str(ROOT / "faugus_launcher.py")]
+    spec = importlib.util.spec_from_file_location("faugus_launcher", ROOT / "faugus_launcher.py")
+    launcher = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(launcher)
+    Gtk = launcher.Gtk
+
+    def drain(app):
+        # Runs the main loop until the library has been rebound and pending events are done
+        while app.library_layout_id or Gtk.events_pending():
+            Gtk.main_iteration_do(False)
+
+    def timed(function, app, runs):
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            function()
+            drain(app)
+            times.append(time.perf_counter() - start)
+        return summarize(times)
+
+    first_frame = []
+    app = launcher.Main()
+    app.connect_after("draw", lambda *args: first_frame.append(time.monotonic()) and False)
+    deadline = time.monotonic() + FIRST_FRAME_TIMEOUT
+    while not first_frame and time.monotonic() < deadline:
+        Gtk.main_iteration_do(True)
+    drain(app)
+
+    runs = params["runs"]
+    results = {
+        "startup_to_first_frame": first_frame[0] - params["started"] if first_frame else None,
+        "load_games": timed(app.load_games, app, runs),
+    }
+
+    keystrokes = []
+    for _ in range(runs):
+        for length in range(1, len(SEARCH_QUERY) + 1):
+            start = time.perf_counter()
+            app.entry_search.set_text(SEARCH_QUERY[:length])
+            app.flush_search()
+            drain(app)
+            keystrokes.append(time.perf_counter() - start)
+        app.entry_search.set_text("")
+        app.flush_search()
+        drain(app)
+    results["search_keystroke"] = summarize(keystrokes)
+
+    def save():
+        app.save_games()
+        launcher.game_store.flush()
+
+    results["save_games"] = timed(save, app, runs)
+    results["update_list"] = timed(app.update_list, app, runs)
+    results["create_tray_menu"] = timed(app.create_tray_menu, app, runs)
+
+    print(RESULT_PREFIX + json.dumps(results), flush=True)
+    os._exit(0)
+
+def run_case(env, size, mode, art, runs):
+    with tempfile.TemporaryDirectory(prefix="faugus-ui-") as tmp:
+        workdir = Path(tmp)
+        make_library(workdir / "config", size, mode, art)
+        child_env = dict(env)
+        child_env.update({
+            "XDG_CONFIG_HOME": str(workdir / "config"),
+            "XDG_DATA_HOME": str(workdir / "data"),
+            "XDG_CACHE_HOME": str(workdir / "cache"),
+        })
+        params = {"started": time.monotonic(), "runs": runs}
+        process = subprocess.run([sys.executable, __file__, "--child", json.dumps(params)], env=child_env,
+                                 stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        for line in process.stdout.splitlines():
+            if line.startswith(RESULT_PREFIX):
+                return json.loads(line[len(RESULT_PREFIX):])
+        raise RuntimeError(f"{size} games in {mode} mode exited with status {process.returncode}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the launcher's library and UI code paths")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--modes", nargs="+", choices=["List", "Blocks", "Banners"], default=["List", "Blocks", "Banners"])
+    parser.add_argument("--art", choices=["with", "without", "both"], default="both",
+                        help="whether the games have icons and banners")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--display", choices=["auto", "current", "xvfb", "broadway"], default="auto")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(json.loads(args.child))
+        return
+
+    art_cases = {"with": [True], "without": [False], "both": [False, True]}[args.art]
+    env, server = start_display(args.display)
+    results = []
+    try:
+        for size in args.sizes:
+            for mode in args.modes:
+                for art in art_cases:
+                    try:
+                        result = run_case(env, size, mode, art, args.runs)
+                    except RuntimeError as e:
+                        print(e)
+                        continue
+                    result.update({"games": size, "mode": mode, "art": art})
+                    results.append(result)
+                    startup = result["startup_to_first_frame"]
+                    startup = f"{startup:.2f}s" if startup is not None else "n/a"
+                    print(f"{size:>6} {mode:<8} {'art' if art else 'no art':<7} startup {startup}"
+                          f"  load {result['load_games']['median'] * 1000:.1f}ms"
+                          f"  keystroke {result['search_keystroke']['median'] * 1000:.1f}ms"
+                          f"  save {result['save_games']['median'] * 1000:.1f}ms"
+                          f"  update {result['update_list']['median'] * 1000:.1f}ms"
+                          f"  tray {result['create_tray_menu']['median'] * 1000:.1f}ms")
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "display": args.display,
+                "cpu_count": os.cpu_count(),
+                "python": sys.version.split()[0],
+                "runs": args.runs,
+                "results": results,
+            }, f, indent=4)
+
+if __name__ == "__main__":
+    main()
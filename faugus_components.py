@@ -1,7 +1,8 @@
 #!/usr/bin/python3
 
 import os
-import requests
+import json
+import time
 import tarfile
 import shutil
 
@@ -11,18 +12,77 @@ config_dir = os.getenv('XDG_CONFIG_HOME', os.path.expanduser('~/.config'))
 BE_URL = "https://github.com/Faugus/components/releases/download/{}/be.tar.gz"
 EAC_URL = "https://github.com/Faugus/components/releases/download/{}/eac.tar.gz"
 DOWNLOAD_DIR = f"{config_dir}/faugus-launcher/components"
+STAGING_DIR = f"{DOWNLOAD_DIR}.new"
+OLD_DIR = f"{DOWNLOAD_DIR}.old"
 REPO_URL = "https://api.github.com/repos/Faugus/components/releases/latest"
 VERSION_FILE = f"{DOWNLOAD_DIR}/version.txt"
+STATE_FILE = f"{config_dir}/faugus-launcher/components.json"
+CONFIG_FILE = f"{config_dir}/faugus-launcher/config.ini"
+
+DEFAULT_CHECK_HOURS = 24
+TIMEOUT = (5, 15)
+CHUNK_SIZE = 1024 * 1024
+
+# Function to read how often the remote version is checked
+def get_check_interval():
+    hours = DEFAULT_CHECK_HOURS
+    if os.path.isfile(CONFIG_FILE):
+        with open(CONFIG_FILE, "r") as f:
+            for line in f.read().splitlines():
+                key, sep, value = line.partition('=')
+                if sep and key.strip() == 'components-check-hours':
+                    try:
+                        hours = float(value.strip().strip('"'))
+                    except ValueError:
+                        pass
+    return max(hours, 0) * 3600
+
+# Functions to keep the time, ETag and tag of the last check
+def load_state():
+    try:
+        with open(STATE_FILE, "r") as f:
+            state = json.load(f)
+        if isinstance(state, dict):
+            return state
+    except (OSError, ValueError):
+        pass
+    return {}
+
+def save_state(state):
+    tmp_path = f"{STATE_FILE}.tmp"
+    try:
+        os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, STATE_FILE)
+    except OSError as e:
+        print(f"Failed to save {STATE_FILE}: {e}", flush=True)
 
 # Function to get the latest version from GitHub releases
-def get_latest_version():
-    response = requests.get(REPO_URL)
+def get_latest_version(state):
+    import requests
+
+    headers = {"Accept": "application/vnd.github+json"}
+    if state.get("etag") and state.get("version"):
+        headers["If-None-Match"] = state["etag"]
+
+    try:
+        response = requests.get(REPO_URL, headers=headers, timeout=TIMEOUT)
+    except requests.RequestException as e:
+        print(f"Failed to access {REPO_URL}: {e}", flush=True)
+        return None
+
+    # 304 means the release is unchanged, and it does not count against the rate limit
+    if response.status_code == 304:
+        return state["version"]
     if response.status_code == 200:
         release_info = response.json()
-        return release_info['tag_name']  # Returns the latest tag name
-    else:
-        print(f"Failed to access {REPO_URL}. Status code: {response.status_code}", flush=True)
-        return None
+        state["etag"] = response.headers.get("ETag")
+        state["version"] = release_info['tag_name']
+        return state["version"]
+
+    print(f"Failed to access {REPO_URL}. Status code: {response.status_code}", flush=True)
+    return None
 
 # Function to get the installed version from a local file
 def get_installed_version():
@@ -31,60 +91,97 @@ def get_installed_version():
             return f.read().strip()
     return None
 
-# Function to download and extract the tar.gz file
+def components_installed():
+    return all(os.path.isdir(os.path.join(DOWNLOAD_DIR, name)) for name in ("be", "eac"))
+
+# Function to download the tar.gz file to disk and extract it
 def download_and_extract(url, download_dir):
+    import requests
+
     file_name = url.split('/')[-1]
     download_path = os.path.join(download_dir, file_name)
 
-    # Download the file
-    response = requests.get(url, stream=True)
-    if response.status_code == 200:
-        with open(download_path, "wb") as f:
-            f.write(response.content)
-
-        # Extract the file with a filter to avoid deprecation warning
+    try:
+        with requests.get(url, stream=True, timeout=TIMEOUT) as response:
+            if response.status_code != 200:
+                print(f"Failed to download {file_name}. Status code: {response.status_code}", flush=True)
+                return False
+            with open(download_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    f.write(chunk)
+    except requests.RequestException as e:
+        print(f"Failed to download {file_name}: {e}", flush=True)
+        return False
+
+    try:
         with tarfile.open(download_path, "r:gz") as tar:
-            # The filter function now accepts two arguments: tarinfo and path
             tar.extractall(path=download_dir, filter=lambda tarinfo, path: tarinfo)
-
-        # Remove the .tar.gz file after extraction
+    except (OSError, tarfile.TarError) as e:
+        print(f"Failed to extract {file_name}: {e}", flush=True)
+        return False
+    finally:
         os.remove(download_path)
-        print("Done!", flush=True)
-    else:
-        print(f"Failed to download {file_name}. Status code: {response.status_code}", flush=True)
+
+    print("Done!", flush=True)
+    return True
+
+# Function to replace the components directory with the staged one
+def swap_in_staging():
+    if os.path.exists(OLD_DIR):
+        shutil.rmtree(OLD_DIR)
+    if os.path.exists(DOWNLOAD_DIR):
+        os.rename(DOWNLOAD_DIR, OLD_DIR)
+    os.rename(STAGING_DIR, DOWNLOAD_DIR)
+    shutil.rmtree(OLD_DIR, ignore_errors=True)
+
+def install_version(version):
+    if os.path.exists(STAGING_DIR):
+        shutil.rmtree(STAGING_DIR)
+    os.makedirs(STAGING_DIR)
+
+    # Download and extract the files next to the current ones, so a failed
+    # update leaves the installed components untouched
+    print("Updating BattlEye...", flush=True)
+    if not download_and_extract(BE_URL.format(version), STAGING_DIR):
+        shutil.rmtree(STAGING_DIR, ignore_errors=True)
+        return False
+    print("Updating Easy Anti-Cheat...", flush=True)
+    if not download_and_extract(EAC_URL.format(version), STAGING_DIR):
+        shutil.rmtree(STAGING_DIR, ignore_errors=True)
+        return False
+
+    with open(os.path.join(STAGING_DIR, "version.txt"), "w") as f:
+        f.write(version)
+
+    swap_in_staging()
+    return True
 
 # Function to check for updates
 def check_for_updates():
-    # Get the latest version from GitHub
-    latest_version = get_latest_version()
+    state = load_state()
     installed_version = get_installed_version()
+    installed = installed_version and components_installed()
+
+    # Launches within the check interval never touch the network
+    if installed and time.time() - state.get("checked", 0) < get_check_interval():
+        print("Components are up to date.", flush=True)
+        return
+
+    latest_version = get_latest_version(state)
 
     if latest_version:
 
         # Compare the latest version with the installed version
-        if latest_version != installed_version:
-
-            # URLs for the files with the latest version
-            be_url = BE_URL.format(latest_version)
-            eac_url = EAC_URL.format(latest_version)
-
-            # Remove old directories if they exist
-            if os.path.exists(DOWNLOAD_DIR):
-                shutil.rmtree(DOWNLOAD_DIR)  # Remove old files
-            os.makedirs(DOWNLOAD_DIR, exist_ok=True)
-
-            # Download and extract the files
-            print("Updating BattlEye...", flush=True)
-            download_and_extract(be_url, DOWNLOAD_DIR)
-            print("Updating Easy Anti-Cheat...", flush=True)
-            download_and_extract(eac_url, DOWNLOAD_DIR)
-
-            # Update the version file with the latest version
-            with open(VERSION_FILE, "w") as f:
-                f.write(latest_version)
+        if latest_version != installed_version or not installed:
+            if not install_version(latest_version):
+                return
         else:
             print("Components are up to date.", flush=True)
 
+        # Only a successful check starts the interval, so a failed update is retried on the next launch
+        state["checked"] = time.time()
+        save_state(state)
+
 def main():
     # Execute the update check
     check_for_updates()
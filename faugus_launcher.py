@@ -1,42 +1,128 @@
 #!/usr/bin/python3
 
-import json
 import os
+import socket
+import sys
+import time
+
+# --profile-startup prints how long the imports and each startup phase took once the
+# first frame of the window is drawn
+STARTUP_PROFILE = "--profile-startup" in sys.argv
+if STARTUP_PROFILE:
+    sys.argv.remove("--profile-startup")
+startup_marks = [("interpreter", time.perf_counter())]
+
+def mark_startup(phase):
+    if STARTUP_PROFILE:
+        startup_marks.append((phase, time.perf_counter()))
+
+def print_startup_profile(*args):
+    if not startup_marks:
+        return False
+    mark_startup("first frame")
+    print("Startup profile:", file=sys.stderr)
+    previous = startup_marks[0][1]
+    for phase, current in startup_marks[1:]:
+        print(f"  {phase:<24}{(current - previous) * 1000:8.1f} ms", file=sys.stderr)
+        previous = current
+    total = startup_marks[-1][1] - startup_marks[0][1]
+    print(f"  {'total':<24}{total * 1000:8.1f} ms ({len(sys.modules)} modules loaded)", file=sys.stderr)
+    startup_marks.clear()
+    return False
+
+# A running launcher listens here for commands from later invocations
+control_socket_path = os.path.join(
+    os.getenv('XDG_RUNTIME_DIR') or os.path.join(os.getenv('XDG_DATA_HOME', os.path.expanduser('~/.local/share')), 'faugus-launcher'),
+    'faugus-launcher.sock')
+
+CONTROL_OPTIONS = {"--show": "show", "--launch": "launch", "--stop": "stop", "--reload": "reload"}
+
+def get_control_command(argv):
+    # "show" for a plain start, "launch <gameid>" for --launch <gameid>, None for anything else
+    if len(argv) == 1:
+        return "show"
+    command = CONTROL_OPTIONS.get(argv[1])
+    if command in ("launch", "stop") and len(argv) == 3:
+        return f"{command} {argv[2]}"
+    if command in ("show", "reload") and len(argv) == 2:
+        return command
+    return None
+
+def send_control_command(command, timeout=2):
+    # Returns the reply of the running launcher, or None if nothing is listening
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    try:
+        client.connect(control_socket_path)
+        client.sendall(f"{command}\n".encode("utf-8"))
+        reply = b""
+        while not reply.endswith(b"\n"):
+            chunk = client.recv(4096)
+            if not chunk:
+                break
+            reply += chunk
+        return reply.decode("utf-8", "replace").strip() or None
+    except OSError:
+        return None
+    finally:
+        client.close()
+
+# Hand the command over before GTK is loaded, so a second invocation returns right away
+if __name__ == "__main__":
+    control_command = get_control_command(sys.argv)
+    if control_command:
+        control_reply = send_control_command(control_command)
+        if control_reply is not None:
+            if control_reply != "ok":
+                print(control_reply)
+            sys.exit(0 if control_reply == "ok" else 1)
+
+import atexit
+import functools
+import io
+import json
 import re
+import shlex
 import shutil
-import socket
+import struct
 import subprocess
-import sys
+import tempfile
 import threading
-import urllib.request
-import webbrowser
-import gi
-import psutil
-import requests
-import vdf
-import tarfile
+import urllib.parse
 import gettext
+import hashlib
 import locale
-import signal
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import accumulate, islice
 from pathlib import Path
 
+mark_startup("stdlib imports")
+
+import gi
+
 gi.require_version('Gtk', '3.0')
 gi.require_version('Gdk', '3.0')
 gi.require_version('AyatanaAppIndicator3', '0.1')
 
 from gi.repository import Gtk, Gdk, GdkPixbuf, GLib, AyatanaAppIndicator3, Gio, Pango
-from PIL import Image
 from filelock import FileLock, Timeout
 
+mark_startup("gi imports")
+
 class PathManager:
+    # Icons and binaries are looked up once, the same names are asked for from several places
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def system_data(*relative_paths):
         xdg_data_dirs = os.getenv('XDG_DATA_DIRS', '/usr/local/share:/usr/share').split(':')
         for data_dir in xdg_data_dirs:
-            path = Path(data_dir).joinpath(*relative_paths)
-            if path.exists():
-                return str(path)
-        return str(Path(xdg_data_dirs[0]).joinpath(*relative_paths))
+            path = os.path.join(data_dir, *relative_paths)
+            if os.path.exists(path):
+                return path
+        return os.path.join(xdg_data_dirs[0], *relative_paths)
 
     @staticmethod
     def user_data(*relative_paths):
@@ -49,15 +135,22 @@ class PathManager:
         return str(xdg_config_home.joinpath(*relative_paths))
 
     @staticmethod
+    def user_cache(*relative_paths):
+        xdg_cache_home = Path(os.getenv('XDG_CACHE_HOME', Path.home() / '.cache'))
+        return str(xdg_cache_home.joinpath(*relative_paths))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
     def find_binary(binary_name):
         paths = os.getenv('PATH', '').split(':')
         for path in paths:
-            binary_path = Path(path) / binary_name
-            if binary_path.exists():
-                return str(binary_path)
+            binary_path = os.path.join(path, binary_name)
+            if os.path.exists(binary_path):
+                return binary_path
         return f'/usr/bin/{binary_name}'  # Fallback
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def get_icon(icon_name):
         icon_paths = [
             PathManager.user_data('icons', icon_name),
@@ -65,7 +158,7 @@ class PathManager:
             PathManager.system_data('icons', icon_name)
         ]
         for path in icon_paths:
-            if Path(path).exists():
+            if os.path.exists(path):
                 return path
         return icon_paths[-1]  # Fallback
 
@@ -113,16 +206,50 @@ ubisoft_icon = PathManager.get_icon('faugus-ubisoft-connect.png')
 ea_icon = PathManager.get_icon('faugus-ea.png')
 
 faugus_run = PathManager.find_binary('faugus-run')
+faugus_run_socket_path = os.path.join(os.getenv('XDG_RUNTIME_DIR') or faugus_launcher_dir, 'faugus-run.sock')
 faugus_proton_manager = PathManager.find_binary('faugus-proton-manager')
 umu_run = PathManager.find_binary('umu-run')
 mangohud_dir = PathManager.find_binary('mangohud')
 gamemoderun = PathManager.find_binary('gamemoderun')
 
 games_json = PathManager.user_config('faugus-launcher/games.json')
+games_index = PathManager.user_config('faugus-launcher/games.idx')
 latest_games = PathManager.user_config('faugus-launcher/latest-games.txt')
 faugus_launcher_share_dir = PathManager.user_data('faugus-launcher')
 faugus_temp = str(Path.home() / 'faugus_temp')
 running_games = PathManager.user_data('faugus-launcher/running_games.json')
+thumbnails_dir = PathManager.user_cache('faugus-launcher/thumbnails')
+banner_cache_dir = PathManager.user_cache('faugus-launcher/banners')
+log_cache_dir = PathManager.user_cache('faugus-launcher/logs')
+
+# Tiles bound before the row height is known, and decoded tile images kept in
+# memory before the least recently shown are dropped
+LIBRARY_INITIAL_TILES = 60
+LIBRARY_LOADED_TILES = 512
+
+# Delay before the library filter is re-run while typing in the search box
+SEARCH_DEBOUNCE_MS = 100
+
+# Edits made within this window are written to games.json together
+GAMES_SAVE_DELAY_MS = 500
+SHORTCUTS_SAVE_DELAY_MS = 500
+
+# Banner search server, FAUGUS_BANNER_API points it somewhere else (a local server when testing).
+# Titles are looked up this long after the title entry stops changing, and titles that
+# found nothing are not looked up again for a day.
+BANNER_API_URL = os.environ.get("FAUGUS_BANNER_API", "https://steamgrid.usebottles.com/api/search/")
+BANNER_FETCH_WORKERS = 4
+BANNER_FETCH_DEBOUNCE_MS = 400
+BANNER_MISS_SECONDS = 24 * 3600
+
+# Log viewer: bytes scanned per indexing or search step, how often an open log is checked
+# for new output, the longest line shown, the matches kept per search and how much of
+# the end of a log "Copy to clipboard" takes
+LOG_INDEX_CHUNK = 4 * 1024 * 1024
+LOG_FOLLOW_INTERVAL_MS = 500
+LOG_LINE_BYTES = 4096
+LOG_SEARCH_LIMIT = 10000
+LOG_COPY_LIMIT = 8 * 1024 * 1024
 
 lock_file_path = PathManager.user_data('faugus-launcher/faugus-launcher.lock')
 lock = FileLock(lock_file_path, timeout=0)
@@ -180,15 +307,25 @@ def find_lossless_dll():
     return ""
 
 def get_desktop_dir():
+    # Reads the same file xdg-user-dir does, without starting a process for it
     try:
-        desktop_dir = subprocess.check_output(['xdg-user-dir', 'DESKTOP'], text=True).strip()
-        return desktop_dir
-    except (FileNotFoundError, subprocess.CalledProcessError):
-        print("xdg-user-dir not found or failed; falling back to ~/Desktop")
-        return str(Path.home() / 'Desktop')
+        with open(PathManager.user_config('user-dirs.dirs'), 'r', encoding='utf-8') as f:
+            for line in f:
+                key, sep, value = line.strip().partition('=')
+                if sep and key == 'XDG_DESKTOP_DIR':
+                    value = value.strip().strip('"')
+                    if value.startswith('$HOME'):
+                        value = str(Path.home()) + value[len('$HOME'):]
+                    if value.startswith('/'):
+                        return value.rstrip('/') or '/'
+    except OSError:
+        pass
+    return str(Path.home() / 'Desktop')
 
 desktop_dir = get_desktop_dir()
 
+mark_startup("paths")
+
 def get_system_locale():
     lang = os.environ.get('LANG') or os.environ.get('LC_MESSAGES')
     if lang:
@@ -234,12 +371,176 @@ except FileNotFoundError:
     gettext.install('faugus-launcher', localedir=LOCALE_DIR)
     globals()['_'] = gettext.gettext
 
+mark_startup("translations")
+
 def format_title(title):
     title_formatted = re.sub(r'[^a-zA-Z0-9\s]', '', title)
     title_formatted = title_formatted.replace(' ', '-')
     title_formatted = '-'.join(title_formatted.lower().split())
     return title_formatted
 
+RT_ICON = 3
+RT_GROUP_ICON = 14
+
+def read_pe_icons(path):
+    # Returns the frames of the first icon group of a Windows executable as
+    # (width, height, bit_count, data) tuples; data is PNG or a headerless DIB.
+    # Only the headers, the resource directory and the icons are read.
+    with open(path, "rb") as f:
+        fd = f.fileno()
+        file_size = os.fstat(fd).st_size
+
+        def read(offset, size):
+            if offset + size > file_size:
+                raise ValueError("malformed PE file: truncated")
+            return os.pread(fd, size, offset)
+
+        def u16(offset):
+            return struct.unpack("<H", read(offset, 2))[0]
+
+        def u32(offset):
+            return struct.unpack("<I", read(offset, 4))[0]
+
+        try:
+            if read(0, 2) != b"MZ":
+                raise ValueError("not a PE file")
+            pe = u32(0x3C)
+            if read(pe, 4) != b"PE\0\0":
+                raise ValueError("not a PE file")
+            section_count = u16(pe + 6)
+            optional = pe + 24
+            optional_size = u16(pe + 20)
+            directories = optional + (112 if u16(optional) == 0x20B else 96)
+            resource_rva = u32(directories + 2 * 8)
+            if not resource_rva:
+                raise ValueError("no resources")
+
+            section_table = read(optional + optional_size, section_count * 40)
+            sections = []
+            for index in range(section_count):
+                virtual_size, virtual_address, raw_size, raw_pointer = struct.unpack_from("<IIII", section_table, index * 40 + 8)
+                sections.append((virtual_address, max(virtual_size, raw_size), raw_pointer))
+
+            def rva_to_offset(rva):
+                for virtual_address, size, raw_pointer in sections:
+                    if virtual_address <= rva < virtual_address + size:
+                        return rva - virtual_address + raw_pointer
+                raise ValueError("RVA outside of the sections")
+
+            base = rva_to_offset(resource_rva)
+
+            def entries(directory):
+                count = u16(base + directory + 12) + u16(base + directory + 14)
+                table = read(base + directory + 16, count * 8)
+                for index in range(count):
+                    yield struct.unpack_from("<II", table, index * 8)
+
+            def first_leaf(offset):
+                # Walks name and language levels down to the first data entry
+                while offset & 0x80000000:
+                    offset = next(entries(offset & 0x7FFFFFFF))[1]
+                rva, size = struct.unpack("<II", read(base + offset, 8))
+                return read(rva_to_offset(rva), size)
+
+            types = dict(entries(0))
+            if RT_GROUP_ICON not in types or RT_ICON not in types:
+                raise ValueError("no icons")
+
+            icons = {}
+            for name, offset in entries(types[RT_ICON] & 0x7FFFFFFF):
+                if not name & 0x80000000:
+                    icons[name] = offset
+
+            group = first_leaf(types[RT_GROUP_ICON])
+            frames = []
+            for index in range(struct.unpack_from("<H", group, 4)[0]):
+                width, height, _colors, _reserved, _planes, bit_count, _size, icon_id = struct.unpack_from("<BBBBHHIH", group, 6 + index * 14)
+                if icon_id not in icons:
+                    continue
+                frame = first_leaf(icons[icon_id])
+                if frame[:8] == b"\x89PNG\r\n\x1a\n":
+                    width, height = struct.unpack_from(">II", frame, 16)
+                frames.append((width or 256, height or 256, bit_count, frame))
+        except (struct.error, IndexError, StopIteration) as e:
+            raise ValueError(f"malformed PE file: {e}")
+
+    if not frames:
+        raise ValueError("no icons")
+    return frames
+
+def icon_frame_to_png(frame):
+    width, height, bit_count, data = frame
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return data
+
+    from PIL import Image
+    # Wrap the DIB in a one-image ICO so PIL handles the AND mask and palettes
+    ico = struct.pack("<HHHBBBBHHII", 0, 1, 1, width % 256, height % 256, 0, 0, 1, bit_count, len(data), 22) + data
+    output = io.BytesIO()
+    with Image.open(io.BytesIO(ico)) as image:
+        image.save(output, format="PNG")
+    return output.getvalue()
+
+def save_largest_icon(exe_path, dest):
+    frames = read_pe_icons(exe_path)
+    largest = max(frames, key=lambda frame: (frame[0] * frame[1], frame[2]))
+    with open(dest, "wb") as f:
+        f.write(icon_frame_to_png(largest))
+
+BANNER_SIZES = ((230, 345), (180, 270))
+
+def small_banner_path(banner):
+    return os.path.join(os.path.dirname(banner), "small", os.path.basename(banner))
+
+def normalize_banner(data, banner):
+    # Writes the regular and the smaller-banners variant at their display size. The
+    # hash of the source is kept in the PNG, so saving the same image again is free.
+    from PIL import Image, PngImagePlugin
+
+    digest = hashlib.sha1(data).hexdigest()
+    variants = [banner, small_banner_path(banner)]
+    if all(os.path.isfile(path) for path in variants):
+        try:
+            with open(banner, "rb") as f:
+                current = f.read()
+            if hashlib.sha1(current).hexdigest() == digest:
+                return False
+            with Image.open(io.BytesIO(current)) as image:
+                if image.info.get("faugus-source") == digest:
+                    return False
+        except OSError:
+            pass
+
+    info = PngImagePlugin.PngInfo()
+    info.add_text("faugus-source", digest)
+    with Image.open(io.BytesIO(data)) as image:
+        image = image.convert("RGBA")
+        for path, size in zip(variants, BANNER_SIZES):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.tmp"
+            image.resize(size, Image.LANCZOS).save(temp_path, format="PNG", pnginfo=info)
+            os.replace(temp_path, path)
+    return True
+
+def write_small_banner(banner):
+    # Banners saved before the smaller variant existed only have the regular size
+    from PIL import Image, PngImagePlugin
+
+    path = small_banner_path(banner)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with Image.open(banner) as image:
+        info = PngImagePlugin.PngInfo()
+        if "faugus-source" in image.info:
+            info.add_text("faugus-source", image.info["faugus-source"])
+        image.convert("RGBA").resize(BANNER_SIZES[1], Image.LANCZOS).save(temp_path, format="PNG", pnginfo=info)
+    os.replace(temp_path, path)
+
+def save_icon_frames(exe_path, directory):
+    for index, frame in enumerate(read_pe_icons(exe_path)):
+        with open(os.path.join(directory, f"icon-{index}.png"), "wb") as f:
+            f.write(icon_frame_to_png(frame))
+
 class ConfigManager:
     def __init__(self):
         self.default_config = {
@@ -266,6 +567,10 @@ class ConfigManager:
             'enable-ntsync': 'False',
             'enable-wow64': 'False',
             'language': lang,
+            'components-check-hours': '24',
+            'echo-output': 'True',
+            'launch-worker': 'False',
+            'logs-max-mb': '512',
         }
 
         self.config = {}
@@ -322,16 +627,31 @@ class Main(Gtk.Window):
         self.theme = None
 
         self.current_prefix = None
-        self.games = []
-        self.flowbox_child = None
+        self.catalog = GameCatalog()
+        self.tile_placeholder = None
+        self.thumbnails = ThumbnailCache(thumbnails_dir)
+        self.loaded_tiles = OrderedDict()
+        self.tile_pool = []
+        self.library_games = []
+        self.library_positions = {}
+        self.library_first = 0
+        self.library_columns = 1
+        self.library_row_height = 0
+        self.library_layout_id = None
+        self.library_scroll_target = None
+        self.binding_tiles = False
+        self.selected_gameid = None
+        self.search_text = ""
+        self.search_source_id = None
         self.updated_steam_id = None
         self.game_running = False
+        self.control_server = None
+        self.small_banners_checked = False
 
         self.last_click_time = 0
         self.last_clicked_item = None
         self.double_click_time_threshold = 500
 
-        self.processos = {}
         self.button_locked = {}
 
         self.working_directory = faugus_launcher_dir
@@ -355,6 +675,10 @@ class Main(Gtk.Window):
         self.check_theme()
         self.load_config()
 
+        # Inside Flatpak every instance gets its own PID namespace, so PIDs are not persisted there
+        self.tracker = ProcessTracker(None if IS_FLATPAK else running_games, self.on_game_exited)
+        self.tracker.load()
+
         self.context_menu = Gtk.Menu()
 
         self.menu_item_play = Gtk.MenuItem(label=_("Play"))
@@ -421,98 +745,23 @@ class Main(Gtk.Window):
             self.indicator.set_status(AyatanaAppIndicator3.IndicatorStatus.ACTIVE)
             self.connect("delete-event", self.on_window_delete_event)
 
-        if IS_FLATPAK:
-            signal.signal(signal.SIGCHLD, self.on_child_process_closed)
-        else:
-            GLib.timeout_add_seconds(1, self.check_running_processes)
-
-    def on_child_process_closed(self, signum, frame):
-        for title, processo in list(self.processos.items()):
-            retcode = processo.poll()
-            if retcode is not None:
-                del self.processos[title]
-
-                selected_child = None
-
-                for child in self.flowbox.get_children():
-                    if child.get_state_flags() & Gtk.StateFlags.SELECTED:
-                        selected_child = child
-                        break
-
-                if selected_child:
-                    hbox = selected_child.get_children()[0]
-                    game_label = hbox.get_children()[1]
-                    selected_title = game_label.get_text()
-
-                    if selected_title not in self.processos:
-                        self.menu_item_play.set_sensitive(True)
-                        self.button_play.set_sensitive(True)
-                        self.button_play.set_image(
-                            Gtk.Image.new_from_icon_name("faugus-play-symbolic", Gtk.IconSize.BUTTON))
-                    else:
-                        self.menu_item_play.set_sensitive(False)
-                        self.button_play.set_sensitive(False)
-                        self.button_play.set_image(
-                            Gtk.Image.new_from_icon_name("faugus-stop-symbolic", Gtk.IconSize.BUTTON))
-
-    def check_running_processes(self):
-        processos = self.load_processes_from_file()
-
-        updated = False
-        to_remove = []
-
-        for title, data in processos.items():
-            pid_main = data.get("main")
-
-            try:
-                proc = psutil.Process(pid_main)
-                if proc.status() == psutil.STATUS_ZOMBIE:
-                    to_remove.append(title)
-            except psutil.NoSuchProcess:
-                to_remove.append(title)
-            except Exception as e:
-                to_remove.append(title)
-
-        for title in to_remove:
-            del processos[title]
-            updated = True
-            if title in self.button_locked:
-                del self.button_locked[title]
-
-        if updated:
-            with open(running_games, "w") as f:
-                json.dump(processos, f, indent=2)
-
-        selected_child = None
-        for child in self.flowbox.get_children():
-            if child.get_state_flags() & Gtk.StateFlags.SELECTED:
-                selected_child = child
-                break
-
-        if selected_child:
-            hbox = selected_child.get_children()[0]
-            game_label = hbox.get_children()[1]
-            selected_title = game_label.get_text()
-
-            self.on_item_selected(self.flowbox, selected_child)
+    def on_game_exited(self, title):
+        if title in self.button_locked:
+            del self.button_locked[title]
 
-        return True
+        game = self.get_selected_game()
+        if game is not None:
+            self.update_game_actions(game)
 
-    def load_processes_from_file(self):
-        if os.path.exists(running_games):
-            try:
-                with open(running_games, "r") as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                return {}
-        return {}
+    def get_selected_game(self):
+        # The selected game may be scrolled out of the tile pool, so it is kept by id
+        return self.catalog.get(self.selected_gameid)
 
     def check_theme(self):
         settings = Gtk.Settings.get_default()
         prefer_dark = settings.get_property('gtk-application-prefer-dark-theme')
-        output = subprocess.check_output(['gsettings', 'get', 'org.gnome.desktop.interface', 'gtk-theme']).decode(
-            'utf-8')
-        theme = output.strip().strip("'")
+        interface_settings = get_interface_settings()
+        theme = interface_settings.get_string('gtk-theme') if interface_settings else ""
         if prefer_dark or 'dark' in theme:
             self.theme = "hbox-dark-background"
         else:
@@ -594,7 +843,7 @@ class Main(Gtk.Window):
         self.flowbox.connect('button-release-event', self.on_item_release_event)
         self.flowbox.set_halign(Gtk.Align.FILL)
 
-        scroll_box.add(self.flowbox)
+        self.setup_library(scroll_box)
         self.load_games()
 
         # Pack left and scrolled box into the top box
@@ -617,9 +866,8 @@ class Main(Gtk.Window):
         self.menu_item_play.set_sensitive(False)
         self.button_play.set_sensitive(False)
 
-        if self.flowbox.get_children():
-            self.flowbox.select_child(self.flowbox.get_children()[0])
-            self.on_item_selected(self.flowbox, self.flowbox.get_children()[0])
+        if self.library_games:
+            self.select_game(self.library_games[0])
 
         self.connect("key-press-event", self.on_key_press_event)
         self.show_all()
@@ -738,7 +986,7 @@ class Main(Gtk.Window):
         self.flowbox.connect('child-activated', self.on_item_selected)
         self.flowbox.connect('button-release-event', self.on_item_release_event)
 
-        scroll_box.add(self.flowbox)
+        self.setup_library(scroll_box)
         self.load_games()
 
         self.box_top.pack_start(scroll_box, True, True, 0)
@@ -757,9 +1005,8 @@ class Main(Gtk.Window):
         self.menu_item_play.set_sensitive(False)
         self.button_play.set_sensitive(False)
 
-        if self.flowbox.get_children():
-            self.flowbox.select_child(self.flowbox.get_children()[0])
-            self.on_item_selected(self.flowbox, self.flowbox.get_children()[0])
+        if self.library_games:
+            self.select_game(self.library_games[0])
 
         self.connect("key-press-event", self.on_key_press_event)
         self.show_all()
@@ -773,6 +1020,9 @@ class Main(Gtk.Window):
             self.grid_left.set_margin_start(0)
 
     def on_destroy(self, *args):
+        # Closed first, so a new instance never finds the lock free and the socket still ours
+        if self.control_server:
+            self.control_server.stop()
         if lock.is_locked:
             lock.release()
         Gtk.main_quit()
@@ -802,6 +1052,8 @@ class Main(Gtk.Window):
         subprocess.run(["pkexec", "reboot"])
 
     def on_close(self, widget):
+        if self.control_server:
+            self.control_server.stop()
         if lock.is_locked:
             lock.release()
         Gtk.main_quit()
@@ -813,12 +1065,10 @@ class Main(Gtk.Window):
                 self.flowbox.emit('child-activated', item)
                 self.flowbox.select_child(item)
 
-                selected_children = self.flowbox.get_selected_children()
-                selected_child = selected_children[0]
-                hbox = selected_child.get_child()
-                game_label = hbox.get_children()[1]
-                title = game_label.get_text()
-                game = next((j for j in self.games if j.title == title), None)
+                game = self.catalog.game_for_child(item)
+                if game is None:
+                    return
+                title = game.title
 
                 if game.protonfix:
                     match = re.search(r"umu-(\d+)", game.protonfix)
@@ -841,8 +1091,7 @@ class Main(Gtk.Window):
                 else:
                     self.menu_show_logs.set_visible(False)
 
-                processos = self.load_processes_from_file()
-                if title in processos:
+                if title in self.tracker:
                     self.menu_item_play.get_child().set_text(_("Stop"))
                 else:
                     self.menu_item_play.get_child().set_text(_("Play"))
@@ -857,59 +1106,37 @@ class Main(Gtk.Window):
                 self.context_menu.popup_at_pointer(event)
 
     def on_context_menu_play(self, menu_item):
-        selected_item = self.flowbox.get_selected_children()[0]
-        self.on_button_play_clicked(selected_item)
+        self.on_button_play_clicked(menu_item)
 
     def on_context_menu_edit(self, menu_item):
-        selected_item = self.flowbox.get_selected_children()[0]
-        self.on_button_edit_clicked(selected_item)
+        self.on_button_edit_clicked(menu_item)
 
     def on_context_menu_delete(self, menu_item):
-        selected_item = self.flowbox.get_selected_children()[0]
-        self.on_button_delete_clicked(selected_item)
+        self.on_button_delete_clicked(menu_item)
 
     def on_context_menu_duplicate(self, menu_item):
-        selected_item = self.flowbox.get_selected_children()[0]
-        self.on_duplicate_clicked(selected_item)
+        self.on_duplicate_clicked(menu_item)
 
     def on_context_menu_prefix(self, menu_item):
         subprocess.run(["xdg-open", self.current_prefix], check=True)
 
     def on_context_show_logs(self, menu_item):
-        selected_item = self.flowbox.get_selected_children()[0]
-        self.on_show_logs_clicked(selected_item)
+        self.on_show_logs_clicked(menu_item)
 
     def on_show_logs_clicked(self, widget):
         dialog = Gtk.Dialog(title=_("%s Logs") % self.current_title, parent=self, modal=True)
         dialog.set_icon_from_file(faugus_png)
         dialog.set_default_size(1280, 720)
 
-        scrolled_window1 = Gtk.ScrolledWindow()
-        scrolled_window1.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
-        text_view1 = Gtk.TextView()
-        text_view1.set_editable(False)
-        text_buffer1 = text_view1.get_buffer()
-        with open(self.log_file_path, "r") as log_file:
-            text_buffer1.set_text(log_file.read())
-        scrolled_window1.add(text_view1)
-
-        scrolled_window2 = Gtk.ScrolledWindow()
-        scrolled_window2.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
-        text_view2 = Gtk.TextView()
-        text_view2.set_editable(False)
-        text_buffer2 = text_view2.get_buffer()
-        with open(self.umu_log_file_path, "r") as log_file:
-            text_buffer2.set_text(log_file.read())
-        scrolled_window2.add(text_view2)
+        log_viewer1 = LogViewer(self.log_file_path)
+        log_viewer2 = LogViewer(self.umu_log_file_path)
 
         def copy_to_clipboard(button):
             current_page = notebook.get_current_page()
             if current_page == 0:  # Tab 1: Proton
-                start_iter, end_iter = text_buffer1.get_bounds()
-                text_to_copy = text_buffer1.get_text(start_iter, end_iter, False)
+                text_to_copy = log_viewer1.copy_text()
             elif current_page == 1:  # Tab 2: UMU-Launcher
-                start_iter, end_iter = text_buffer2.get_bounds()
-                text_to_copy = text_buffer2.get_text(start_iter, end_iter, False)
+                text_to_copy = log_viewer2.copy_text()
             else:
                 text_to_copy = ""
 
@@ -952,8 +1179,8 @@ class Main(Gtk.Window):
         tab_box2.pack_start(tab_label2, True, True, 0)
         tab_box2.set_hexpand(True)
 
-        notebook.append_page(scrolled_window1, tab_box1)
-        notebook.append_page(scrolled_window2, tab_box2)
+        notebook.append_page(log_viewer1, tab_box1)
+        notebook.append_page(log_viewer2, tab_box2)
 
         content_area = dialog.get_content_area()
         box_bottom = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
@@ -973,24 +1200,21 @@ class Main(Gtk.Window):
         dialog.destroy()
 
     def on_duplicate_clicked(self, widget):
-        selected_children = self.flowbox.get_selected_children()
-        selected_child = selected_children[0]
-        hbox = selected_child.get_child()
-        game_label = hbox.get_children()[1]
-        title = game_label.get_text()
+        game = self.get_selected_game()
+        if game is None:
+            return
+        title = game.title
 
         # Display duplicate dialog
         duplicate_dialog = DuplicateDialog(self, title)
 
-        game = next((g for g in self.games if g.title == title), None)
-
         while True:
             response = duplicate_dialog.run()
 
             if response == Gtk.ResponseType.OK:
                 new_title = duplicate_dialog.entry_title.get_text()
 
-                if any(new_title == game.title for game in self.games):
+                if self.catalog.has_title(new_title):
                     duplicate_dialog.show_warning_dialog(duplicate_dialog, _("%s already exists.") % title)
                 else:
                     title_formatted_old = format_title(game.title)
@@ -998,8 +1222,7 @@ class Main(Gtk.Window):
                     icon = f"{icons_dir}/{title_formatted_old}.ico"
                     banner = game.banner
 
-                    game.title = new_title
-                    title_formatted = format_title(game.title)
+                    title_formatted = format_title(new_title)
 
                     new_icon = f"{icons_dir}/{title_formatted}.ico"
                     new_banner = f"{banners_dir}/{title_formatted}.png"
@@ -1009,30 +1232,17 @@ class Main(Gtk.Window):
 
                     if os.path.exists(banner):
                         shutil.copyfile(banner, new_banner)
+                    if os.path.exists(small_banner_path(banner)):
+                        os.makedirs(os.path.dirname(small_banner_path(new_banner)), exist_ok=True)
+                        shutil.copyfile(small_banner_path(banner), small_banner_path(new_banner))
 
-                    game.banner = new_banner
-
-                    game_info = {"gameid": game.gameid, "title": game.title, "path": game.path, "prefix": game.prefix,
-                        "launch_arguments": game.launch_arguments, "game_arguments": game.game_arguments,
-                        "mangohud": game.mangohud, "gamemode": game.gamemode, "disable_hidraw": game.disable_hidraw,
-                        "protonfix": game.protonfix, "runner": game.runner, "addapp_checkbox": game.addapp_checkbox,
-                        "addapp": game.addapp, "addapp_bat": game.addapp_bat, "banner": game.banner, }
-
-                    games = []
-                    if os.path.exists("games.json"):
-                        try:
-                            with open("games.json", "r", encoding="utf-8") as file:
-                                games = json.load(file)
-                        except json.JSONDecodeError as e:
-                            print(f"Error reading the JSON file: {e}")
-
-                    games.append(game_info)
+                    new_game = Game(title_formatted, new_title, game.path, game.prefix, game.launch_arguments,
+                                    game.game_arguments, game.mangohud, game.gamemode, game.disable_hidraw,
+                                    game.protonfix, game.runner, game.addapp_checkbox, game.addapp, game.addapp_bat,
+                                    new_banner, game.lossless)
 
-                    with open("games.json", "w", encoding="utf-8") as file:
-                        json.dump(games, file, ensure_ascii=False, indent=4)
-
-                    self.games.append(game)
-                    self.add_item_list(game)
+                    self.catalog.add(new_game)
+                    self.save_games()
                     self.update_list()
 
                     # Select the added game
@@ -1063,46 +1273,33 @@ class Main(Gtk.Window):
         return self.flowbox.get_child_at_pos(x, y)
 
     def on_item_double_click(self, item):
-        selected_children = self.flowbox.get_selected_children()
-
-        if not selected_children:
+        game = self.get_selected_game()
+        if game is None:
             return
+        title = game.title
 
-        selected_child = selected_children[0]
-        hbox = selected_child.get_child()
-        game_label = hbox.get_children()[1]
-        title = game_label.get_text()
-
-        current_focus = self.get_focus()
-
-        if IS_FLATPAK:
-            if title not in self.processos:
-                self.on_button_play_clicked(item)
-            else:
-                self.running_dialog(title)
+        if title not in self.tracker:
+            self.on_button_play_clicked(item)
         else:
-            processos = self.load_processes_from_file()
-            if title not in processos:
-                self.on_button_play_clicked(selected_child)
-            else:
-                self.running_dialog(title)
+            self.running_dialog(title)
 
     def on_key_press_event(self, widget, event):
-        selected_children = self.flowbox.get_selected_children()
+        if event.keyval == Gdk.KEY_Return:
+            self.flush_search()
 
-        if not selected_children:
+        game = self.get_selected_game()
+        if game is None:
             return
-
-        selected_child = selected_children[0]
-        hbox = selected_child.get_child()
-        game_label = hbox.get_children()[1]
-        title = game_label.get_text()
+        title = game.title
 
         current_focus = self.get_focus()
 
         if event.keyval in (Gdk.KEY_Up, Gdk.KEY_Down, Gdk.KEY_Left, Gdk.KEY_Right):
             if current_focus not in self.flowbox.get_children():
-                selected_child.grab_focus()
+                self.scroll_to_game(game)
+                selected_child = self.catalog.child_for_game(game)
+                if selected_child is not None:
+                    selected_child.grab_focus()
 
         if self.interface_mode != "List":
             if event.keyval == Gdk.KEY_Return and event.state & Gdk.ModifierType.MOD1_MASK:
@@ -1118,24 +1315,13 @@ class Main(Gtk.Window):
                     self.grid_left.set_margin_start(70)
                 return True
 
-        if IS_FLATPAK:
-            if event.keyval == Gdk.KEY_Return:
-                if title not in self.processos:
-                    widget = self.button_play
-                    self.on_button_play_clicked(selected_child)
-                else:
-                    self.running_dialog(title)
-            elif event.keyval == Gdk.KEY_Delete:
-                self.on_button_delete_clicked(selected_child)
-        else:
-            if event.keyval == Gdk.KEY_Return:
-                processos = self.load_processes_from_file()
-                if title not in processos:
-                    self.on_button_play_clicked(selected_child)
-                else:
-                    self.running_dialog(title)
-            elif event.keyval == Gdk.KEY_Delete:
-                self.on_button_delete_clicked(selected_child)
+        if event.keyval == Gdk.KEY_Return:
+            if title not in self.tracker:
+                self.on_button_play_clicked(widget)
+            else:
+                self.running_dialog(title)
+        elif event.keyval == Gdk.KEY_Delete:
+            self.on_button_delete_clicked(widget)
 
         if event.string:
             if event.string.isprintable():
@@ -1249,24 +1435,42 @@ class Main(Gtk.Window):
         return menu
 
     def on_game_selected(self, widget, game_name):
-        # Find the game in the FlowBox by name and select it
-        self.flowbox.unselect_all()
-        for child in self.flowbox.get_children():
-            hbox = child.get_children()[0]  # Assuming HBox structure
-            game_label = hbox.get_children()[1]  # The label should be the second item in HBox
-            title = game_label.get_text()
-            if game_label.get_text() == game_name:
-                # Select this item in FlowBox
-                self.flowbox.select_child(child)
-                break
+        # Find the game in the catalog by name and select it
+        game = self.catalog.get_by_title(game_name)
+        if game is None:
+            return
+        self.select_game(game)
+        title = game.title
 
         # Call the function to run the selected game
-        processos = self.load_processes_from_file()
-        if title not in processos:
+        if title not in self.tracker:
             self.on_button_play_clicked(widget)
         else:
             self.running_dialog(title)
 
+    def handle_control_command(self, command):
+        # Commands sent by later invocations of faugus-launcher through the control socket
+        name, sep, gameid = command.partition(" ")
+        if name == "show":
+            self.restore_window(None)
+            return "ok"
+        if name == "reload":
+            self.load_games()
+            self.apply_search()
+            return "ok"
+        if name not in ("launch", "stop"):
+            return f"error: unknown command {name}"
+
+        game = self.catalog.get(gameid)
+        if game is None:
+            return f"error: no game with id {gameid}"
+        if name == "launch" and game.title not in self.tracker:
+            self.select_game_by_title(game.title)
+            self.launch_game(game)
+        elif name == "stop" and game.title in self.tracker:
+            self.stop_game(game)
+        return "ok"
+
     def on_window_delete_event(self, widget, event):
         # Only prevent closing when system tray is active
         self.load_config()
@@ -1290,174 +1494,319 @@ class Main(Gtk.Window):
         self.present()
 
     def on_quit_activate(self, widget):
+        if self.control_server:
+            self.control_server.stop()
         if lock.is_locked:
             lock.release()
         Gtk.main_quit()
 
     def load_games(self):
         # Load games from JSON file
-        try:
-            with open("games.json", "r", encoding="utf-8") as file:
-                games_data = json.load(file)
-
-                for game_data in games_data:
-                    gameid = game_data.get("gameid", "")
-                    title = game_data.get("title", "")
-                    path = game_data.get("path", "")
-                    prefix = game_data.get("prefix", "")
-                    launch_arguments = game_data.get("launch_arguments", "")
-                    game_arguments = game_data.get("game_arguments", "")
-                    mangohud = game_data.get("mangohud", "")
-                    gamemode = game_data.get("gamemode", "")
-                    disable_hidraw = game_data.get("disable_hidraw", "")
-                    protonfix = game_data.get("protonfix", "")
-                    runner = game_data.get("runner", "")
-                    addapp_checkbox = game_data.get("addapp_checkbox", "")
-                    addapp = game_data.get("addapp", "")
-                    addapp_bat = game_data.get("addapp_bat", "")
-                    banner = game_data.get("banner", "")
-                    lossless = game_data.get("lossless", "")
-
-                    game = Game(gameid, title, path, prefix, launch_arguments, game_arguments, mangohud, gamemode, disable_hidraw,
-                                protonfix, runner, addapp_checkbox, addapp, addapp_bat, banner, lossless)
-                    self.games.append(game)
-
-                self.games = sorted(self.games, key=lambda x: x.title.lower())
-                self.filtered_games = self.games[:]
-                self.flowbox.foreach(Gtk.Widget.destroy)
-                for game in self.filtered_games:
-                    self.add_item_list(game)
-        except FileNotFoundError:
-            pass
-        except json.JSONDecodeError as e:
-            print(f"Error reading the JSON file: {e}")
-
-    def add_item_list(self, game):
-        # Add a game item to the list
-        if self.interface_mode == "List":
-            hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL)
-        if self.interface_mode == "Blocks":
-            hbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
-            hbox.set_size_request(200, -1)
+        self.clear_library()
+        self.catalog.load(game_store.load())
+        self.populate_library(self.catalog.games)
         if self.interface_mode == "Banners":
-            hbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+            self.create_missing_small_banners()
+
+    def clear_library(self):
+        self.thumbnails.cancel_all()
+        self.catalog.unbind_all()
+        self.loaded_tiles.clear()
+        for tile in self.tile_pool:
+            tile.game = None
+            tile.future = None
+            tile.hide()
+
+    def setup_library(self, scroll_box):
+        # The flowbox only holds a pool of tiles for the rows around the visible part,
+        # the spacers above and below it stand in for the rows that are not bound
+        self.library_top = Gtk.Box()
+        self.library_bottom = Gtk.Box()
+        library_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+        library_box.pack_start(self.library_top, False, False, 0)
+        library_box.pack_start(self.flowbox, True, True, 0)
+        library_box.pack_start(self.library_bottom, False, False, 0)
+        scroll_box.add(library_box)
+
+        self.flowbox.set_homogeneous(True)
+        self.flowbox.connect("size-allocate", self.on_library_allocated)
+        self.flowbox.connect("selected-children-changed", self.on_library_selection_changed)
+        self.flowbox.connect("move-cursor", self.on_library_move_cursor)
+        self.flowbox.connect("activate-cursor-child", self.on_library_activate_cursor)
+        self.library_adjustment = scroll_box.get_vadjustment()
+        self.library_adjustment.connect("value-changed", self.queue_library_layout)
+        self.library_adjustment.connect("changed", self.queue_library_layout)
+
+    def populate_library(self, games):
+        self.library_games = [game for game in games if self.search_text in game.search_title]
+        self.library_positions = {game.gameid: index for index, game in enumerate(self.library_games)}
+        self.bind_library()
+
+    def queue_library_layout(self, *args):
+        # Runs before GTK lays out the next frame, never from inside an allocation
+        if not self.library_layout_id:
+            self.library_layout_id = GLib.idle_add(self.layout_library, priority=GLib.PRIORITY_HIGH_IDLE)
+
+    def layout_library(self):
+        self.library_layout_id = None
+        target = self.library_scroll_target
+        index = self.library_positions.get(target.gameid) if target is not None else None
+        if index is not None and self.library_row_height:
+            y = index // self.library_columns * self.library_row_height
+            # Wait for the spacers to be allocated, the adjustment clamps to the old size until then
+            if y < self.library_adjustment.get_upper():
+                self.library_scroll_target = None
+                self.library_adjustment.clamp_page(y, y + self.library_row_height)
+        self.bind_library()
+        return False
+
+    def bind_library(self):
+        # Binds the pool to the rows around the scroll position, or around the game
+        # being scrolled to, and sizes the spacers to the rows left out
+        games = self.library_games
+        columns = self.library_columns
+        row_height = self.library_row_height
+        total_rows = -(-len(games) // columns)
+        if row_height:
+            top_row = int(self.library_adjustment.get_value() // row_height)
+            pool_rows = int(self.library_adjustment.get_page_size() // row_height) + 3
+        else:
+            top_row = 0
+            pool_rows = max(3, LIBRARY_INITIAL_TILES // columns)
+        first_row = max(0, min(top_row - 1, total_rows - pool_rows))
+
+        if self.library_scroll_target is not None:
+            index = self.library_positions.get(self.library_scroll_target.gameid)
+            if index is None:
+                self.library_scroll_target = None
+            elif not first_row <= index // columns < first_row + pool_rows:
+                first_row = max(0, min(index // columns - 1, total_rows - pool_rows))
+
+        first = first_row * columns
+        count = max(0, min(pool_rows * columns, len(games) - first))
+        while len(self.tile_pool) < count:
+            tile = LibraryTile(self.interface_mode, self.theme, self.show_labels)
+            self.flowbox.add(tile)
+            self.tile_pool.append(tile)
+
+        self.binding_tiles = True
+        for index, tile in enumerate(self.tile_pool):
+            if index < count:
+                self.bind_tile(tile, games[first + index])
+            else:
+                self.unbind_tile(tile)
+        selected_child = self.catalog.child_for_game(self.get_selected_game())
+        if selected_child is not None:
+            has_focus = self.flowbox.get_focus_child() is not None
+            self.flowbox.select_child(selected_child)
+            if has_focus:
+                selected_child.grab_focus()
+        else:
+            self.flowbox.unselect_all()
+        self.binding_tiles = False
+
+        self.library_first = first
+        bound_rows = -(-count // columns)
+        self.library_top.set_size_request(-1, round(first_row * row_height))
+        self.library_bottom.set_size_request(-1, round((total_rows - first_row - bound_rows) * row_height))
+
+    def on_library_allocated(self, flowbox, allocation):
+        # The column count and row height are read back from where GTK placed the tiles
+        bound = [tile for tile in self.tile_pool if tile.game is not None]
+        if not bound:
+            return
+        first_y = bound[0].get_allocation().y
+        columns = sum(1 for tile in bound if tile.get_allocation().y == first_y)
+        if len(bound) > columns:
+            row_height = bound[columns].get_allocation().y - first_y
+        else:
+            row_height = allocation.height
+        if (columns, row_height) != (self.library_columns, self.library_row_height) or self.library_scroll_target is not None:
+            self.library_columns = columns
+            self.library_row_height = row_height
+            self.queue_library_layout()
+
+    def on_library_selection_changed(self, flowbox):
+        # Keyboard navigation can select a tile in the rows past the visible part
+        if self.binding_tiles:
+            return
+        selected_children = flowbox.get_selected_children()
+        game = self.catalog.game_for_child(selected_children[0]) if selected_children else None
+        if game is not None:
+            self.selected_gameid = game.gameid
+            self.scroll_to_game(game)
+
+    def on_library_move_cursor(self, flowbox, step, count):
+        # The flowbox cursor is a tile, which shows another game once the pool is rebound,
+        # so the keys move through the games and select the tile the game ends up in
+        game = self.get_selected_game()
+        index = self.library_positions.get(game.gameid) if game is not None else None
+        if index is None:
+            return False
+        if step == Gtk.MovementStep.VISUAL_POSITIONS:
+            if flowbox.get_direction() == Gtk.TextDirection.RTL:
+                count = -count
+            index += count
+        elif step == Gtk.MovementStep.DISPLAY_LINES:
+            index += count * self.library_columns
+        elif step == Gtk.MovementStep.PAGES:
+            rows = 1
+            if self.library_row_height:
+                rows = max(1, int(self.library_adjustment.get_page_size() // self.library_row_height))
+            index += count * rows * self.library_columns
+        elif step == Gtk.MovementStep.BUFFER_ENDS:
+            index = 0 if count < 0 else len(self.library_games) - 1
+        else:
+            return False
+        flowbox.stop_emission_by_name("move-cursor")
 
-        hbox.get_style_context().add_class(self.theme)
+        game = self.library_games[max(0, min(index, len(self.library_games) - 1))]
+        self.select_game(game)
+        child = self.catalog.child_for_game(game)
+        if child is not None:
+            child.grab_focus()
+        return True
 
-        game_icon = f'{icons_dir}/{game.gameid}.ico'
-        game_label = Gtk.Label.new(game.title)
+    def on_library_activate_cursor(self, flowbox):
+        flowbox.stop_emission_by_name("activate-cursor-child")
+        child = self.catalog.child_for_game(self.get_selected_game())
+        if child is not None:
+            flowbox.emit("child-activated", child)
 
-        if self.interface_mode == "Blocks" or self.interface_mode == "Banners":
-            game_label.set_line_wrap(True)
-            game_label.set_max_width_chars(1)
-            game_label.set_justify(Gtk.Justification.CENTER)
+    def scroll_to_game(self, game):
+        self.library_scroll_target = game
+        self.bind_library()
+        self.queue_library_layout()
 
-        if os.path.isfile(game_icon):
-            pass
+    def select_game(self, game):
+        self.selected_gameid = game.gameid if game is not None else None
+        if game is not None:
+            self.scroll_to_game(game)
         else:
-            game_icon = faugus_png
-
-        self.flowbox_child = Gtk.FlowBoxChild()
+            self.flowbox.unselect_all()
+        self.update_game_actions(game)
 
-        pixbuf = GdkPixbuf.Pixbuf.new_from_file(game_icon)
-        if self.interface_mode == "List":
-            scaled_pixbuf = pixbuf.scale_simple(40, 40, GdkPixbuf.InterpType.BILINEAR)
-            image = Gtk.Image.new_from_file(game_icon)
-            image.set_from_pixbuf(scaled_pixbuf)
-            image.set_margin_start(10)
-            image.set_margin_end(10)
-            image.set_margin_top(10)
-            image.set_margin_bottom(10)
-            game_label.set_margin_start(10)
-            game_label.set_margin_end(10)
-            game_label.set_margin_top(10)
-            game_label.set_margin_bottom(10)
-            hbox.pack_start(image, False, False, 0)
-            hbox.pack_start(game_label, False, False, 0)
-            self.flowbox_child.set_size_request(300, -1)
-            self.flowbox.set_homogeneous(True)
-            self.flowbox_child.set_valign(Gtk.Align.START)
-            self.flowbox_child.set_halign(Gtk.Align.FILL)
-        if self.interface_mode == "Blocks":
-            self.flowbox_child.set_hexpand(True)
-            self.flowbox_child.set_vexpand(True)
-            scaled_pixbuf = pixbuf.scale_simple(100, 100, GdkPixbuf.InterpType.BILINEAR)
-            image = Gtk.Image.new_from_file(game_icon)
-            image.set_from_pixbuf(scaled_pixbuf)
-            hbox.pack_start(image, False, False, 0)
-            hbox.pack_start(game_label, True, False, 0)
-            image.set_margin_top(10)
-            game_label.set_margin_top(10)
-            game_label.set_margin_end(10)
-            game_label.set_margin_start(10)
-            game_label.set_margin_bottom(10)
-            self.flowbox_child.set_valign(Gtk.Align.FILL)
-            self.flowbox_child.set_halign(Gtk.Align.FILL)
+    def bind_tile(self, tile, game):
+        if tile.game is game:
+            return
+        tile.game = game
+        tile.label.set_text(game.title)
+        tile.set_tooltip_text(game.title)
+        self.catalog.bind(tile, game)
+        self.load_tile_image(tile)
+        tile.show()
+
+    def unbind_tile(self, tile):
+        if tile.game is None:
+            return
+        if tile.future:
+            tile.future.cancel()
+            tile.future = None
+        self.catalog.unbind(tile)
+        tile.game = None
+        tile.hide()
+
+    def get_tile_size(self):
         if self.interface_mode == "Banners":
-            self.flowbox_child.set_hexpand(True)
-            self.flowbox_child.set_vexpand(True)
-            image2 = Gtk.Image()
-            game_label.set_size_request(-1, 50)
-            game_label.set_margin_end(10)
-            game_label.set_margin_start(10)
-            self.flowbox_child.set_margin_start(10)
-            self.flowbox_child.set_margin_end(10)
-            self.flowbox_child.set_margin_top(10)
-            self.flowbox_child.set_margin_bottom(10)
-            self.flowbox_child.set_valign(Gtk.Align.FILL)
-            self.flowbox_child.set_halign(Gtk.Align.FILL)
-            if game.banner == "" or not os.path.isfile(game.banner):
-                if self.smaller_banners:
-                    pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(faugus_banner, 180, 270, False)
-                else:
-                    pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(faugus_banner, 230, 345, False)
+            if self.smaller_banners:
+                return 180, 270
+            return 230, 345
+        if self.interface_mode == "Blocks":
+            return 100, 100
+        return 40, 40
+
+    def get_tile_placeholder(self):
+        # A single pixbuf shared by every tile whose image has not been decoded yet
+        if self.tile_placeholder is None:
+            width, height = self.get_tile_size()
+            if self.interface_mode == "Banners":
+                self.tile_placeholder = GdkPixbuf.Pixbuf.new_from_file_at_scale(faugus_banner, width, height, False)
             else:
-                if self.smaller_banners:
-                    pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(game.banner, 180, 270, False)
-                else:
-                    pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(game.banner, 230, 345, False)
-            image2.set_from_pixbuf(pixbuf)
-            hbox.pack_start(image2, False, False, 0)
-            hbox.pack_start(game_label, True, False, 0)
-            if not self.show_labels:
-                game_label.set_no_show_all(True)
+                self.tile_placeholder = GdkPixbuf.Pixbuf.new_from_file(faugus_png).scale_simple(
+                    width, height, GdkPixbuf.InterpType.BILINEAR)
+        return self.tile_placeholder
 
-        self.flowbox_child.add(hbox)
-        self.flowbox.add(self.flowbox_child)
+    def get_tile_source(self, game):
+        if self.interface_mode == "Banners":
+            if game.banner == "" or not os.path.isfile(game.banner):
+                return faugus_banner
+            # Banners are stored at both display sizes, so the tile needs no rescaling
+            if self.smaller_banners and os.path.isfile(small_banner_path(game.banner)):
+                return small_banner_path(game.banner)
+            return game.banner
 
-    def on_search_changed(self, entry):
-        search_text = entry.get_text().lower()
-        self.filtered_games = [game for game in self.games if search_text in game.title.lower()]
+        game_icon = f'{icons_dir}/{game.gameid}.ico'
+        if os.path.isfile(game_icon):
+            return game_icon
+        return faugus_png
+
+    def load_tile_image(self, tile):
+        # Decoded images are kept per game, so a tile scrolled back into view is drawn right away
+        if tile.future:
+            tile.future.cancel()
+            tile.future = None
+        game = tile.game
+        pixbuf = self.loaded_tiles.get(game.gameid)
+        if pixbuf is not None:
+            self.loaded_tiles.move_to_end(game.gameid)
+            tile.image.set_from_pixbuf(pixbuf)
+            return
 
-        for child in self.flowbox.get_children():
-            self.flowbox.remove(child)
+        tile.image.set_from_pixbuf(self.get_tile_placeholder())
+        width, height = self.get_tile_size()
+        tile.future = self.thumbnails.request(self.get_tile_source(game), width, height,
+                                              self.on_tile_image_loaded, tile, game)
 
-        if self.filtered_games:
-            for game in self.filtered_games:
-                self.add_item_list(game)
+    def on_tile_image_loaded(self, pixbuf, tile, game):
+        if tile.game is game:
+            tile.future = None
+        if pixbuf is None:
+            return False
 
-            first_child = self.flowbox.get_children()[0]
-            self.flowbox.select_child(first_child)
-            self.on_item_selected(self.flowbox, first_child)
+        self.loaded_tiles[game.gameid] = pixbuf
+        self.loaded_tiles.move_to_end(game.gameid)
+        # Drop the least recently shown images, they are decoded again from the thumbnail cache
+        while len(self.loaded_tiles) > LIBRARY_LOADED_TILES:
+            self.loaded_tiles.popitem(last=False)
 
-        else:
-            pass
+        if tile.game is game:
+            tile.image.set_from_pixbuf(pixbuf)
+        return False
 
-        self.flowbox.show_all()
+    def on_search_changed(self, entry):
+        if self.search_source_id:
+            GLib.source_remove(self.search_source_id)
+        self.search_source_id = GLib.timeout_add(SEARCH_DEBOUNCE_MS, self.apply_search)
+
+    def flush_search(self):
+        if self.search_source_id:
+            GLib.source_remove(self.search_source_id)
+            self.apply_search()
+
+    def apply_search(self):
+        self.search_source_id = None
+        self.search_text = self.entry_search.get_text().lower()
+        self.library_adjustment.set_value(0)
+        self.populate_library(self.catalog.games)
+
+        # Select the first game that is still visible
+        self.select_game(self.library_games[0] if self.library_games else None)
+        return False
 
     def on_item_selected(self, flowbox, child):
-        if child is not None:
-            children = child.get_children()
-            hbox = children[0]
-            label_children = hbox.get_children()
-            game_label = label_children[1]
-            title = game_label.get_text()
+        game = self.catalog.game_for_child(child)
+        self.selected_gameid = game.gameid if game is not None else None
+        self.update_game_actions(game)
+
+    def update_game_actions(self, game):
+        if game is not None:
+            title = game.title
 
             self.menu_item_edit.set_sensitive(True)
             self.menu_item_delete.set_sensitive(True)
 
             if IS_FLATPAK:
-                if title in self.processos:
+                if title in self.tracker:
                     self.menu_item_play.set_sensitive(False)
                     self.button_play.set_sensitive(False)
                     self.button_play.set_image(
@@ -1468,12 +1817,11 @@ class Main(Gtk.Window):
                     self.button_play.set_image(
                         Gtk.Image.new_from_icon_name("faugus-play-symbolic", Gtk.IconSize.BUTTON))
             else:
-                processos = self.load_processes_from_file()
                 if title in self.button_locked:
                     self.menu_item_play.set_sensitive(False)
                     self.button_play.set_sensitive(False)
                     self.button_play.set_image(Gtk.Image.new_from_icon_name("faugus-stop-symbolic", Gtk.IconSize.BUTTON))
-                elif title in processos:
+                elif title in self.tracker:
                     self.menu_item_play.set_sensitive(True)
                     self.button_play.set_sensitive(True)
                     self.button_play.set_image(Gtk.Image.new_from_icon_name("faugus-stop-symbolic", Gtk.IconSize.BUTTON))
@@ -1596,17 +1944,23 @@ class Main(Gtk.Window):
                 os.remove(autostart_path)
 
     def on_button_play_clicked(self, widget):
-        selected_children = self.flowbox.get_selected_children()
-        selected_child = selected_children[0]
-        hbox = selected_child.get_child()
-        game_label = hbox.get_children()[1]
-        title = game_label.get_text()
+        game = self.get_selected_game()
+        if game is None:
+            return
+
+        if game.title in self.tracker:
+            self.stop_game(game)
+        else:
+            self.launch_game(game)
 
-        processos = self.load_processes_from_file()
+    def stop_game(self, game):
+        title = game.title
         self.button_locked[title] = True
 
-        if title in processos:
-            data = processos[title]
+        if title in self.tracker:
+            import psutil
+
+            data = self.tracker.get(title)
 
             for key in ("umu", "main"):
                 pid = data.get(key)
@@ -1619,54 +1973,63 @@ class Main(Gtk.Window):
                     except psutil.NoSuchProcess:
                         continue
 
+    def launch_game(self, game):
+        if not game:
             return
 
-        # Find the selected game object
-        game = next((j for j in self.games if j.title == title), None)
-        if game:
-            # Format the title for command execution
-            game_directory = os.path.dirname(game.path)
-
-            # Save the game title to the latest_games.txt file
-            self.update_latest_games_file(title)
-
-            if self.close_on_launch:
-                if IS_FLATPAK:
-                    subprocess.Popen([sys.executable, faugus_run, "--game", game.gameid], stdout=subprocess.DEVNULL,
-                                    stderr=subprocess.DEVNULL, cwd=game_directory)
-                    sys.exit()
-                else:
-                    self.processo = subprocess.Popen([sys.executable, faugus_run, "--game", game.gameid], cwd=game_directory)
+        # faugus-run measures its launch trace from this moment
+        trace_env = dict(os.environ, FAUGUS_TRACE=f"{time.monotonic():.6f}")
+        title = game.title
+        self.button_locked[title] = True
 
-                    self.menu_item_play.set_sensitive(False)
-                    self.button_play.set_sensitive(False)
-                    self.button_play.set_image(Gtk.Image.new_from_icon_name("faugus-stop-symbolic", Gtk.IconSize.BUTTON))
+        # Format the title for command execution
+        game_directory = os.path.dirname(game.path)
 
-                    def check_pid_timeout():
-                        if self.find_pid(game):
-                            sys.exit()
-                        return True
+        # Save the game title to the latest_games.txt file
+        self.update_latest_games_file(title)
 
-                    GLib.timeout_add(1000, check_pid_timeout)
+        # faugus-run reads the game from games.json, so pending edits must be on disk first
+        game_store.flush()
 
+        if self.close_on_launch:
+            if IS_FLATPAK:
+                subprocess.Popen([sys.executable, faugus_run, "--game", game.gameid], stdout=subprocess.DEVNULL,
+                                stderr=subprocess.DEVNULL, cwd=game_directory)
+                sys.exit()
             else:
-                self.processo = subprocess.Popen([sys.executable, faugus_run, "--game", game.gameid], cwd=game_directory)
+                self.processo = start_faugus_run(["--game", game.gameid], cwd=game_directory, env=trace_env)
+                self.tracker.add(title, self.processo.pid, process=self.processo)
 
                 self.menu_item_play.set_sensitive(False)
                 self.button_play.set_sensitive(False)
                 self.button_play.set_image(Gtk.Image.new_from_icon_name("faugus-stop-symbolic", Gtk.IconSize.BUTTON))
 
-                if IS_FLATPAK:
-                    self.processos[title] = self.processo
-                else:
-                    def check_pid_periodically():
-                        if self.find_pid(game):
-                            return False
-                        return True
+                def check_pid_timeout():
+                    if self.find_pid(game):
+                        sys.exit()
+                    return True
+
+                GLib.timeout_add(1000, check_pid_timeout)
 
-                    GLib.timeout_add(1000, check_pid_periodically)
+        else:
+            self.processo = start_faugus_run(["--game", game.gameid], cwd=game_directory, env=trace_env)
+            self.tracker.add(title, self.processo.pid, process=self.processo)
+
+            self.menu_item_play.set_sensitive(False)
+            self.button_play.set_sensitive(False)
+            self.button_play.set_image(Gtk.Image.new_from_icon_name("faugus-stop-symbolic", Gtk.IconSize.BUTTON))
+
+            if not IS_FLATPAK:
+                def check_pid_periodically():
+                    if self.find_pid(game):
+                        return False
+                    return True
+
+                GLib.timeout_add(1000, check_pid_periodically)
 
     def find_pid(self, game):
+        import psutil
+
         try:
             parent = psutil.Process(self.processo.pid)
             all_descendants = parent.children(recursive=True)
@@ -1684,11 +2047,7 @@ class Main(Gtk.Window):
             except psutil.NoSuchProcess:
                 continue
 
-        self.save_process_to_file(
-            game.title,
-            main_pid=self.processo.pid,
-            umu_pid=umu_run_pid
-        )
+        self.tracker.set_umu_pid(game.title, umu_run_pid)
 
         self.menu_item_play.set_sensitive(True)
         self.button_play.set_sensitive(True)
@@ -1698,23 +2057,6 @@ class Main(Gtk.Window):
 
         return True
 
-    def save_process_to_file(self, title, main_pid, umu_pid=None):
-        os.makedirs(os.path.dirname(running_games), exist_ok=True)
-
-        try:
-            with open(running_games, "r") as f:
-                processos = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            processos = {}
-
-        processos[title] = {
-            "main": main_pid,
-            "umu": umu_pid
-        }
-
-        with open(running_games, "w") as f:
-            json.dump(processos, f, indent=2)
-
     def update_latest_games_file(self, title):
         # Read the existing games from the file, if it exists
         try:
@@ -1757,15 +2099,9 @@ class Main(Gtk.Window):
     def on_button_edit_clicked(self, widget):
         file_path = ""
 
-        selected_children = self.flowbox.get_selected_children()
-        selected_child = selected_children[0]
-        hbox = selected_child.get_child()
-        game_label = hbox.get_children()[1]
-        title = game_label.get_text()
-
-        if game := next((j for j in self.games if j.title == title), None):
-            processos = self.load_processes_from_file()
-            if game.title in processos:
+        if game := self.get_selected_game():
+            title = game.title
+            if game.title in self.tracker:
                 self.game_running = True
             else:
                 self.game_running = False
@@ -1884,17 +2220,7 @@ class Main(Gtk.Window):
             edit_game_dialog.show()
 
     def check_steam_shortcut(self, title):
-        if os.path.exists(steam_shortcuts_path):
-            try:
-                with open(steam_shortcuts_path, 'rb') as f:
-                    shortcuts = vdf.binary_load(f)
-                for game in shortcuts["shortcuts"].values():
-                    if isinstance(game, dict) and "AppName" in game and game["AppName"] == title:
-                        return True
-                return False
-            except SyntaxError:
-                return False
-        return False
+        return steam_shortcuts.has(title)
 
     def set_image_shortcut_icon(self, title, icons_path, icon_temp):
         title_formatted = format_title(title)
@@ -1916,23 +2242,19 @@ class Main(Gtk.Window):
         return image
 
     def on_button_delete_clicked(self, widget):
-        selected_children = self.flowbox.get_selected_children()
-        selected_child = selected_children[0]
-        hbox = selected_child.get_child()
-        game_label = hbox.get_children()[1]
-        title = game_label.get_text()
-
-        if game := next((j for j in self.games if j.title == title), None):
+        if game := self.get_selected_game():
+            title = game.title
             # Display confirmation dialog
             confirmation_dialog = ConfirmationDialog(self, title, game.prefix)
             response = confirmation_dialog.run()
 
             if response == Gtk.ResponseType.YES:
-                processos = self.load_processes_from_file()
-                if title in processos:
-                    data = processos[title]
+                if title in self.tracker:
+                    data = self.tracker.get(title)
                     pid = data.get("main")
                     if pid:
+                        import psutil
+
                         parent = psutil.Process(pid)
                         children = parent.children(recursive=True)
 
@@ -1959,34 +2281,20 @@ class Main(Gtk.Window):
                 self.remove_steam_shortcut(title)
                 self.remove_banner(game)
 
-                self.games.remove(game)
+                self.catalog.remove(game)
                 self.save_games()
                 self.update_list()
 
                 # Remove the game from the latest-games file if it exists
                 self.remove_game_from_latest_games(title)
 
-                if self.flowbox.get_children():
-                    self.flowbox.select_child(self.flowbox.get_children()[0])
-                    self.on_item_selected(self.flowbox, self.flowbox.get_children()[0])
+                if self.library_games:
+                    self.select_game(self.library_games[0])
 
             confirmation_dialog.destroy()
 
     def remove_steam_shortcut(self, title):
-        if os.path.exists(steam_shortcuts_path):
-            try:
-                with open(steam_shortcuts_path, 'rb') as f:
-                    shortcuts = vdf.binary_load(f)
-
-                to_remove = [app_id for app_id, game in shortcuts["shortcuts"].items() if
-                             isinstance(game, dict) and "AppName" in game and game["AppName"] == title]
-                for app_id in to_remove:
-                    del shortcuts["shortcuts"][app_id]
-
-                with open(steam_shortcuts_path, 'wb') as f:
-                    vdf.binary_dump(shortcuts, f)
-            except SyntaxError:
-                pass
+        steam_shortcuts.remove(title)
 
     def remove_game_from_latest_games(self, title):
         try:
@@ -2063,7 +2371,7 @@ class Main(Gtk.Window):
             else:
                 title = add_game_dialog.combobox_launcher.get_active_text()
 
-            if any(game.title == title for game in self.games):
+            if self.catalog.has_title(title):
                 # Display an error message and prevent the dialog from closing
                 self.show_warning_dialog(add_game_dialog, _("%s already exists.") % title)
                 return True
@@ -2082,13 +2390,7 @@ class Main(Gtk.Window):
 
             if self.interface_mode == "Banners":
                 banner = os.path.join(banners_dir, f"{title_formatted}.png")
-                temp_banner_path = add_game_dialog.banner_path_temp
-                try:
-                    # Use `magick` to resize the image
-                    command_magick = shutil.which("magick") or shutil.which("convert")
-                    subprocess.run([command_magick, temp_banner_path, "-resize", "230x345!", banner], check=True)
-                except subprocess.CalledProcessError as e:
-                    print(f"Error resizing banner: {e}")
+                self.save_banner(add_game_dialog.banner_path_temp, banner, title_formatted)
             else:
                 banner = ""
 
@@ -2162,25 +2464,8 @@ class Main(Gtk.Window):
                         add_game_dialog.destroy()
                         self.launcher_screen(title, "5", title_formatted, runner, prefix, umu_run, game, desktop_shortcut_state, appmenu_shortcut_state, steam_shortcut_state, icon_temp, icon_final)
 
-            game_info = {"gameid": title_formatted, "title": title, "path": path, "prefix": prefix, "launch_arguments": launch_arguments,
-                "game_arguments": game_arguments, "mangohud": mangohud, "gamemode": gamemode, "disable_hidraw": disable_hidraw,
-                "protonfix": protonfix, "runner": runner, "addapp_checkbox": addapp_checkbox, "addapp": addapp,
-                "addapp_bat": addapp_bat, "banner": banner, "lossless": lossless, }
-
-            games = []
-            if os.path.exists("games.json"):
-                try:
-                    with open("games.json", "r", encoding="utf-8") as file:
-                        games = json.load(file)
-                except json.JSONDecodeError as e:
-                    print(f"Error reading the JSON file: {e}")
-
-            games.append(game_info)
-
-            with open("games.json", "w", encoding="utf-8") as file:
-                json.dump(games, file, ensure_ascii=False, indent=4)
-
-            self.games.append(game)
+            self.catalog.add(game)
+            self.save_games()
 
             if add_game_dialog.combobox_launcher.get_active() == 0 or add_game_dialog.combobox_launcher.get_active() == 1:
                 # Call add_remove_shortcut method
@@ -2196,7 +2481,6 @@ class Main(Gtk.Window):
                         else:
                             bat_file.write(f'start "" "z:{path}"\n')
 
-                self.add_item_list(game)
                 self.update_list()
 
                 # Select the added game
@@ -2313,7 +2597,6 @@ class Main(Gtk.Window):
             self.add_shortcut(game, appmenu_shortcut_state, "appmenu", icon_temp, icon_final)
             self.add_steam_shortcut(game, steam_shortcut_state, icon_temp, icon_final)
 
-            self.add_item_list(game)
             self.update_list()
             self.select_game_by_title(title)
 
@@ -2359,6 +2642,8 @@ class Main(Gtk.Window):
                     GLib.idle_add(self.bar_download.set_text, f"{int(percent * 100)}%")
 
             def start_download():
+                import urllib.request
+
                 try:
                     urllib.request.urlretrieve(urls[launcher], file_path, reporthook=report_progress)
                     GLib.idle_add(self.bar_download.set_fraction, 1.0)
@@ -2371,23 +2656,23 @@ class Main(Gtk.Window):
                 self.label_download.set_text(_("Installing %s...") % title)
                 if launcher == "battle":
                     self.label_download2.set_text(_("Please close the login window and wait..."))
-                    command = f"FAUGUS_LOG={title_formatted} WINE_SIMULATE_WRITECOPY=1 WINEPREFIX='{prefix}' GAMEID={title_formatted} {umu_run} '{file_path}' --installpath='C:\\Program Files (x86)\\Battle.net' --lang=enUS"
+                    command = f"FAUGUS_LOG={shlex.quote(title_formatted)} WINE_SIMULATE_WRITECOPY=1 WINEPREFIX={shlex.quote(prefix)} GAMEID={shlex.quote(title_formatted)} {shlex.quote(umu_run)} {shlex.quote(file_path)} --installpath='C:\\Program Files (x86)\\Battle.net' --lang=enUS"
                 elif launcher == "ea":
                     self.label_download2.set_text(_("Please close the login window and wait..."))
-                    command = f"FAUGUS_LOG={title_formatted} WINEPREFIX='{prefix}' GAMEID={title_formatted} {umu_run} '{file_path}' /S"
+                    command = f"FAUGUS_LOG={shlex.quote(title_formatted)} WINEPREFIX={shlex.quote(prefix)} GAMEID={shlex.quote(title_formatted)} {shlex.quote(umu_run)} {shlex.quote(file_path)} /S"
                 elif launcher == "epic":
                     self.label_download2.set_text("")
-                    command = f"FAUGUS_LOG={title_formatted} WINEPREFIX='{prefix}' GAMEID={title_formatted} {umu_run} msiexec /i '{file_path}' /passive"
+                    command = f"FAUGUS_LOG={shlex.quote(title_formatted)} WINEPREFIX={shlex.quote(prefix)} GAMEID={shlex.quote(title_formatted)} {shlex.quote(umu_run)} msiexec /i {shlex.quote(file_path)} /passive"
                 elif launcher == "ubisoft":
                     self.label_download2.set_text("")
-                    command = f"FAUGUS_LOG={title_formatted} WINEPREFIX='{prefix}' GAMEID={title_formatted} {umu_run} '{file_path}' /S"
+                    command = f"FAUGUS_LOG={shlex.quote(title_formatted)} WINEPREFIX={shlex.quote(prefix)} GAMEID={shlex.quote(title_formatted)} {shlex.quote(umu_run)} {shlex.quote(file_path)} /S"
 
                 if runner:
-                    command = f"PROTONPATH={runner} {command}"
+                    command = f"PROTONPATH={shlex.quote(runner)} {command}"
 
                 self.bar_download.set_visible(False)
                 self.label_download2.set_visible(True)
-                processo = subprocess.Popen([sys.executable, faugus_run, command])
+                processo = start_faugus_run([command])
                 GLib.timeout_add(100, self.monitor_process, processo, game, desktop_shortcut_state, appmenu_shortcut_state, steam_shortcut_state, icon_temp, icon_final, title)
 
             threading.Thread(target=start_download).start()
@@ -2395,17 +2680,8 @@ class Main(Gtk.Window):
             return file_path
 
     def select_game_by_title(self, title):
-        # Selects an item from the FlowBox based on the title
-        for child in self.flowbox.get_children():
-            hbox = child.get_children()[0]  # The first item is the hbox containing the label
-            game_label = hbox.get_children()[1]  # The second item is the title label
-            if game_label.get_text() == title:
-                # Selects the child in the FlowBox
-                self.flowbox.select_child(child)
-                break
-
-        # Calls the item selection method to ensure the buttons are updated
-        self.on_item_selected(self.flowbox, child)
+        # Selects the game based on the title and scrolls its tile into view
+        self.select_game(self.catalog.get_by_title(title))
 
     def on_edit_dialog_response(self, dialog, response_id, edit_game_dialog, game):
         # Handle edit dialog response
@@ -2415,6 +2691,7 @@ class Main(Gtk.Window):
                 return True
             # Update game object with new information
             game.title = edit_game_dialog.entry_title.get_text()
+            game.search_title = game.title.lower()
             game.path = edit_game_dialog.entry_path.get_text()
             game.prefix = edit_game_dialog.entry_prefix.get_text()
             game.launch_arguments = edit_game_dialog.entry_launch_arguments.get_text()
@@ -2435,14 +2712,8 @@ class Main(Gtk.Window):
 
             if self.interface_mode == "Banners":
                 banner = os.path.join(banners_dir, f"{title_formatted}.png")
-                temp_banner_path = edit_game_dialog.banner_path_temp
-                try:
-                    # Use `magick` to resize the image
-                    command_magick = shutil.which("magick") or shutil.which("convert")
-                    subprocess.run([command_magick, temp_banner_path, "-resize", "230x345!", banner], check=True)
+                if self.save_banner(edit_game_dialog.banner_path_temp, banner, title_formatted):
                     game.banner = banner
-                except subprocess.CalledProcessError as e:
-                    print(f"Error resizing banner: {e}")
 
             if game.runner == "UMU-Proton Latest":
                 game.runner = ""
@@ -2570,130 +2841,46 @@ class Main(Gtk.Window):
 
     def add_steam_shortcut(self, game, steam_shortcut_state, icon_temp, icon_final):
         def add_game_to_steam(title, game_directory, icon):
-            # Load existing shortcuts
-            shortcuts = load_shortcuts(title)
-
-            # Check if the game already exists
-            existing_app_id = None
-            for app_id, game_info in shortcuts["shortcuts"].items():
-                if isinstance(game_info, dict) and "AppName" in game_info and game_info["AppName"] == title:
-                    existing_app_id = app_id
-                    break
-
-            if existing_app_id:
-                # Update only the necessary fields without replacing the entire entry
-                game_info = shortcuts["shortcuts"][existing_app_id]
-                if IS_FLATPAK:
-                    if IS_STEAM_FLATPAK:
-                        game_info["Exe"] = f'"flatpak-spawn"'
-                        game_info["LaunchOptions"] = f'--host flatpak run --command=/app/bin/faugus-run io.github.Faugus.faugus-launcher --game {game.gameid}'
-                    else:
-                        game_info["Exe"] = f'"flatpak"'
-                        game_info["LaunchOptions"] = f'run --command=/app/bin/faugus-run io.github.Faugus.faugus-launcher --game {game.gameid}'
-                else:
-                    game_info["Exe"] = f'"{faugus_run}"'
-                    game_info["LaunchOptions"] = f'--game {game.gameid}'
-                game_info["StartDir"] = game_directory
-                game_info["icon"] = icon
-            else:
-                # Generate a new ID for the game
-                new_app_id = max([int(k) for k in shortcuts["shortcuts"].keys() if k.isdigit()] or [0]) + 1
-
-                # Add the new game
-                if IS_FLATPAK:
-                    if IS_STEAM_FLATPAK:
-                        shortcuts["shortcuts"][str(new_app_id)] = {
-                            "appid": new_app_id,
-                            "AppName": title,
-                            "Exe": f'"flatpak-spawn"',
-                            "StartDir": game_directory,
-                            "icon": icon,
-                            "ShortcutPath": "",
-                            "LaunchOptions": f'--host flatpak run --command=/app/bin/faugus-run io.github.Faugus.faugus-launcher --game {game.gameid}',
-                            "IsHidden": 0,
-                            "AllowDesktopConfig": 1,
-                            "AllowOverlay": 1,
-                            "OpenVR": 0,
-                            "Devkit": 0,
-                            "DevkitGameID": "",
-                            "LastPlayTime": 0,
-                            "FlatpakAppID": "",
-                        }
-                    else:
-                        shortcuts["shortcuts"][str(new_app_id)] = {
-                            "appid": new_app_id,
-                            "AppName": title,
-                            "Exe": f'"flatpak"',
-                            "StartDir": game_directory,
-                            "icon": icon,
-                            "ShortcutPath": "",
-                            "LaunchOptions": f'run --command=/app/bin/faugus-run io.github.Faugus.faugus-launcher --game {game.gameid}',
-                            "IsHidden": 0,
-                            "AllowDesktopConfig": 1,
-                            "AllowOverlay": 1,
-                            "OpenVR": 0,
-                            "Devkit": 0,
-                            "DevkitGameID": "",
-                            "LastPlayTime": 0,
-                            "FlatpakAppID": "",
-                        }
+            if IS_FLATPAK:
+                if IS_STEAM_FLATPAK:
+                    exe = f'"flatpak-spawn"'
+                    launch_options = f'--host flatpak run --command=/app/bin/faugus-run io.github.Faugus.faugus-launcher --game {game.gameid}'
                 else:
-                    shortcuts["shortcuts"][str(new_app_id)] = {
-                        "appid": new_app_id,
-                        "AppName": title,
-                        "Exe": f'"{faugus_run}"',
-                        "StartDir": game_directory,
-                        "icon": icon,
-                        "ShortcutPath": "",
-                        "LaunchOptions": f'--game {game.gameid}',
-                        "IsHidden": 0,
-                        "AllowDesktopConfig": 1,
-                        "AllowOverlay": 1,
-                        "OpenVR": 0,
-                        "Devkit": 0,
-                        "DevkitGameID": "",
-                        "LastPlayTime": 0,
-                        "FlatpakAppID": "",
-                    }
-
-            # Save shortcuts back to the file
-            save_shortcuts(shortcuts)
-
-        def remove_shortcuts(shortcuts, title):
-            # Find and remove existing shortcuts with the same title
-            if os.path.exists(steam_shortcuts_path):
-                to_remove = [app_id for app_id, game in shortcuts["shortcuts"].items() if
-                             isinstance(game, dict) and "AppName" in game and game["AppName"] == title]
-                for app_id in to_remove:
-                    del shortcuts["shortcuts"][app_id]
-                save_shortcuts(shortcuts)
-
-        def load_shortcuts(title):
-            # Check if the file exists
-            if os.path.exists(steam_shortcuts_path):
-                try:
-                    # Attempt to load existing shortcuts
-                    with open(steam_shortcuts_path, 'rb') as f:
-                        return vdf.binary_load(f)
-                except SyntaxError:
-                    # If the file is corrupted, create a new one
-                    return {"shortcuts": {}}
+                    exe = f'"flatpak"'
+                    launch_options = f'run --command=/app/bin/faugus-run io.github.Faugus.faugus-launcher --game {game.gameid}'
             else:
-                # If the file does not exist, create a new one
-                return {"shortcuts": {}}
-
-        def save_shortcuts(shortcuts):
-            if not os.path.exists(steam_shortcuts_path):
-                open(steam_shortcuts_path, 'wb').close()
-
-            with open(steam_shortcuts_path, 'wb') as f:
-                vdf.binary_dump(shortcuts, f)
+                exe = f'"{faugus_run}"'
+                launch_options = f'--game {game.gameid}'
+
+            entry = {
+                "AppName": title,
+                "Exe": exe,
+                "StartDir": game_directory,
+                "icon": icon,
+                "ShortcutPath": "",
+                "LaunchOptions": launch_options,
+                "IsHidden": 0,
+                "AllowDesktopConfig": 1,
+                "AllowOverlay": 1,
+                "OpenVR": 0,
+                "Devkit": 0,
+                "DevkitGameID": "",
+                "LastPlayTime": 0,
+                "FlatpakAppID": "",
+            }
+            # An existing shortcut keeps everything except these fields
+            fields = {
+                "Exe": exe,
+                "LaunchOptions": launch_options,
+                "StartDir": game_directory,
+                "icon": icon,
+            }
+            steam_shortcuts.set(title, entry, fields)
 
         # Check if the shortcut checkbox is checked
         if not steam_shortcut_state:
             # Remove existing shortcut if it exists
-            shortcuts = load_shortcuts(game.title)
-            remove_shortcuts(shortcuts, game.title)
+            steam_shortcuts.remove(game.title)
             if os.path.isfile(os.path.expanduser(icon_temp)):
                 os.rename(os.path.expanduser(icon_temp), icon_final)
             return
@@ -2739,10 +2926,88 @@ class Main(Gtk.Window):
         else:
             dialog.set_preview_widget_active(False)
 
+    def save_banner(self, source, banner, gameid):
+        # The dialog deletes its temp file right away, so only reading it happens here
+        try:
+            with open(source, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            print(f"Error resizing banner: {e}")
+            return False
+
+        def run():
+            try:
+                if normalize_banner(data, banner):
+                    GLib.idle_add(self.refresh_tile, gameid)
+            except (OSError, ValueError) as e:
+                print(f"Error resizing banner: {e}")
+
+        threading.Thread(target=run).start()
+        return True
+
+    def refresh_tile(self, gameid):
+        self.loaded_tiles.pop(gameid, None)
+        child = self.catalog.child_for_game(self.catalog.get(gameid))
+        if child:
+            self.load_tile_image(child)
+        return False
+
+    def create_missing_small_banners(self):
+        # Runs once per session, the first time the library is shown as banners
+        if self.small_banners_checked:
+            return
+        self.small_banners_checked = True
+        banners = [(game.gameid, game.banner) for game in self.catalog.games if game.banner]
+
+        def run():
+            for gameid, banner in banners:
+                if not os.path.isfile(banner) or os.path.isfile(small_banner_path(banner)):
+                    continue
+                try:
+                    write_small_banner(banner)
+                except (OSError, ValueError) as e:
+                    print(f"Error resizing banner: {e}")
+                    continue
+                if self.smaller_banners:
+                    GLib.idle_add(self.refresh_tile, gameid)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def fetch_missing_banners(self, progress=None, done=None):
+        # Games without a banner file get one from the banner search, the callbacks
+        # run on the main loop after the library has been updated
+        missing = {}
+        for game in self.catalog.games:
+            if game.banner == "" or not os.path.isfile(game.banner):
+                missing[os.path.join(banners_dir, f"{game.gameid}.png")] = game
+
+        def on_progress(handled, total, banner):
+            game = missing.get(banner)
+            if game is not None:
+                game.banner = banner
+                self.refresh_tile(game.gameid)
+            if progress:
+                progress(handled, total)
+            return False
+
+        def on_done(written):
+            if written:
+                self.save_games()
+            if done:
+                done(written)
+            return False
+
+        if not missing:
+            on_done(0)
+            return
+        items = [(game.title, banner) for banner, game in missing.items()]
+        banner_service.fetch_missing(items, on_progress, on_done)
+
     def remove_banner(self, game):
         banner_file_path = f"{banners_dir}/{game.gameid}.png"
-        if os.path.exists(banner_file_path):
-            os.remove(banner_file_path)
+        for path in (banner_file_path, small_banner_path(banner_file_path)):
+            if os.path.exists(path):
+                os.remove(path)
 
     def remove_shortcut(self, game, shortcut):
         applications_shortcut_path = f"{app_dir}/{game.gameid}.desktop"
@@ -2760,12 +3025,9 @@ class Main(Gtk.Window):
                 os.remove(desktop_shortcut_path)
 
     def update_list(self):
-        for child in self.flowbox.get_children():
-            self.flowbox.remove(child)
-
-        self.games.clear()
         self.load_games()
         self.entry_search.set_text("")
+        self.flush_search()
         self.show_all()
         if self.interface_mode != "List":
             if self.fullscreen_activated:
@@ -2779,7 +3041,7 @@ class Main(Gtk.Window):
 
     def save_games(self):
         games_data = []
-        for game in self.games:
+        for game in self.catalog.games:
             game_info = {"gameid": game.gameid, "title": game.title, "path": game.path, "prefix": game.prefix,
                 "launch_arguments": game.launch_arguments, "game_arguments": game.game_arguments,
                 "mangohud": "MANGOHUD=1" if game.mangohud else "", "gamemode": "gamemoderun" if game.gamemode else "",
@@ -2788,8 +3050,7 @@ class Main(Gtk.Window):
                 "addapp": game.addapp, "addapp_bat": game.addapp_bat, "banner": game.banner, "lossless": game.lossless, }
             games_data.append(game_info)
 
-        with open("games.json", "w", encoding="utf-8") as file:
-            json.dump(games_data, file, ensure_ascii=False, indent=4)
+        game_store.save(games_data)
 
 class Settings(Gtk.Dialog):
     def __init__(self, parent):
@@ -2947,6 +3208,9 @@ class Settings(Gtk.Dialog):
         self.checkbox_smaller_banners = Gtk.CheckButton(label=_("Smaller banners"))
         self.checkbox_smaller_banners.set_active(False)
 
+        self.button_fetch_banners = Gtk.Button(label=_("Fetch missing banners"))
+        self.button_fetch_banners.connect("clicked", self.on_button_fetch_banners_clicked)
+
         # Widgets for prefix
         self.label_default_prefix = Gtk.Label(label=_("Default Prefixes Location"))
         self.label_default_prefix.set_halign(Gtk.Align.START)
@@ -3300,6 +3564,7 @@ class Settings(Gtk.Dialog):
         self.grid_big_interface.attach(self.checkbox_start_fullscreen, 0, 1, 1, 1)
         self.grid_big_interface.attach(self.checkbox_show_labels, 0, 2, 1, 1)
         self.grid_big_interface.attach(self.checkbox_smaller_banners, 0, 3, 1, 1)
+        self.grid_big_interface.attach(self.button_fetch_banners, 0, 4, 1, 1)
 
         grid_support.attach(button_kofi, 0, 1, 1, 1)
         grid_support.attach(button_paypal, 1, 1, 1, 1)
@@ -3426,10 +3691,24 @@ class Settings(Gtk.Dialog):
             self.grid_big_interface.set_visible(True)
             self.checkbox_show_labels.set_visible(False)
             self.checkbox_smaller_banners.set_visible(False)
+            self.button_fetch_banners.set_visible(False)
         if active_index == 2:
             self.grid_big_interface.set_visible(True)
             self.checkbox_show_labels.set_visible(True)
             self.checkbox_smaller_banners.set_visible(True)
+            self.button_fetch_banners.set_visible(True)
+
+    def on_button_fetch_banners_clicked(self, widget):
+        widget.set_sensitive(False)
+
+        def on_progress(handled, total):
+            widget.set_label(f'{_("Fetching banners")} {handled}/{total}')
+
+        def on_done(written):
+            widget.set_label(_("Fetch missing banners"))
+            widget.set_sensitive(True)
+
+        self.parent.fetch_missing_banners(on_progress, on_done)
 
     def on_checkbox_system_tray_toggled(self, widget):
         if not widget.get_active():
@@ -3632,10 +3911,10 @@ class Settings(Gtk.Dialog):
             command_parts.append(f'GAMEID=winetricks-gui')
             command_parts.append(f'STORE=none')
             if default_runner:
-                command_parts.append(f'PROTONPATH={default_runner}')
+                command_parts.append(f'PROTONPATH={shlex.quote(default_runner)}')
 
             # Add the fixed command and remaining arguments
-            command_parts.append(f'"{umu_run}"')
+            command_parts.append(shlex.quote(umu_run))
             command_parts.append('""')
 
             # Join all parts into a single command
@@ -3643,11 +3922,8 @@ class Settings(Gtk.Dialog):
 
             print(command)
 
-            # faugus-run path
-            faugus_run_path = faugus_run
-
             def run_command():
-                process = subprocess.Popen([sys.executable, faugus_run_path, command, "winetricks"])
+                process = start_faugus_run([command, "winetricks"])
                 process.wait()
                 GLib.idle_add(self.set_sensitive, True)
                 GLib.idle_add(self.parent.set_sensitive, True)
@@ -3676,10 +3952,10 @@ class Settings(Gtk.Dialog):
             command_parts.append(f'FAUGUS_LOG=default')
             command_parts.append(f'GAMEID=default')
             if default_runner:
-                command_parts.append(f'PROTONPATH={default_runner}')
+                command_parts.append(f'PROTONPATH={shlex.quote(default_runner)}')
 
             # Add the fixed command and remaining arguments
-            command_parts.append(f'"{umu_run}"')
+            command_parts.append(shlex.quote(umu_run))
             command_parts.append('"winecfg"')
 
             # Join all parts into a single command
@@ -3687,11 +3963,8 @@ class Settings(Gtk.Dialog):
 
             print(command)
 
-            # faugus-run path
-            faugus_run_path = faugus_run
-
             def run_command():
-                process = subprocess.Popen([sys.executable, faugus_run_path, command])
+                process = start_faugus_run([command])
                 process.wait()
                 GLib.idle_add(self.set_sensitive, True)
                 GLib.idle_add(self.parent.set_sensitive, True)
@@ -3787,25 +4060,22 @@ class Settings(Gtk.Dialog):
                     if file_run:
                         command_parts.append(f'GAMEID=default')
                     if default_runner:
-                        command_parts.append(f'PROTONPATH={default_runner}')
-                    command_parts.append(f'"{umu_run}" "{file_run}"')
+                        command_parts.append(f'PROTONPATH={shlex.quote(default_runner)}')
+                    command_parts.append(f'{shlex.quote(umu_run)} {shlex.quote(file_run)}')
                 else:
                     if file_run:
                         command_parts.append(f'GAMEID=default')
                     if default_runner:
-                        command_parts.append(f'PROTONPATH={default_runner}')
-                    command_parts.append(f'"{umu_run}" regedit "{file_run}"')
+                        command_parts.append(f'PROTONPATH={shlex.quote(default_runner)}')
+                    command_parts.append(f'{shlex.quote(umu_run)} regedit {shlex.quote(file_run)}')
 
                 # Join all parts into a single command
                 command = ' '.join(command_parts)
 
                 print(command)
 
-                # faugus-run path
-                faugus_run_path = faugus_run
-
                 def run_command():
-                    process = subprocess.Popen([sys.executable, faugus_run_path, command])
+                    process = start_faugus_run([command])
                     process.wait()
                     GLib.idle_add(self.set_sensitive, True)
                     GLib.idle_add(self.parent.set_sensitive, True)
@@ -3826,6 +4096,7 @@ class Settings(Gtk.Dialog):
     def on_button_backup_clicked(self, widget):
         self.response(Gtk.ResponseType.OK)
         self.show_warning_dialog(self, _("Prefixes and runners will not be backed up!"))
+        game_store.flush()
 
         items = ["banners", "icons", "config.ini", "games.json", "latest-games.txt"]
 
@@ -3967,6 +4238,7 @@ class Settings(Gtk.Dialog):
                         shutil.copy2(src, dst)
 
                 shutil.rmtree(temp_dir)
+                game_store.reload()
                 global faugus_backup
                 faugus_backup = True
                 self.response(Gtk.ResponseType.OK)
@@ -4065,9 +4337,11 @@ class Settings(Gtk.Dialog):
         return response == Gtk.ResponseType.OK
 
     def on_button_kofi_clicked(self, widget):
+        import webbrowser
         webbrowser.open("https://ko-fi.com/K3K210EMDU")
 
     def on_button_paypal_clicked(self, widget):
+        import webbrowser
         webbrowser.open("https://www.paypal.com/donate/?business=57PP9DVD3VWAN&no_recurring=0&currency_code=USD")
 
     def on_button_search_prefix_clicked(self, widget):
@@ -4262,6 +4536,7 @@ class Game:
         # Initialize a Game object with various attributes
         self.gameid = gameid
         self.title = title  # Title of the game
+        self.search_title = title.lower()  # Lowercase title for sorting and search
         self.path = path  # Path to the game executable
         self.launch_arguments = launch_arguments  # Arguments to launch the game
         self.game_arguments = game_arguments  # Arguments specific to the game
@@ -4278,14 +4553,1481 @@ class Game:
         self.lossless = lossless
 
 
-class DuplicateDialog(Gtk.Dialog):
-    def __init__(self, parent, title):
-        super().__init__(title=_("Duplicate %s") % title, transient_for=parent, modal=True)
-        self.set_resizable(False)
-        self.set_icon_from_file(faugus_png)
+class ThumbnailCache:
+    def __init__(self, cache_dir, workers=4):
+        # Decodes images at their display size on worker threads and keeps the
+        # scaled results on disk, keyed by source path, mtime and size
+        self.cache_dir = cache_dir
+        self.executor = ThreadPoolExecutor(max_workers=min(workers, os.cpu_count() or 1))
+        self.futures = set()
 
-        label_title = Gtk.Label(label=_("Title"))
-        label_title.set_halign(Gtk.Align.START)
+    def cache_path(self, source, width, height):
+        stat = os.stat(source)
+        key = f"{os.path.abspath(source)}|{stat.st_mtime_ns}|{stat.st_size}|{width}x{height}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".png")
+
+    def request(self, source, width, height, callback, *args):
+        # The callback runs on the main loop with the pixbuf, or None if the image could not be loaded
+        future = self.executor.submit(self.load, source, width, height)
+        self.futures.add(future)
+
+        def on_done(future):
+            self.futures.discard(future)
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                print(f"Error loading image {source}: {future.exception()}")
+                GLib.idle_add(callback, None, *args)
+            else:
+                GLib.idle_add(callback, future.result(), *args)
+
+        future.add_done_callback(on_done)
+        return future
+
+    def cancel_all(self):
+        for future in list(self.futures):
+            future.cancel()
+
+    def load(self, source, width, height):
+        try:
+            cached = self.cache_path(source, width, height)
+        except OSError as e:
+            print(f"Error reading image {source}: {e}")
+            return None
+
+        if os.path.isfile(cached):
+            try:
+                return GdkPixbuf.Pixbuf.new_from_file(cached)
+            except GLib.Error:
+                pass
+
+        try:
+            pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(source, width, height, False)
+        except GLib.Error as e:
+            print(f"Error loading image {source}: {e}")
+            return None
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{cached}.{threading.get_ident()}.tmp"
+            pixbuf.savev(temp_path, "png", [], [])
+            os.replace(temp_path, cached)
+        except (GLib.Error, OSError) as e:
+            print(f"Error caching thumbnail for {source}: {e}")
+
+        return pixbuf
+
+
+class BannerService:
+    def __init__(self, cache_dir, base_url=BANNER_API_URL, workers=BANNER_FETCH_WORKERS, timeout=(5, 15)):
+        # Downloaded banners are kept on disk keyed by the normalized title, and a title
+        # that is already being looked up shares the request in flight
+        self.cache_dir = cache_dir
+        self.base_url = base_url.rstrip("/") + "/"
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.lock = threading.RLock()
+        self.pending = {}
+
+    @staticmethod
+    def normalize_title(title):
+        return " ".join(title.lower().split())
+
+    def cache_path(self, title):
+        key = hashlib.sha1(self.normalize_title(title).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key)
+
+    def fetch(self, title):
+        # Runs on a worker thread, returns the cached image or None if there is no banner
+        path = self.cache_path(title)
+        if os.path.isfile(path):
+            return path
+        miss_path = f"{path}.miss"
+        try:
+            if time.time() - os.path.getmtime(miss_path) < BANNER_MISS_SECONDS:
+                return None
+        except OSError:
+            pass
+
+        import requests
+
+        api_url = self.base_url + urllib.parse.quote(title.strip())
+        try:
+            response = requests.get(api_url, timeout=self.timeout)
+            if response.status_code == 404:
+                image_url = ""
+            else:
+                response.raise_for_status()
+                image_url = response.text.strip().strip('"')
+
+            if not image_url:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with open(miss_path, "w"):
+                    pass
+                return None
+
+            image = requests.get(image_url, timeout=self.timeout)
+            image.raise_for_status()
+        except requests.RequestException as e:
+            print(f"Error fetching the banner: {e}")
+            return None
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(image.content)
+        os.replace(temp_path, path)
+        return path
+
+    def submit(self, title):
+        key = self.normalize_title(title)
+        with self.lock:
+            future = self.pending.get(key)
+            if future is None:
+                future = self.executor.submit(self.fetch, title)
+                self.pending[key] = future
+                future.add_done_callback(lambda done: self.forget(key, done))
+            return future
+
+    def forget(self, key, future):
+        with self.lock:
+            if self.pending.get(key) is future:
+                del self.pending[key]
+
+    def request(self, title, callback, *args):
+        # The callback runs on the main loop with the cached image, or None if nothing was found
+        def on_done(future):
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                print(f"Error fetching the banner: {future.exception()}")
+                GLib.idle_add(callback, None, *args)
+            else:
+                GLib.idle_add(callback, future.result(), *args)
+
+        future = self.submit(title)
+        future.add_done_callback(on_done)
+        return future
+
+    def fetch_missing(self, items, progress, done):
+        # Looks up (title, banner) pairs on the worker pool and writes each banner found.
+        # progress runs on the main loop with the pairs handled, the total and the banner
+        # written or None; done runs last with the number of banners written.
+        def run():
+            by_future = {}
+            for title, banner in items:
+                by_future.setdefault(self.submit(title), []).append(banner)
+
+            handled = 0
+            written = 0
+            for future in as_completed(by_future):
+                try:
+                    path = future.result()
+                except Exception as e:
+                    print(f"Error fetching the banner: {e}")
+                    path = None
+
+                data = None
+                if path:
+                    try:
+                        with open(path, "rb") as f:
+                            data = f.read()
+                    except OSError as e:
+                        print(f"Error reading banner {path}: {e}")
+
+                for banner in by_future[future]:
+                    handled += 1
+                    stored = None
+                    if data is not None:
+                        try:
+                            normalize_banner(data, banner)
+                            stored = banner
+                            written += 1
+                        except (OSError, ValueError) as e:
+                            print(f"Error resizing banner: {e}")
+                    GLib.idle_add(progress, handled, len(items), stored)
+
+            GLib.idle_add(done, written)
+
+        threading.Thread(target=run).start()
+
+
+class ProcessTracker:
+    def __init__(self, path, on_exit):
+        # Running games are kept in memory and the kernel tells us when they exit,
+        # running_games.json is only written when that state changes
+        self.path = path
+        self.on_exit = on_exit
+        self.running = {}
+        self.watches = {}
+        self.processes = {}
+
+    def __contains__(self, title):
+        return title in self.running
+
+    def get(self, title):
+        return self.running.get(title)
+
+    def load(self):
+        # Pick up games started by a previous launcher instance
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            data = {}
+
+        changed = False
+        for title, pids in data.items():
+            if isinstance(pids, dict) and pids.get("main") and self.watch(title, pids["main"]):
+                self.running[title] = {"main": pids["main"], "umu": pids.get("umu")}
+            else:
+                changed = True
+
+        if changed:
+            self.save()
+
+    def add(self, title, main_pid, umu_pid=None, process=None):
+        self.unwatch(title)
+        if process is not None:
+            self.processes[title] = process
+        if self.watch(title, main_pid):
+            self.running[title] = {"main": main_pid, "umu": umu_pid}
+            self.save()
+
+    def set_umu_pid(self, title, umu_pid):
+        pids = self.running.get(title)
+        if pids is not None and pids.get("umu") != umu_pid:
+            pids["umu"] = umu_pid
+            self.save()
+
+    def watch(self, title, pid):
+        try:
+            pidfd = os.pidfd_open(pid)
+        except ProcessLookupError:
+            return False
+        except (AttributeError, OSError):
+            # No pidfd support (Python < 3.9 or Linux < 5.3)
+            if isinstance(self.processes.get(title), subprocess.Popen):
+                source_id = GLib.child_watch_add(GLib.PRIORITY_DEFAULT, pid, self.on_child_exit, title)
+            else:
+                try:
+                    os.kill(pid, 0)
+                except ProcessLookupError:
+                    return False
+                except PermissionError:
+                    pass
+                source_id = GLib.timeout_add_seconds(2, self.on_poll, title, pid)
+            self.watches[title] = (source_id, None)
+            return True
+
+        source_id = GLib.unix_fd_add_full(GLib.PRIORITY_DEFAULT, pidfd, GLib.IOCondition.IN, self.on_pidfd_ready,
+                                          title)
+        self.watches[title] = (source_id, pidfd)
+        return True
+
+    def unwatch(self, title):
+        source_id, pidfd = self.watches.pop(title, (None, None))
+        if source_id is not None:
+            GLib.source_remove(source_id)
+        if pidfd is not None:
+            os.close(pidfd)
+
+    def on_pidfd_ready(self, fd, condition, title):
+        self.finish(title)
+        return False
+
+    def on_child_exit(self, pid, status, title):
+        self.finish(title)
+
+    def on_poll(self, title, pid):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            self.finish(title)
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def finish(self, title):
+        # The GLib source is already being removed by its callback returning False
+        source_id, pidfd = self.watches.pop(title, (None, None))
+        if pidfd is not None:
+            os.close(pidfd)
+
+        process = self.processes.pop(title, None)
+        if process is not None:
+            process.poll()
+
+        if title in self.running:
+            del self.running[title]
+            self.save()
+        self.on_exit(title)
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.running, f, indent=2)
+        os.replace(temp_path, self.path)
+
+
+class ControlServer:
+    def __init__(self, path, handler):
+        # Each connection sends one command line and gets one reply line back,
+        # the handler runs on the main loop and returns the reply
+        self.path = path
+        self.handler = handler
+        self.server = None
+        self.inode = None
+        self.source_id = None
+
+    def start(self):
+        # Only the instance holding the lock gets here, so a socket left behind is stale
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        except OSError as e:
+            print(f"Failed to open the control socket {self.path}: {e}")
+            return False
+
+        try:
+            server.bind(self.path)
+            os.chmod(self.path, 0o600)
+            server.listen(8)
+            self.inode = os.stat(self.path).st_ino
+        except OSError as e:
+            server.close()
+            print(f"Failed to open the control socket {self.path}: {e}")
+            return False
+
+        server.setblocking(False)
+        self.server = server
+        self.source_id = GLib.io_add_watch(server.fileno(), GLib.PRIORITY_DEFAULT, GLib.IO_IN, self.on_accept)
+        atexit.register(self.stop)
+        return True
+
+    def stop(self):
+        if self.source_id:
+            GLib.source_remove(self.source_id)
+            self.source_id = None
+        if self.server is None:
+            return
+        self.server.close()
+        self.server = None
+        # A newer instance may already have replaced the socket after the lock was released
+        try:
+            if os.stat(self.path).st_ino == self.inode:
+                os.unlink(self.path)
+        except OSError:
+            pass
+
+    def on_accept(self, fd, condition):
+        try:
+            conn, _addr = self.server.accept()
+        except BlockingIOError:
+            return True
+        except OSError as e:
+            print(f"Error accepting a control connection: {e}")
+            return True
+        conn.setblocking(False)
+        GLib.io_add_watch(conn.fileno(), GLib.PRIORITY_DEFAULT,
+                          GLib.IO_IN | GLib.IO_HUP | GLib.IO_ERR,
+                          self.on_client, conn, bytearray())
+        return True
+
+    def on_client(self, fd, condition, conn, buffer):
+        try:
+            data = conn.recv(4096)
+        except BlockingIOError:
+            return True
+        except OSError:
+            data = b""
+        buffer.extend(data)
+        if data and b"\n" not in buffer and len(buffer) < 4096:
+            return True
+
+        command = bytes(buffer).split(b"\n", 1)[0].decode("utf-8", "replace").strip()
+        if command:
+            try:
+                reply = self.handler(command)
+            except Exception as e:
+                reply = f"error: {e}"
+            try:
+                conn.settimeout(1)
+                conn.sendall(f"{reply}\n".encode("utf-8"))
+            except OSError:
+                pass
+        conn.close()
+        return False
+
+
+class WorkerProcess:
+    def __init__(self, conn, pid, pending=b""):
+        # Stands in for the Popen of a faugus-run forked by the launch worker, which
+        # writes "exit <status>" to the connection when the launch ends
+        self.conn = conn
+        self.pid = pid
+        self.pending = pending
+        self.returncode = None
+
+    def poll(self):
+        if self.returncode is None:
+            self.read_status(0)
+        return self.returncode
+
+    def wait(self):
+        if self.returncode is None:
+            self.read_status(None)
+        return self.returncode
+
+    def read_status(self, timeout):
+        data = self.pending
+        if not data:
+            self.conn.settimeout(timeout)
+            try:
+                data = self.conn.recv(64)
+            except (BlockingIOError, socket.timeout):
+                return
+            except OSError:
+                data = b""
+
+        # A connection closed without a status means the launch was killed
+        status = data.split()
+        if len(status) == 2 and status[0] == b"exit" and status[1].lstrip(b"-").isdigit():
+            self.returncode = int(status[1])
+        else:
+            self.returncode = 1
+        self.conn.close()
+
+
+def launch_worker_enabled():
+    return ConfigManager().config.get('launch-worker', 'False') == 'True'
+
+def ensure_launch_worker():
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(faugus_run_socket_path)
+        return
+    except OSError:
+        pass
+    finally:
+        probe.close()
+    subprocess.Popen([sys.executable, faugus_run, "--worker"], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                     stderr=subprocess.DEVNULL, start_new_session=True)
+
+def request_worker_launch(args, cwd, env=None):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(2)
+    try:
+        client.connect(faugus_run_socket_path)
+        request = json.dumps({"argv": list(args), "cwd": cwd or os.getcwd(), "env": env or dict(os.environ)})
+        socket.send_fds(client, [request.encode("utf-8") + b"\n"], [0, 1, 2])
+        reply = b""
+        while b"\n" not in reply:
+            chunk = client.recv(64)
+            if not chunk:
+                break
+            reply += chunk
+        line, sep, pending = reply.partition(b"\n")
+        status = line.split()
+        if len(status) == 2 and status[0] == b"pid" and status[1].isdigit():
+            return WorkerProcess(client, int(status[1]), pending)
+    except OSError:
+        pass
+    client.close()
+    return None
+
+def start_faugus_run(args, cwd=None, env=None):
+    # With launch-worker enabled the launch is forked by a waiting "faugus-run --worker"
+    # that already has its modules loaded, otherwise faugus-run is started as usual
+    if launch_worker_enabled():
+        process = request_worker_launch(args, cwd, env)
+        if process is not None:
+            return process
+        ensure_launch_worker()
+    return subprocess.Popen([sys.executable, faugus_run, *args], cwd=cwd, env=env)
+
+
+class GameStore:
+    def __init__(self, path, index_path):
+        # games.json is kept in memory, written atomically and only when its content changed.
+        # The index maps each gameid to the byte range of its entry so faugus-run can read one game.
+        self.path = path
+        self.index_path = index_path
+        self.records = None
+        self.data = None
+        self.dirty = False
+        self.source_id = None
+
+    def load(self):
+        if self.records is None:
+            self.records = []
+            try:
+                with open(self.path, "rb") as file:
+                    self.data = file.read()
+                self.records = json.loads(self.data.decode("utf-8"))
+            except FileNotFoundError:
+                pass
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                print(f"Error reading the JSON file: {e}")
+        return self.records
+
+    def reload(self):
+        # Drop pending changes and read games.json again after it was replaced on disk
+        if self.source_id:
+            GLib.source_remove(self.source_id)
+            self.source_id = None
+        self.records = None
+        self.data = None
+        self.dirty = False
+
+        records = self.load()
+        data, entries = self.serialize(records)
+        if data == self.data:
+            self.write_index(entries)
+        elif self.data is not None:
+            # Rewrite it in our layout so the index offsets match the file
+            self.dirty = True
+            self.flush()
+
+    def save(self, records, delay=GAMES_SAVE_DELAY_MS):
+        self.records = records
+        self.dirty = True
+        if self.source_id:
+            GLib.source_remove(self.source_id)
+        self.source_id = GLib.timeout_add(delay, self.flush)
+
+    def flush(self):
+        if self.source_id:
+            GLib.source_remove(self.source_id)
+            self.source_id = None
+        if not self.dirty:
+            return False
+        self.dirty = False
+
+        data, entries = self.serialize(self.records)
+        if data != self.data:
+            self.write_atomic(self.path, data)
+            self.data = data
+            self.write_index(entries)
+        elif not self.index_is_current():
+            self.write_index(entries)
+        return False
+
+    @staticmethod
+    def serialize(records):
+        # Same layout as json.dump(records, indent=4, ensure_ascii=False), keeping track of each entry
+        if not records:
+            return b"[]", {}
+
+        parts = []
+        entries = {}
+        offset = len(b"[\n")
+        for record in records:
+            chunk = ("    " + json.dumps(record, ensure_ascii=False, indent=4).replace("\n", "\n    ")).encode("utf-8")
+            gameid = record.get("gameid")
+            if gameid and gameid not in entries:
+                entries[gameid] = [offset + 4, len(chunk) - 4]
+            parts.append(chunk)
+            offset += len(chunk) + len(b",\n")
+        return b"[\n" + b",\n".join(parts) + b"\n]", entries
+
+    @staticmethod
+    def write_atomic(path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+
+    def write_index(self, entries):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        index = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "games": entries}
+        self.write_atomic(self.index_path, json.dumps(index).encode("utf-8"))
+
+    def index_is_current(self):
+        try:
+            stat = os.stat(self.path)
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                index = json.load(file)
+        except (OSError, json.JSONDecodeError):
+            return False
+        return index.get("size") == stat.st_size and index.get("mtime_ns") == stat.st_mtime_ns
+
+
+game_store = GameStore(games_json, games_index)
+atexit.register(game_store.flush)
+
+banner_service = BannerService(banner_cache_dir)
+
+class SteamShortcuts:
+    def __init__(self, path):
+        # shortcuts.vdf is parsed once and re-read only when its mtime or size changes.
+        # Changes are queued as operations and replayed on top of the file when it is
+        # written, so edits Steam made in the meantime are kept.
+        self.path = path
+        self.shortcuts = {"shortcuts": {}}
+        self.by_name = {}
+        self.stamp = None
+        self.pending = []
+        self.source_id = None
+
+    def refresh(self):
+        try:
+            stat = os.stat(self.path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except (FileNotFoundError, NotADirectoryError):
+            stamp = None
+        if stamp == self.stamp:
+            return
+
+        self.stamp = stamp
+        self.shortcuts = {"shortcuts": {}}
+        if stamp is not None:
+            import vdf
+
+            try:
+                with open(self.path, 'rb') as f:
+                    self.shortcuts = vdf.binary_load(f)
+            except (SyntaxError, OSError):
+                self.shortcuts = {"shortcuts": {}}
+        self.shortcuts.setdefault("shortcuts", {})
+        for operation in self.pending:
+            operation(self.shortcuts)
+        self.reindex()
+
+    def reindex(self):
+        self.by_name = {}
+        for app_id, game in self.shortcuts["shortcuts"].items():
+            if isinstance(game, dict) and "AppName" in game:
+                self.by_name.setdefault(game["AppName"], []).append(app_id)
+
+    def has(self, title):
+        if not self.path:
+            return False
+        self.refresh()
+        return title in self.by_name
+
+    def apply(self, operation):
+        self.refresh()
+        self.pending.append(operation)
+        operation(self.shortcuts)
+        self.reindex()
+        if self.source_id:
+            GLib.source_remove(self.source_id)
+        self.source_id = GLib.timeout_add(SHORTCUTS_SAVE_DELAY_MS, self.flush)
+
+    def remove(self, title):
+        if not self.has(title):
+            return
+
+        def remove_entries(shortcuts):
+            entries = shortcuts["shortcuts"]
+            for app_id in [app_id for app_id, game in entries.items()
+                           if isinstance(game, dict) and game.get("AppName") == title]:
+                del entries[app_id]
+
+        self.apply(remove_entries)
+
+    def set(self, title, entry, fields):
+        # Existing shortcuts only get fields updated, new ones are created from entry
+        if not self.path:
+            return
+
+        def set_entry(shortcuts):
+            entries = shortcuts["shortcuts"]
+            for game in entries.values():
+                if isinstance(game, dict) and game.get("AppName") == title:
+                    game.update(fields)
+                    return
+            new_app_id = max([int(k) for k in entries.keys() if k.isdigit()] or [0]) + 1
+            entries[str(new_app_id)] = {"appid": new_app_id, **entry}
+
+        self.apply(set_entry)
+
+    def flush(self):
+        if self.source_id:
+            GLib.source_remove(self.source_id)
+            self.source_id = None
+        if not self.pending:
+            return False
+
+        # Pick up edits Steam made since the last read, then write everything at once
+        import vdf
+
+        self.refresh()
+        self.pending = []
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                vdf.binary_dump(self.shortcuts, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+            stat = os.stat(self.path)
+            self.stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError as e:
+            print(f"Error writing {self.path}: {e}")
+        return False
+
+steam_shortcuts = SteamShortcuts(steam_shortcuts_path)
+atexit.register(steam_shortcuts.flush)
+
+
+class LibraryTile(Gtk.FlowBoxChild):
+    def __init__(self, interface_mode, theme, show_labels):
+        # A slot of the library grid, bound to whichever game is scrolled to its position.
+        # Titles are ellipsized so that every tile has the same size.
+        super().__init__()
+        self.game = None
+        self.future = None
+
+        if interface_mode == "List":
+            hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL)
+        if interface_mode == "Blocks":
+            hbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+            hbox.set_size_request(200, -1)
+        if interface_mode == "Banners":
+            hbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+
+        hbox.get_style_context().add_class(theme)
+
+        self.label = Gtk.Label()
+        self.label.set_ellipsize(Pango.EllipsizeMode.END)
+        self.label.set_max_width_chars(1)
+
+        if interface_mode == "Blocks" or interface_mode == "Banners":
+            self.label.set_line_wrap(True)
+            self.label.set_lines(2)
+            self.label.set_justify(Gtk.Justification.CENTER)
+
+        self.image = Gtk.Image()
+
+        if interface_mode == "List":
+            self.image.set_margin_start(10)
+            self.image.set_margin_end(10)
+            self.image.set_margin_top(10)
+            self.image.set_margin_bottom(10)
+            self.label.set_margin_start(10)
+            self.label.set_margin_end(10)
+            self.label.set_margin_top(10)
+            self.label.set_margin_bottom(10)
+            self.label.set_xalign(0)
+            hbox.pack_start(self.image, False, False, 0)
+            hbox.pack_start(self.label, True, True, 0)
+            self.set_size_request(300, -1)
+            self.set_valign(Gtk.Align.START)
+            self.set_halign(Gtk.Align.FILL)
+        if interface_mode == "Blocks":
+            self.set_hexpand(True)
+            self.set_vexpand(True)
+            hbox.pack_start(self.image, False, False, 0)
+            hbox.pack_start(self.label, True, False, 0)
+            self.image.set_margin_top(10)
+            self.label.set_size_request(-1, 50)
+            self.label.set_margin_top(10)
+            self.label.set_margin_end(10)
+            self.label.set_margin_start(10)
+            self.label.set_margin_bottom(10)
+            self.set_valign(Gtk.Align.FILL)
+            self.set_halign(Gtk.Align.FILL)
+        if interface_mode == "Banners":
+            self.set_hexpand(True)
+            self.set_vexpand(True)
+            self.label.set_size_request(-1, 50)
+            self.label.set_margin_end(10)
+            self.label.set_margin_start(10)
+            self.set_margin_start(10)
+            self.set_margin_end(10)
+            self.set_margin_top(10)
+            self.set_margin_bottom(10)
+            self.set_valign(Gtk.Align.FILL)
+            self.set_halign(Gtk.Align.FILL)
+            hbox.pack_start(self.image, False, False, 0)
+            hbox.pack_start(self.label, True, False, 0)
+            if not show_labels:
+                self.label.set_no_show_all(True)
+
+        self.add(hbox)
+        hbox.show_all()
+        # Unbound tiles stay hidden when the window calls show_all()
+        self.set_no_show_all(True)
+
+
+class GameCatalog:
+    def __init__(self):
+        # Games sorted by title, with lookup tables kept in sync
+        self.games = []
+        self.by_gameid = {}
+        self.by_title = {}
+        self.by_child = {}
+        self.children = {}
+
+    def __iter__(self):
+        return iter(self.games)
+
+    def __len__(self):
+        return len(self.games)
+
+    def load(self, games_data):
+        self.clear()
+        for game_data in games_data:
+            game = Game(
+                game_data.get("gameid", ""),
+                game_data.get("title", ""),
+                game_data.get("path", ""),
+                game_data.get("prefix", ""),
+                game_data.get("launch_arguments", ""),
+                game_data.get("game_arguments", ""),
+                game_data.get("mangohud", ""),
+                game_data.get("gamemode", ""),
+                game_data.get("disable_hidraw", ""),
+                game_data.get("protonfix", ""),
+                game_data.get("runner", ""),
+                game_data.get("addapp_checkbox", ""),
+                game_data.get("addapp", ""),
+                game_data.get("addapp_bat", ""),
+                game_data.get("banner", ""),
+                game_data.get("lossless", ""),
+            )
+            self.games.append(game)
+
+        self.sort()
+        self.reindex()
+
+    def clear(self):
+        self.games.clear()
+        self.by_gameid.clear()
+        self.by_title.clear()
+        self.unbind_all()
+
+    def add(self, game):
+        self.games.append(game)
+        self.by_gameid[game.gameid] = game
+        self.by_title[game.title] = game
+
+    def remove(self, game):
+        self.games.remove(game)
+        if self.by_gameid.get(game.gameid) is game:
+            del self.by_gameid[game.gameid]
+        if self.by_title.get(game.title) is game:
+            del self.by_title[game.title]
+        child = self.children.pop(game.gameid, None)
+        if child is not None:
+            self.by_child.pop(child, None)
+
+    def sort(self):
+        self.games.sort(key=lambda x: x.search_title)
+
+    def reindex(self):
+        # Rebuild the lookup tables after a title or gameid has changed
+        self.by_gameid = {game.gameid: game for game in self.games}
+        self.by_title = {game.title: game for game in self.games}
+        self.children = {game.gameid: child for child, game in self.by_child.items()}
+
+    def get(self, gameid):
+        return self.by_gameid.get(gameid)
+
+    def get_by_title(self, title):
+        return self.by_title.get(title)
+
+    def has_title(self, title):
+        return title in self.by_title
+
+    def bind(self, child, game):
+        # Tiles are reused, so the game a tile showed before is unbound first
+        self.unbind(child)
+        self.by_child[child] = game
+        self.children[game.gameid] = child
+
+    def unbind(self, child):
+        game = self.by_child.pop(child, None)
+        if game is not None and self.children.get(game.gameid) is child:
+            del self.children[game.gameid]
+
+    def unbind_all(self):
+        self.by_child.clear()
+        self.children.clear()
+
+    def game_for_child(self, child):
+        if child is None:
+            return None
+        return self.by_child.get(child)
+
+    def child_for_game(self, game):
+        if game is None:
+            return None
+        return self.children.get(game.gameid)
+
+
+def log_history(path):
+    # Closed segments of a log that faugus-run moved into history/, newest first, as (label, path)
+    directory = os.path.join(os.path.dirname(path), "history")
+    stem = os.path.basename(path)[:-len(".log")]
+    pattern = re.compile(rf"{re.escape(stem)}\.(\d{{8}}-\d{{6}})(?:-(\d+))?\.log(?:\.gz|\.zst)?")
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+
+    segments = []
+    for name in names:
+        match = pattern.fullmatch(name)
+        if match:
+            closed = time.strptime(match.group(1), "%Y%m%d-%H%M%S")
+            order = (match.group(1), int(match.group(2) or 0))
+            segments.append((order, time.strftime("%x %X", closed), os.path.join(directory, name)))
+    segments.sort(reverse=True)
+    return [(label, segment) for order, label, segment in segments]
+
+def unpack_log_segment(segment):
+    # Compressed segments are unpacked into the cache so they can be paged like the current log
+    if segment.endswith(".log"):
+        return segment
+    temp_path = None
+    try:
+        if segment.endswith(".zst"):
+            from compression import zstd
+            open_compressed = zstd.open
+        else:
+            import gzip
+            open_compressed = gzip.open
+        os.makedirs(log_cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(suffix=".log", dir=log_cache_dir)
+        with open_compressed(segment, "rb") as source, os.fdopen(fd, "wb") as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+        return temp_path
+    except (ImportError, OSError, EOFError) as e:
+        print(f"Error reading log {segment}: {e}")
+        if temp_path:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        return None
+
+
+class LogIndex:
+    def __init__(self, path, on_change):
+        # A worker thread records where each line of the log starts, so only the lines on screen
+        # are ever read and decoded. Output appended later is indexed from where the scan stopped,
+        # and a truncated or replaced file is indexed again from the start. Searches run on the
+        # same thread, over the part of the file that is indexed.
+        # Everything is read with os.pread: faugus-run truncates Proton's log while it is open
+        # here, and a truncated file only gives a short read where a mapping would fault.
+        self.path = path
+        self.on_change = on_change
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.stopped = False
+        self.notify_pending = False
+        self.file = None
+        self.size = 0
+        self.indexed = 0
+        self.partial = False
+        self.starts = array("Q", [0])
+        self.pattern = None
+        self.search_generation = 0
+        self.searched = 0
+        self.matches = []
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.wakeup.set()
+        self.thread.start()
+
+    def refresh(self):
+        self.wakeup.set()
+
+    def stop(self):
+        self.stopped = True
+        self.wakeup.set()
+
+    def notify(self):
+        # Changes are reported to the main loop at most once per idle callback
+        if not self.notify_pending:
+            self.notify_pending = True
+            GLib.idle_add(self.deliver)
+
+    def deliver(self):
+        self.notify_pending = False
+        if not self.stopped:
+            self.on_change()
+        return False
+
+    def run(self):
+        while True:
+            self.wakeup.wait()
+            self.wakeup.clear()
+            if self.stopped:
+                break
+            try:
+                if self.update():
+                    self.notify()
+                while not self.wakeup.is_set() and (self.index_step() or self.search_step()):
+                    self.notify()
+            except (OSError, ValueError) as e:
+                print(f"Error reading log {self.path}: {e}")
+        with self.lock:
+            self.reset()
+
+    def reset(self):
+        if self.file is not None:
+            self.file.close()
+        self.file = None
+        self.size = 0
+        self.indexed = 0
+        self.partial = False
+        self.starts = array("Q", [0])
+        self.searched = 0
+        self.matches = []
+
+    def read(self, offset, length):
+        # Shorter than asked for once the file was truncated under us
+        return os.pread(self.file.fileno(), max(length, 0), offset)
+
+    def first_data(self):
+        # Proton's log is rotated by copying and truncating it, and Wine's next lines land past
+        # a hole where the old ones were. The hole ends on a block boundary, so the zeros left
+        # in the first block are skipped too.
+        fd = self.file.fileno()
+        try:
+            offset = os.lseek(fd, 0, os.SEEK_DATA)
+        except OSError:
+            return os.fstat(fd).st_size
+        while True:
+            block = os.pread(fd, 4096, offset)
+            data = block.lstrip(b"\0")
+            offset += len(block) - len(data)
+            if data or not block:
+                return offset
+
+    def update(self):
+        # Returns True when the file was replaced, truncated or has grown
+        changed = False
+        if self.file is not None:
+            try:
+                replaced = not os.path.samestat(os.stat(self.path), os.fstat(self.file.fileno()))
+            except FileNotFoundError:
+                replaced = True
+            shrunk = os.fstat(self.file.fileno()).st_size < self.size
+            if replaced or shrunk or self.first_data() > self.starts[0]:
+                with self.lock:
+                    self.reset()
+                changed = True
+
+        if self.file is None:
+            try:
+                file = open(self.path, "rb")
+            except FileNotFoundError:
+                return changed
+            with self.lock:
+                self.file = file
+                self.starts[0] = self.indexed = self.first_data()
+
+        size = os.fstat(self.file.fileno()).st_size
+        if size <= self.size:
+            return changed
+        with self.lock:
+            self.size = size
+            self.partial = False
+        return True
+
+    def index_step(self):
+        if self.file is None or self.partial or self.indexed >= self.size:
+            return False
+        wanted = min(LOG_INDEX_CHUNK, self.size - self.indexed)
+        data = self.read(self.indexed, wanted)
+        end = data.rfind(b"\n")
+        # A line longer than a chunk is read on until it ends
+        while end < 0 and len(data) == wanted and self.indexed + wanted < self.size:
+            step = min(LOG_INDEX_CHUNK, self.size - self.indexed - wanted)
+            more = self.read(self.indexed + wanted, step)
+            found = more.find(b"\n")
+            if found >= 0:
+                end = wanted + found
+            data += more
+            wanted += step
+        if len(data) < wanted:
+            # Truncated, the next update starts over
+            return False
+        if end < 0:
+            # What is left is a line that is still being written
+            with self.lock:
+                self.partial = True
+            return True
+
+        lengths = map(len, data[:end + 1].split(b"\n")[:-1])
+        starts = islice(accumulate(map((1).__add__, lengths), initial=self.indexed), 1, None)
+        with self.lock:
+            self.starts.extend(starts)
+            self.indexed += end + 1
+        return True
+
+    def search_step(self):
+        pattern = self.pattern
+        generation = self.search_generation
+        if pattern is None or self.searched >= self.indexed or len(self.matches) >= LOG_SEARCH_LIMIT:
+            return False
+
+        # Each step covers whole lines, and a line is reported once however often it matches
+        start = self.searched
+        following = bisect_right(self.starts, start + LOG_INDEX_CHUNK)
+        end = self.starts[following] if following < len(self.starts) else self.indexed
+        data = self.read(start, end - start)
+        if len(data) < end - start:
+            return False
+        matches = []
+        position = 0
+        while position < len(data):
+            match = pattern.search(data, position)
+            if match is None or match.start() >= len(data):
+                break
+            line = bisect_right(self.starts, start + match.start()) - 1
+            matches.append(line)
+            position = self.starts[line + 1] - start
+
+        with self.lock:
+            if generation == self.search_generation:
+                self.matches.extend(matches[:LOG_SEARCH_LIMIT - len(self.matches)])
+                self.searched = end
+        return True
+
+    def set_search(self, pattern):
+        with self.lock:
+            self.pattern = pattern
+            self.search_generation += 1
+            self.searched = 0
+            self.matches = []
+        self.wakeup.set()
+
+    def search_results(self):
+        # Returns the matching line numbers and whether the search has gone through the whole log
+        with self.lock:
+            finished = self.searched >= self.indexed or len(self.matches) >= LOG_SEARCH_LIMIT
+            return list(self.matches), finished
+
+    def line_count(self):
+        with self.lock:
+            return len(self.starts) - 1 + self.partial
+
+    def lines(self, first, count):
+        with self.lock:
+            if self.file is None:
+                return []
+            total = len(self.starts) - 1 + self.partial
+            lines = []
+            for line in range(first, min(first + count, total)):
+                start = self.starts[line]
+                end = self.starts[line + 1] - 1 if line + 1 < len(self.starts) else self.size
+                data = self.read(start, min(end, start + LOG_LINE_BYTES) - start)
+                lines.append(data.decode("utf-8", "replace").rstrip("\r"))
+            return lines
+
+    def tail(self, limit):
+        with self.lock:
+            if self.file is None:
+                return ""
+            start = max(0, self.size - limit)
+            data = self.read(start, self.size - start)
+        if start:
+            data = data[data.find(b"\n") + 1:]
+        return data.decode("utf-8", "replace")
+
+
+class LogViewer(Gtk.Box):
+    def __init__(self, path):
+        # Shows only the lines that fit on screen, with its own scrollbar over the line index
+        super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=5)
+        self.path = path
+        self.index = LogIndex(path, self.on_index_changed)
+        self.rows = 1
+        self.top = 0
+        self.follow = True
+        self.updating = False
+        self.pattern = None
+        self.highlight = None
+        self.match_line = None
+        self.temp_path = None
+
+        # Earlier sessions and segments rotated out of the current one
+        self.history = log_history(path)
+        self.combo_history = Gtk.ComboBoxText()
+        self.combo_history.append_text(_("Current log"))
+        for label, segment in self.history:
+            self.combo_history.append_text(label)
+        self.combo_history.set_active(0)
+        self.combo_history.set_sensitive(bool(self.history))
+        self.combo_history.connect("changed", self.on_history_changed)
+
+        self.entry_search = Gtk.SearchEntry()
+        self.entry_search.set_placeholder_text(_("Search (regular expression)"))
+        self.entry_search.set_hexpand(True)
+        self.entry_search.connect("search-changed", self.on_search_changed)
+        self.entry_search.connect("activate", lambda widget: self.jump_to_match(1))
+
+        button_previous = Gtk.Button.new_from_icon_name("go-up-symbolic", Gtk.IconSize.BUTTON)
+        button_previous.set_tooltip_text(_("Previous match"))
+        button_previous.connect("clicked", lambda widget: self.jump_to_match(-1))
+        button_next = Gtk.Button.new_from_icon_name("go-down-symbolic", Gtk.IconSize.BUTTON)
+        button_next.set_tooltip_text(_("Next match"))
+        button_next.connect("clicked", lambda widget: self.jump_to_match(1))
+
+        self.label_matches = Gtk.Label()
+        self.label_matches.set_width_chars(14)
+
+        self.checkbox_follow = Gtk.CheckButton(label=_("Follow"))
+        self.checkbox_follow.set_tooltip_text(_("Keep showing the end of the log as it is written"))
+        self.checkbox_follow.set_active(True)
+        self.checkbox_follow.connect("toggled", self.on_follow_toggled)
+
+        box_search = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
+        box_search.pack_start(self.combo_history, False, False, 0)
+        box_search.pack_start(self.entry_search, True, True, 0)
+        box_search.pack_start(button_previous, False, False, 0)
+        box_search.pack_start(button_next, False, False, 0)
+        box_search.pack_start(self.label_matches, False, False, 0)
+        box_search.pack_start(self.checkbox_follow, False, False, 0)
+
+        self.text_view = Gtk.TextView()
+        self.text_view.set_editable(False)
+        self.text_view.set_cursor_visible(False)
+        self.text_view.set_monospace(True)
+        self.text_view.set_wrap_mode(Gtk.WrapMode.NONE)
+        self.text_view.connect("key-press-event", self.on_key_press)
+        self.tag_match = self.text_view.get_buffer().create_tag("match", background="#f6d32d", foreground="#000000")
+
+        # The text view only ever holds one screen of lines, so it scrolls sideways only
+        scrolled_window = Gtk.ScrolledWindow()
+        scrolled_window.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.EXTERNAL)
+        scrolled_window.set_hexpand(True)
+        scrolled_window.set_vexpand(True)
+        scrolled_window.add(self.text_view)
+        scrolled_window.connect("scroll-event", self.on_scroll)
+        scrolled_window.connect("size-allocate", self.on_size_allocate)
+
+        self.adjustment = Gtk.Adjustment(value=0, lower=0, upper=0, step_increment=1, page_increment=1, page_size=1)
+        self.adjustment.connect("value-changed", self.on_value_changed)
+        scrollbar = Gtk.Scrollbar(orientation=Gtk.Orientation.VERTICAL, adjustment=self.adjustment)
+
+        box_view = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL)
+        box_view.pack_start(scrolled_window, True, True, 0)
+        box_view.pack_start(scrollbar, False, False, 0)
+
+        self.pack_start(box_search, False, False, 0)
+        self.pack_start(box_view, True, True, 0)
+        self.set_border_width(5)
+
+        self.follow_source_id = GLib.timeout_add(LOG_FOLLOW_INTERVAL_MS, self.on_follow_timeout)
+        self.connect("destroy", self.on_destroy)
+
+    def on_destroy(self, widget):
+        GLib.source_remove(self.follow_source_id)
+        self.index.stop()
+        self.remove_temp()
+
+    def remove_temp(self):
+        if self.temp_path:
+            try:
+                os.remove(self.temp_path)
+            except OSError:
+                pass
+            self.temp_path = None
+
+    def on_history_changed(self, combo):
+        active = combo.get_active()
+        if active <= 0:
+            self.open_log(self.path)
+            return
+        combo.set_sensitive(False)
+        segment = self.history[active - 1][1]
+        threading.Thread(target=lambda: GLib.idle_add(self.on_segment_unpacked, unpack_log_segment(segment)),
+                         daemon=True).start()
+
+    def on_segment_unpacked(self, path):
+        if self.index.stopped:
+            # The dialog was closed while the segment was unpacked
+            if path and path.startswith(log_cache_dir + os.sep):
+                os.remove(path)
+            return False
+        self.combo_history.set_sensitive(True)
+        if path is None:
+            self.combo_history.set_active(0)
+        else:
+            self.open_log(path)
+        return False
+
+    def open_log(self, path):
+        # The unpacked copy of a compressed segment is deleted once another log is shown
+        self.index.stop()
+        self.remove_temp()
+        if path.startswith(log_cache_dir + os.sep):
+            self.temp_path = path
+        self.index = LogIndex(path, self.on_index_changed)
+        self.index.set_search(self.pattern)
+        self.match_line = None
+        self.checkbox_follow.set_active(path == self.path)
+        self.update_view()
+
+    def on_follow_timeout(self):
+        self.index.refresh()
+        return True
+
+    def on_index_changed(self):
+        self.update_view()
+        self.update_match_label()
+
+    def line_height(self):
+        layout = self.text_view.create_pango_layout("Xg")
+        return max(1, layout.get_pixel_size()[1])
+
+    def on_size_allocate(self, widget, allocation):
+        rows = max(1, allocation.height // self.line_height())
+        if rows != self.rows:
+            self.rows = rows
+            GLib.idle_add(self.update_view)
+
+    def update_view(self):
+        if self.index.stopped:
+            return False
+        total = self.index.line_count()
+        value = total - self.rows if self.follow else self.adjustment.get_value()
+        self.updating = True
+        self.adjustment.configure(max(0, value), 0, total, 1, max(1, self.rows - 1), self.rows)
+        self.updating = False
+        self.top = int(self.adjustment.get_value())
+        self.render()
+        return False
+
+    def render(self):
+        lines = self.index.lines(self.top, self.rows)
+        buffer = self.text_view.get_buffer()
+        buffer.set_text("\n".join(lines))
+        if self.highlight is None:
+            return
+        for row, line in enumerate(lines):
+            for match in self.highlight.finditer(line):
+                if match.end() > match.start():
+                    buffer.apply_tag(self.tag_match, buffer.get_iter_at_line_offset(row, match.start()),
+                                     buffer.get_iter_at_line_offset(row, match.end()))
+
+    def on_value_changed(self, adjustment):
+        if self.updating:
+            return
+        self.top = int(adjustment.get_value())
+        if self.follow and self.top + self.rows < adjustment.get_upper():
+            self.checkbox_follow.set_active(False)
+        self.render()
+
+    def on_follow_toggled(self, checkbox):
+        self.follow = checkbox.get_active()
+        if self.follow:
+            self.update_view()
+
+    def scroll_by(self, delta):
+        self.adjustment.set_value(self.adjustment.get_value() + delta)
+
+    def on_scroll(self, widget, event):
+        if event.direction == Gdk.ScrollDirection.UP:
+            delta = -3
+        elif event.direction == Gdk.ScrollDirection.DOWN:
+            delta = 3
+        elif event.direction == Gdk.ScrollDirection.SMOOTH:
+            delta = event.get_scroll_deltas()[2] * 3
+        else:
+            return False
+        if not delta:
+            return False
+        self.scroll_by(delta)
+        return True
+
+    def on_key_press(self, widget, event):
+        page = max(1, self.rows - 1)
+        steps = {Gdk.KEY_Up: -1, Gdk.KEY_Down: 1, Gdk.KEY_Page_Up: -page, Gdk.KEY_Page_Down: page}
+        if event.keyval in steps:
+            self.scroll_by(steps[event.keyval])
+        elif event.keyval == Gdk.KEY_Home:
+            self.adjustment.set_value(0)
+        elif event.keyval == Gdk.KEY_End:
+            self.checkbox_follow.set_active(True)
+        else:
+            return False
+        return True
+
+    def on_search_changed(self, entry):
+        text = entry.get_text()
+        self.match_line = None
+        entry.get_style_context().remove_class("error")
+        if not text:
+            self.highlight = None
+            self.pattern = None
+            self.index.set_search(None)
+        else:
+            try:
+                self.pattern = re.compile(text.encode("utf-8"), re.MULTILINE | re.IGNORECASE)
+                self.highlight = re.compile(text, re.IGNORECASE)
+            except re.error:
+                entry.get_style_context().add_class("error")
+                self.highlight = None
+                self.pattern = None
+            self.index.set_search(self.pattern)
+        self.update_match_label()
+        self.render()
+
+    def update_match_label(self):
+        if self.highlight is None:
+            self.label_matches.set_text(_("Invalid expression") if self.entry_search.get_text() else "")
+            return
+        matches, finished = self.index.search_results()
+        if self.match_line is not None and self.match_line in matches:
+            text = _("%d of %d") % (bisect_left(matches, self.match_line) + 1, len(matches))
+        else:
+            text = _("%d matches") % len(matches)
+        self.label_matches.set_text(text if finished else f"{text}…")
+
+    def jump_to_match(self, step):
+        matches = self.index.search_results()[0]
+        if not matches:
+            return
+        if step > 0:
+            anchor = self.match_line if self.match_line is not None else self.top - 1
+            position = bisect_right(matches, anchor)
+            position = position if position < len(matches) else 0
+        else:
+            anchor = self.match_line if self.match_line is not None else self.top
+            position = bisect_left(matches, anchor) - 1
+        self.match_line = matches[position]
+        self.checkbox_follow.set_active(False)
+        self.adjustment.set_value(max(0, self.match_line - self.rows // 3))
+        self.update_match_label()
+
+    def copy_text(self):
+        # The selection when there is one, otherwise the end of the log
+        buffer = self.text_view.get_buffer()
+        bounds = buffer.get_selection_bounds()
+        if bounds:
+            return buffer.get_text(bounds[0], bounds[1], False)
+        return self.index.tail(LOG_COPY_LIMIT)
+
+
+class DuplicateDialog(Gtk.Dialog):
+    def __init__(self, parent, title):
+        super().__init__(title=_("Duplicate %s") % title, transient_for=parent, modal=True)
+        self.set_resizable(False)
+        self.set_icon_from_file(faugus_png)
+
+        label_title = Gtk.Label(label=_("Title"))
+        label_title.set_halign(Gtk.Align.START)
         self.entry_title = Gtk.Entry()
         self.entry_title.set_tooltip_text(_("Game Title"))
 
@@ -4442,14 +6184,15 @@ class AddGame(Gtk.Dialog):
 
         self.banner_path_temp = os.path.join(banners_dir, "banner_temp.png")
         shutil.copyfile(faugus_banner, self.banner_path_temp)
+        self.banner_timeout_id = None
+        self.banner_title = None
+        self.connect("destroy", self.on_destroy_cancel_banner)
         self.icon_directory = f"{icons_dir}/icon_temp/"
 
         if not os.path.exists(self.icon_directory):
             os.makedirs(self.icon_directory)
 
         self.icons_path = icons_dir
-        self.icon_extracted = os.path.expanduser(f'{self.icons_path}/icon_temp/icon.ico')
-        self.icon_converted = os.path.expanduser(f'{self.icons_path}/icon_temp/icon.png')
         self.icon_temp = f'{self.icons_path}/icon_temp.ico'
 
         self.box = self.get_content_area()
@@ -4973,17 +6716,7 @@ class AddGame(Gtk.Dialog):
         self.image_banner2.set_from_pixbuf(pixbuf)
 
     def check_steam_shortcut(self, title):
-        if os.path.exists(steam_shortcuts_path):
-            try:
-                with open(steam_shortcuts_path, 'rb') as f:
-                    shortcuts = vdf.binary_load(f)
-                for game in shortcuts["shortcuts"].values():
-                    if isinstance(game, dict) and "AppName" in game and game["AppName"] == title:
-                        return True
-                return False
-            except SyntaxError:
-                return False
-        return False
+        return steam_shortcuts.has(title)
 
     def on_entry_query_tooltip(self, widget, x, y, keyboard_mode, tooltip):
         current_text = widget.get_text()
@@ -5130,27 +6863,30 @@ class AddGame(Gtk.Dialog):
         self.set_sensitive(True)
 
     def get_banner(self):
-        def fetch_banner():
-            game_name = self.entry_title.get_text().strip()
-            if not game_name:
-                return
-
-            api_url = f"https://steamgrid.usebottles.com/api/search/{game_name}"
-            try:
-                response = requests.get(api_url)
-                response.raise_for_status()
-                image_url = response.text.strip('"')
-
-                with open(self.banner_path_temp, "wb") as image_file:
-                    image_file.write(requests.get(image_url).content)
-
-                GLib.idle_add(self.update_image_banner)
-
-            except requests.RequestException as e:
-                print(f"Error fetching the banner: {e}")
+        # Focus changes and refreshes in quick succession are folded into one lookup
+        if self.banner_timeout_id:
+            GLib.source_remove(self.banner_timeout_id)
+        self.banner_timeout_id = GLib.timeout_add(BANNER_FETCH_DEBOUNCE_MS, self.request_banner)
+
+    def on_destroy_cancel_banner(self, widget):
+        if self.banner_timeout_id:
+            GLib.source_remove(self.banner_timeout_id)
+            self.banner_timeout_id = None
+
+    def request_banner(self):
+        self.banner_timeout_id = None
+        game_name = self.entry_title.get_text().strip()
+        if game_name:
+            banner_service.request(game_name, self.on_banner_fetched, game_name)
+        return False
 
-        # Start the thread
-        threading.Thread(target=fetch_banner, daemon=True).start()
+    def on_banner_fetched(self, path, game_name):
+        # A lookup for an earlier title can finish after the title was changed again
+        if path and game_name == self.entry_title.get_text().strip():
+            shutil.copyfile(path, self.banner_path_temp)
+            self.banner_title = game_name
+            self.update_image_banner()
+        return False
 
     def update_image_banner(self):
         pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(self.banner_path_temp, 260, 390, True)
@@ -5159,8 +6895,10 @@ class AddGame(Gtk.Dialog):
 
     def on_entry_focus_out(self, entry_title, event):
         if entry_title.get_text() != "":
-            self.get_banner()
+            if entry_title.get_text().strip() != self.banner_title:
+                self.get_banner()
         else:
+            self.banner_title = None
             shutil.copyfile(faugus_banner, self.banner_path_temp)
             pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(self.banner_path_temp, 260, 390, True)
             self.image_banner.set_from_pixbuf(pixbuf)
@@ -5538,28 +7276,25 @@ class AddGame(Gtk.Dialog):
             # Add command parts if they are not empty
             file_run = filechooser.get_filename()
             if title_formatted:
-                command_parts.append(f'FAUGUS_LOG="{title_formatted}"')
+                command_parts.append(f'FAUGUS_LOG={shlex.quote(title_formatted)}')
             if prefix:
-                command_parts.append(f'WINEPREFIX="{prefix}"')
+                command_parts.append(f'WINEPREFIX={shlex.quote(prefix)}')
             if title_formatted:
-                command_parts.append(f'GAMEID={title_formatted}')
+                command_parts.append(f'GAMEID={shlex.quote(title_formatted)}')
             if runner:
-                command_parts.append(f'PROTONPATH={runner}')
+                command_parts.append(f'PROTONPATH={shlex.quote(runner)}')
             if not file_run.endswith(".reg"):
-                command_parts.append(f'"{umu_run}" "{file_run}"')
+                command_parts.append(f'{shlex.quote(umu_run)} {shlex.quote(file_run)}')
             else:
-                command_parts.append(f'"{umu_run}" regedit "{file_run}"')
+                command_parts.append(f'{shlex.quote(umu_run)} regedit {shlex.quote(file_run)}')
 
             # Join all parts into a single command
             command = ' '.join(command_parts)
 
             print(command)
 
-            # faugus-run path
-            faugus_run_path = faugus_run
-
             def run_command():
-                process = subprocess.Popen([sys.executable, faugus_run_path, command])
+                process = start_faugus_run([command])
                 process.wait()
                 GLib.idle_add(self.set_sensitive, True)
                 GLib.idle_add(self.parent_window.set_sensitive, True)
@@ -5578,6 +7313,7 @@ class AddGame(Gtk.Dialog):
         dialog.destroy()
 
     def on_button_search_protonfix_clicked(self, widget):
+        import webbrowser
         webbrowser.open("https://umu.openwinecomponents.org/")
 
     def set_image_shortcut_icon(self):
@@ -5607,21 +7343,10 @@ class AddGame(Gtk.Dialog):
             os.makedirs(self.icon_directory)
 
         try:
-            command = f'icoextract "{path}" "{self.icon_extracted}"'
-            result = subprocess.run(command, shell=True, text=True, capture_output=True)
-
-            if result.returncode != 0:
-                if "NoIconsAvailableError" in result.stderr or "PEFormatError" in result.stderr:
-                    print("The file does not contain icons.")
-                    self.button_shortcut_icon.set_image(self.set_image_shortcut_icon())
-                else:
-                    print(f"Error extracting icon: {result.stderr}")
-            else:
-                command_magick = shutil.which("magick") or shutil.which("convert")
-                os.system(f'{command_magick} "{self.icon_extracted}" "{self.icon_converted}"')
-                if os.path.isfile(self.icon_extracted):
-                    os.remove(self.icon_extracted)
-
+            save_icon_frames(path, self.icon_directory)
+        except ValueError:
+            print("The file does not contain icons.")
+            self.button_shortcut_icon.set_image(self.set_image_shortcut_icon())
         except Exception as e:
             print(f"An error occurred: {e}")
 
@@ -5753,29 +7478,6 @@ class AddGame(Gtk.Dialog):
         dialog.destroy()
         self.set_sensitive(True)
 
-    def find_largest_resolution(self, directory):
-        largest_image = None
-        largest_resolution = (0, 0)  # (width, height)
-
-        # Define a set of valid image extensions
-        valid_image_extensions = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff'}
-
-        for file_name in os.listdir(directory):
-            file_path = os.path.join(directory, file_name)
-            if os.path.isfile(file_path):
-                # Check if the file has a valid image extension
-                if os.path.splitext(file_name)[1].lower() in valid_image_extensions:
-                    try:
-                        with Image.open(file_path) as img:
-                            width, height = img.size
-                            if width * height > largest_resolution[0] * largest_resolution[1]:
-                                largest_resolution = (width, height)
-                                largest_image = file_path
-                    except IOError:
-                        print(f"Unable to open {file_path}")
-
-        return largest_image
-
     def update_preview(self, dialog):
         if file_path := dialog.get_preview_filename():
             try:
@@ -5848,16 +7550,16 @@ class AddGame(Gtk.Dialog):
 
         # Add command parts if they are not empty
         if title_formatted:
-            command_parts.append(f'FAUGUS_LOG="{title_formatted}"')
+            command_parts.append(f'FAUGUS_LOG={shlex.quote(title_formatted)}')
         if prefix:
-            command_parts.append(f'WINEPREFIX="{prefix}"')
+            command_parts.append(f'WINEPREFIX={shlex.quote(prefix)}')
         if title_formatted:
-            command_parts.append(f'GAMEID={title_formatted}')
+            command_parts.append(f'GAMEID={shlex.quote(title_formatted)}')
         if runner:
-            command_parts.append(f'PROTONPATH={runner}')
+            command_parts.append(f'PROTONPATH={shlex.quote(runner)}')
 
         # Add the fixed command and remaining arguments
-        command_parts.append(f'"{umu_run}"')
+        command_parts.append(shlex.quote(umu_run))
         command_parts.append('"winecfg"')
 
         # Join all parts into a single command
@@ -5865,11 +7567,8 @@ class AddGame(Gtk.Dialog):
 
         print(command)
 
-        # faugus-run path
-        faugus_run_path = faugus_run
-
         def run_command():
-            process = subprocess.Popen([sys.executable, faugus_run_path, command])
+            process = start_faugus_run([command])
             process.wait()
             GLib.idle_add(self.set_sensitive, True)
             GLib.idle_add(self.parent_window.set_sensitive, True)
@@ -5907,16 +7606,16 @@ class AddGame(Gtk.Dialog):
 
         # Add command parts if they are not empty
         if title_formatted:
-            command_parts.append(f'FAUGUS_LOG="{title_formatted}"')
+            command_parts.append(f'FAUGUS_LOG={shlex.quote(title_formatted)}')
         if prefix:
-            command_parts.append(f'WINEPREFIX="{prefix}"')
+            command_parts.append(f'WINEPREFIX={shlex.quote(prefix)}')
         command_parts.append(f'GAMEID=winetricks-gui')
         command_parts.append(f'STORE=none')
         if runner:
-            command_parts.append(f'PROTONPATH={runner}')
+            command_parts.append(f'PROTONPATH={shlex.quote(runner)}')
 
         # Add the fixed command and remaining arguments
-        command_parts.append(f'"{umu_run}"')
+        command_parts.append(shlex.quote(umu_run))
         command_parts.append('""')
 
         # Join all parts into a single command
@@ -5924,11 +7623,8 @@ class AddGame(Gtk.Dialog):
 
         print(command)
 
-        # faugus-run path
-        faugus_run_path = faugus_run
-
         def run_command():
-            process = subprocess.Popen([sys.executable, faugus_run_path, command, "winetricks"])
+            process = start_faugus_run([command, "winetricks"])
             process.wait()
             GLib.idle_add(self.set_sensitive, True)
             GLib.idle_add(self.parent_window.set_sensitive, True)
@@ -6016,46 +7712,24 @@ class AddGame(Gtk.Dialog):
         if response == Gtk.ResponseType.OK:
             path = filechooser.get_filename()
 
-            if not os.path.exists(self.icon_directory):
-                os.makedirs(self.icon_directory)
-
             try:
-                # Attempt to extract the icon
-                command = f'icoextract "{path}" "{self.icon_extracted}"'
-                result = subprocess.run(command, shell=True, text=True, capture_output=True)
-
-                # Check if there was an error in executing the command
-                if result.returncode != 0:
-                    if "NoIconsAvailableError" in result.stderr or "PEFormatError" in result.stderr:
-                        print("The file does not contain icons.")
-                        self.button_shortcut_icon.set_image(self.set_image_shortcut_icon())
-                    else:
-                        print(f"Error extracting icon: {result.stderr}")
-                else:
-                    # Convert the extracted icon to PNG
-                    command_magick = shutil.which("magick") or shutil.which("convert")
-                    os.system(f'{command_magick} "{self.icon_extracted}" "{self.icon_converted}"')
-                    if os.path.isfile(self.icon_extracted):
-                        os.remove(self.icon_extracted)
-
-                    largest_image = self.find_largest_resolution(self.icon_directory)
-                    shutil.move(largest_image, os.path.expanduser(self.icon_temp))
+                # Read the largest icon straight from the executable
+                save_largest_icon(path, os.path.expanduser(self.icon_temp))
 
-                    pixbuf = GdkPixbuf.Pixbuf.new_from_file(self.icon_temp)
-                    scaled_pixbuf = pixbuf.scale_simple(50, 50, GdkPixbuf.InterpType.BILINEAR)
-                    image = Gtk.Image.new_from_file(self.icon_temp)
-                    image.set_from_pixbuf(scaled_pixbuf)
-
-                    self.button_shortcut_icon.set_image(image)
+                pixbuf = GdkPixbuf.Pixbuf.new_from_file(self.icon_temp)
+                scaled_pixbuf = pixbuf.scale_simple(50, 50, GdkPixbuf.InterpType.BILINEAR)
+                image = Gtk.Image.new_from_file(self.icon_temp)
+                image.set_from_pixbuf(scaled_pixbuf)
 
+                self.button_shortcut_icon.set_image(image)
+            except ValueError:
+                print("The file does not contain icons.")
+                self.button_shortcut_icon.set_image(self.set_image_shortcut_icon())
             except Exception as e:
                 print(f"An error occurred: {e}")
 
             self.entry_path.set_text(filechooser.get_filename())
 
-        if os.path.isdir(self.icon_directory):
-            shutil.rmtree(self.icon_directory)
-
         dialog.destroy()
 
     def on_button_search_prefix_clicked(self, widget):
@@ -6171,8 +7845,6 @@ class CreateShortcut(Gtk.Window):
             os.makedirs(self.icon_directory)
 
         self.icons_path = icons_dir
-        self.icon_extracted = os.path.expanduser(f'{self.icons_path}/icon_temp/icon.ico')
-        self.icon_converted = os.path.expanduser(f'{self.icons_path}/icon_temp/icon.png')
         self.icon_temp = f'{self.icons_path}/icon_temp.ico'
 
         self.default_prefix = ""
@@ -6413,43 +8085,22 @@ class CreateShortcut(Gtk.Window):
         self.add(self.box)
         self.combobox_lossless.set_active(0)
 
-        if not os.path.exists(self.icon_directory):
-            os.makedirs(self.icon_directory)
-
         try:
-            # Attempt to extract the icon
-            command = f'icoextract "{file_path}" "{self.icon_extracted}"'
-            result = subprocess.run(command, shell=True, text=True, capture_output=True)
-
-            # Check if there was an error in executing the command
-            if result.returncode != 0:
-                if "NoIconsAvailableError" in result.stderr or "PEFormatError" in result.stderr:
-                    print("The file does not contain icons.")
-                    self.button_shortcut_icon.set_image(self.set_image_shortcut_icon())
-                else:
-                    print(f"Error extracting icon: {result.stderr}")
-            else:
-                # Convert the extracted icon to PNG
-                command_magick = shutil.which("magick") or shutil.which("convert")
-                os.system(f'{command_magick} "{self.icon_extracted}" "{self.icon_converted}"')
-                if os.path.isfile(self.icon_extracted):
-                    os.remove(self.icon_extracted)
+            # Read the largest icon straight from the executable
+            save_largest_icon(file_path, os.path.expanduser(self.icon_temp))
 
-                largest_image = self.find_largest_resolution(self.icon_directory)
-                shutil.move(largest_image, os.path.expanduser(self.icon_temp))
-
-                pixbuf = GdkPixbuf.Pixbuf.new_from_file(self.icon_temp)
-                scaled_pixbuf = pixbuf.scale_simple(50, 50, GdkPixbuf.InterpType.BILINEAR)
-                image = Gtk.Image.new_from_file(self.icon_temp)
-                image.set_from_pixbuf(scaled_pixbuf)
-
-                self.button_shortcut_icon.set_image(image)
+            pixbuf = GdkPixbuf.Pixbuf.new_from_file(self.icon_temp)
+            scaled_pixbuf = pixbuf.scale_simple(50, 50, GdkPixbuf.InterpType.BILINEAR)
+            image = Gtk.Image.new_from_file(self.icon_temp)
+            image.set_from_pixbuf(scaled_pixbuf)
 
+            self.button_shortcut_icon.set_image(image)
+        except ValueError:
+            print("The file does not contain icons.")
+            self.button_shortcut_icon.set_image(self.set_image_shortcut_icon())
         except Exception as e:
             print(f"An error occurred: {e}")
 
-        shutil.rmtree(self.icon_directory)
-
         # Connect the destroy signal to Gtk.main_quit
         self.connect("destroy", Gtk.main_quit)
 
@@ -6529,30 +8180,8 @@ class CreateShortcut(Gtk.Window):
 
         dialog.destroy()
 
-    def find_largest_resolution(self, directory):
-        largest_image = None
-        largest_resolution = (0, 0)  # (width, height)
-
-        # Define a set of valid image extensions
-        valid_image_extensions = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff'}
-
-        for file_name in os.listdir(directory):
-            file_path = os.path.join(directory, file_name)
-            if os.path.isfile(file_path):
-                # Check if the file has a valid image extension
-                if os.path.splitext(file_name)[1].lower() in valid_image_extensions:
-                    try:
-                        with Image.open(file_path) as img:
-                            width, height = img.size
-                            if width * height > largest_resolution[0] * largest_resolution[1]:
-                                largest_resolution = (width, height)
-                                largest_image = file_path
-                    except IOError:
-                        print(f"Unable to open {file_path}")
-
-        return largest_image
-
     def on_button_search_protonfix_clicked(self, widget):
+        import webbrowser
         webbrowser.open("https://umu.openwinecomponents.org/")
 
     def load_config(self):
@@ -6731,21 +8360,10 @@ class CreateShortcut(Gtk.Window):
             os.makedirs(self.icon_directory)
 
         try:
-            command = f'icoextract "{path}" "{self.icon_extracted}"'
-            result = subprocess.run(command, shell=True, text=True, capture_output=True)
-
-            if result.returncode != 0:
-                if "NoIconsAvailableError" in result.stderr or "PEFormatError" in result.stderr:
-                    print("The file does not contain icons.")
-                    self.button_shortcut_icon.set_image(self.set_image_shortcut_icon())
-                else:
-                    print(f"Error extracting icon: {result.stderr}")
-            else:
-                command_magick = shutil.which("magick") or shutil.which("convert")
-                os.system(f'{command_magick} "{self.icon_extracted}" "{self.icon_converted}"')
-                if os.path.isfile(self.icon_extracted):
-                    os.remove(self.icon_extracted)
-
+            save_icon_frames(path, self.icon_directory)
+        except ValueError:
+            print("The file does not contain icons.")
+            self.button_shortcut_icon.set_image(self.set_image_shortcut_icon())
         except Exception as e:
             print(f"An error occurred: {e}")
 
@@ -6953,20 +8571,20 @@ def run_file(file_path):
             command_parts.append(mangohud)
         if disable_hidraw:
             command_parts.append(disable_hidraw)
-    command_parts.append(os.path.expanduser(f'WINEPREFIX="{default_prefix}/default"'))
+    command_parts.append(f'WINEPREFIX={shlex.quote(os.path.expanduser(f"{default_prefix}/default"))}')
     command_parts.append('GAMEID=default')
     if default_runner:
-        command_parts.append(f'PROTONPATH={default_runner}')
+        command_parts.append(f'PROTONPATH={shlex.quote(default_runner)}')
     if not file_path.endswith(".reg"):
         if gamemode_enabled and gamemode:
             command_parts.append(gamemode)
 
     # Add the fixed command and remaining arguments
-    command_parts.append(f'"{umu_run}"')
+    command_parts.append(shlex.quote(umu_run))
     if file_path.endswith(".reg"):
-        command_parts.append(f'regedit "{file_path}"')
+        command_parts.append(f'regedit {shlex.quote(file_path)}')
     else:
-        command_parts.append(f'"{file_path}"')
+        command_parts.append(shlex.quote(file_path))
 
     # Join all parts into a single command
     command = ' '.join(command_parts)
@@ -6974,6 +8592,13 @@ def run_file(file_path):
     # Run the command in the directory of the file
     subprocess.run([faugus_run_path, command], cwd=file_dir)
 
+def get_interface_settings():
+    # Gio.Settings aborts the process when the schema is not installed, so look it up first
+    source = Gio.SettingsSchemaSource.get_default()
+    if source and source.lookup("org.gnome.desktop.interface", True):
+        return Gio.Settings.new("org.gnome.desktop.interface")
+    return None
+
 def apply_dark_theme():
     if IS_FLATPAK:
         if (os.environ.get("XDG_CURRENT_DESKTOP")) == "KDE":
@@ -6991,7 +8616,9 @@ def apply_dark_theme():
             is_dark = False
         Gtk.Settings.get_default().set_property("gtk-application-prefer-dark-theme", is_dark)
     else:
-        desktop_env = Gio.Settings.new("org.gnome.desktop.interface")
+        desktop_env = get_interface_settings()
+        if desktop_env is None:
+            return
         try:
             is_dark_theme = desktop_env.get_string("color-scheme") == "prefer-dark"
         except Exception:
@@ -7002,29 +8629,50 @@ def apply_dark_theme():
 def update_games_file():
     if not os.path.exists(games_json):
         return
-    with open(games_json, "r", encoding="utf-8") as f:
-        games = json.load(f)
+    games = game_store.load()
     for game in games:
         if not game.get("gameid"):
             game["gameid"] = format_title(game["title"])
-    with open(games_json, "w", encoding="utf-8") as f:
-        json.dump(games, f, indent=4, ensure_ascii=False)
+    # Only rewrites games.json (or its index) when something actually changed
+    game_store.save(games)
+    game_store.flush()
 
 def faugus_launcher():
+    control_command = get_control_command(sys.argv)
+    if control_command and control_command.split()[0] in ("stop", "reload"):
+        print("Faugus Launcher is not running.")
+        return
+
     update_games_file()
     apply_dark_theme()
+    if launch_worker_enabled():
+        ensure_launch_worker()
+    mark_startup("games and theme")
 
-    if len(sys.argv) == 1:
+    if control_command:
         app = Main()
+        mark_startup("main window")
         app.connect("destroy", app.on_destroy)
+        app.control_server = ControlServer(control_socket_path, app.handle_control_command)
+        app.control_server.start()
+        if control_command.startswith("launch "):
+            reply = app.handle_control_command(control_command)
+            if reply != "ok":
+                print(reply)
+        if STARTUP_PROFILE:
+            app.connect_after("draw", print_startup_profile)
         Gtk.main()
 
-    elif len(sys.argv) == 2:
-        if sys.argv[1] == "--hide":
-            app = Main()
-            app.hide()
-            app.connect("destroy", app.on_destroy)
-            Gtk.main()
+    elif len(sys.argv) == 2 and sys.argv[1] == "--hide":
+        app = Main()
+        mark_startup("main window")
+        app.hide()
+        app.connect("destroy", app.on_destroy)
+        app.control_server = ControlServer(control_socket_path, app.handle_control_command)
+        app.control_server.start()
+        if STARTUP_PROFILE:
+            GLib.idle_add(print_startup_profile)
+        Gtk.main()
 
     elif len(sys.argv) == 3 and sys.argv[1] == "--shortcut":
         app = CreateShortcut(sys.argv[2])
@@ -7035,7 +8683,7 @@ def faugus_launcher():
         print("Invalid arguments")
 
 def main():
-    if len(sys.argv) == 2 and sys.argv[1] != "--hide":
+    if len(sys.argv) == 2 and sys.argv[1] != "--hide" and sys.argv[1] not in CONTROL_OPTIONS:
         run_file(sys.argv[1])
     elif len(sys.argv) == 3 and sys.argv[1] == "--shortcut":
         faugus_launcher()
@@ -1,20 +1,29 @@
 #!/usr/bin/python3
 
 import os
-import requests
+import hashlib
 import tarfile
 import re
+import shutil
+import subprocess
 from pathlib import Path
 import threading
 
 STEAM_COMPAT_DIR = Path.home() / ".local/share/Steam/compatibilitytools.d"
 GITHUB_API_URL = "https://api.github.com/repos/Etaash-mathamsetty/Proton/releases/latest"
 DOWNLOAD_BASE_URL = "https://github.com/Etaash-mathamsetty/Proton/releases/download"
+REQUEST_TIMEOUT = (5, 20)
 
-def get_latest_release_tag():
-    response = requests.get(GITHUB_API_URL)
+def get_latest_release():
+    import requests
+
+    try:
+        response = requests.get(GITHUB_API_URL, timeout=REQUEST_TIMEOUT)
+    except requests.RequestException as e:
+        print("Failed to access GitHub API:", e, flush=True)
+        return None
     if response.status_code == 200:
-        return response.json()["tag_name"]
+        return response.json()
     else:
         print("Failed to access GitHub API:", response.status_code, flush=True)
         return None
@@ -28,40 +37,166 @@ def get_installed_proton_versions():
         if entry.is_dir() and re.match(r"proton-EM-\d+\.\d+-\d+", entry.name)
     ])
 
-def download_and_extract(version_tag):
+DECOMPRESS_CHUNK = 1024 * 1024
+
+def find_decompressor(filename):
+    # External decoders use every core; FAUGUS_DECOMPRESS_THREADS=1 forces tarfile
+    threads = os.environ.get("FAUGUS_DECOMPRESS_THREADS", "0")
+    if threads == "1":
+        return None
+    if filename.endswith(".tar.xz"):
+        candidates = [["xz", "-dc", f"-T{threads}"]]
+    elif filename.endswith(".tar.gz"):
+        candidates = [["pigz", "-dc"] + ([f"-p{threads}"] if threads != "0" else [])]
+    elif filename.endswith(".tar.zst"):
+        candidates = [["zstd", "-dc", f"-T{threads}"]]
+    else:
+        return None
+    for argv in candidates:
+        binary = shutil.which(argv[0])
+        if binary:
+            return [binary] + argv[1:]
+    return None
+
+def extract_archive(source, filename, path):
+    # source is any object with read(); the archive is never seeked, so it can be a download stream
+    argv = find_decompressor(filename)
+    if not argv:
+        mode = "r|xz" if filename.endswith(".tar.xz") else "r|gz"
+        with tarfile.open(fileobj=source, mode=mode) as tar:
+            tar.extractall(path=path, filter="fully_trusted")
+        return
+
+    process = subprocess.Popen(argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    feed_error = []
+
+    def feed():
+        try:
+            while data := source.read(DECOMPRESS_CHUNK):
+                process.stdin.write(data)
+        except Exception as e:
+            feed_error.append(e)
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+    try:
+        with tarfile.open(fileobj=process.stdout, mode="r|") as tar:
+            tar.extractall(path=path, filter="fully_trusted")
+    finally:
+        process.stdout.close()
+        feeder.join()
+        returncode = process.wait()
+    if feed_error:
+        raise feed_error[0]
+    if returncode != 0:
+        raise RuntimeError(f"{os.path.basename(argv[0])} exited with status {returncode}")
+
+def get_expected_checksum(assets, filename):
+    import requests
+
+    # A .sha512sum asset wins over the digest GitHub reports for the archive
+    for asset in assets:
+        if asset["name"].endswith(".sha512sum"):
+            try:
+                response = requests.get(asset["browser_download_url"], timeout=REQUEST_TIMEOUT)
+                if response.status_code == 200 and response.text.split():
+                    return "sha512", response.text.split()[0].lower()
+            except requests.RequestException as e:
+                print(f"Failed to download {asset['name']}: {e}", flush=True)
+    for asset in assets:
+        if asset["name"] == filename and asset.get("digest"):
+            algorithm, sep, value = asset["digest"].partition(":")
+            if sep and algorithm in hashlib.algorithms_available:
+                return algorithm, value.lower()
+    return None
+
+def download_resumable(url, part_path, algorithm):
+    import requests
+
+    # Bytes left by an interrupted run are hashed again and the rest is requested with Range
+    file_hash = hashlib.new(algorithm)
+    offset = 0
+    if part_path.exists():
+        with open(part_path, "rb") as f:
+            while data := f.read(DECOMPRESS_CHUNK):
+                file_hash.update(data)
+                offset += len(data)
+
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    try:
+        with requests.get(url, stream=True, headers=headers, timeout=REQUEST_TIMEOUT) as response:
+            if response.status_code == 416 and offset:
+                return file_hash.hexdigest()
+            if response.status_code == 200:
+                file_hash = hashlib.new(algorithm)
+                mode = "wb"
+            elif response.status_code == 206:
+                mode = "ab"
+            else:
+                print("Failed to download:", response.status_code, flush=True)
+                return None
+            with open(part_path, mode) as f:
+                for chunk in response.iter_content(chunk_size=DECOMPRESS_CHUNK):
+                    file_hash.update(chunk)
+                    f.write(chunk)
+    except requests.RequestException as e:
+        print("Failed to download:", e, flush=True)
+        return None
+
+    return file_hash.hexdigest()
+
+def download_and_extract(version_tag, assets=()):
     tar_name = f"proton-{version_tag}.tar.xz"
     url = f"{DOWNLOAD_BASE_URL}/{version_tag}/{tar_name}"
     tar_path = STEAM_COMPAT_DIR / tar_name
+    part_path = STEAM_COMPAT_DIR / f"{tar_name}.part"
+
+    STEAM_COMPAT_DIR.mkdir(parents=True, exist_ok=True)
+    expected = get_expected_checksum(assets, tar_name)
 
     print(f"Downloading {tar_name}...", flush=True)
-    response = requests.get(url, stream=True)
-    if response.status_code == 200:
-        with open(tar_path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-    else:
-        print("Failed to download:", response.status_code)
+    digest = download_resumable(url, part_path, expected[0] if expected else "sha512")
+    if digest is None:
         return
 
+    if expected and digest != expected[1]:
+        print(f"Checksum mismatch for {tar_name}, removing the download.", flush=True)
+        os.remove(part_path)
+        return
+    os.replace(part_path, tar_path)
+
     print("Extracting archive...", flush=True)
-    with tarfile.open(tar_path, "r:xz") as tar:
-        tar.extractall(path=STEAM_COMPAT_DIR)
+    with open(tar_path, "rb") as f:
+        extract_archive(f, tar_name, STEAM_COMPAT_DIR)
 
     os.remove(tar_path)
     print("Proton installed successfully.", flush=True)
 
+    # The manager owns the deduplication pass over compatibilitytools.d. It can take a while
+    # over several runners, so it is left running on its own instead of holding up the game,
+    # and without faugus-run's output pipes, which would otherwise stay open until it ends.
+    manager = shutil.which("faugus-proton-manager")
+    if manager:
+        subprocess.Popen([manager, "--dedup"], start_new_session=True,
+                         stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
 def main():
-    latest_version = get_latest_release_tag()
-    if not latest_version:
+    release = get_latest_release()
+    if not release:
         return
+    latest_version = release["tag_name"]
 
     installed_versions = get_installed_proton_versions()
     print("Latest available version:", latest_version, flush=True)
     print("Installed versions:", ", ".join(installed_versions) or "none", flush=True)
 
     if latest_version not in installed_versions:
-        thread = threading.Thread(target=download_and_extract, args=(latest_version,))
+        thread = threading.Thread(target=download_and_extract, args=(latest_version, release.get("assets", [])))
         thread.start()
         thread.join()
     else:
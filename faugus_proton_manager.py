@@ -3,11 +3,19 @@
 import requests
 import gi
 import os
+import sys
+import json
+import stat
+import fcntl
+import time
+import hashlib
 import tarfile
 import shutil
+import subprocess
 import gettext
 import locale
 from pathlib import Path
+from threading import Thread
 
 gi.require_version("Gtk", "3.0")
 from gi.repository import Gtk, Gio, GLib
@@ -32,6 +40,11 @@ class PathManager:
         xdg_config_home = Path(os.getenv('XDG_CONFIG_HOME', Path.home() / '.config'))
         return str(xdg_config_home.joinpath(*relative_paths))
 
+    @staticmethod
+    def user_cache(*relative_paths):
+        xdg_cache_home = Path(os.getenv('XDG_CACHE_HOME', Path.home() / '.cache'))
+        return str(xdg_cache_home.joinpath(*relative_paths))
+
     @staticmethod
     def get_icon(icon_name):
         icon_paths = [
@@ -54,6 +67,14 @@ else:
 
 config_file_dir = PathManager.user_config('faugus-launcher/config.ini')
 faugus_launcher_dir = PathManager.user_config('faugus-launcher')
+releases_cache_dir = PathManager.user_cache('faugus-launcher/releases')
+downloads_cache_dir = PathManager.user_cache('faugus-launcher/downloads')
+dedup_cache_dir = PathManager.user_cache('faugus-launcher')
+
+GE_PROTON_URL = "https://api.github.com/repos/GloriousEggroll/proton-ge-custom/releases"
+PROTON_EM_URL = "https://api.github.com/repos/Etaash-mathamsetty/Proton/releases"
+REQUEST_TIMEOUT = (5, 20)
+PROGRESS_INTERVAL = 0.1
 
 def get_system_locale():
     lang = os.environ.get('LANG') or os.environ.get('LC_MESSAGES')
@@ -123,6 +144,379 @@ class ConfigManager:
             for key, value in self.config.items():
                 f.write(f'{key}={value}\n')
 
+def is_supported_release(url, tag_name):
+    if "GloriousEggroll" in url:
+        # Esperado: GE-Proton8-1
+        if not tag_name.startswith("GE-Proton"):
+            return False
+        try:
+            version_str = tag_name.replace("GE-Proton", "")
+            major, minor = map(int, version_str.split("-"))
+            return (major, minor) >= (8, 1)
+        except Exception:
+            return False
+
+    if "Etaash-mathamsetty" in url:
+        # Esperado: EM-10.0-4
+        if not tag_name.startswith("EM-"):
+            return False
+        try:
+            version_str = tag_name.replace("EM-", "")
+            part1, part2 = version_str.split("-")
+            major, minor = map(int, part1.split("."))
+            patch = int(part2)
+            return (major, minor, patch) >= (10, 0, 4)
+        except Exception:
+            return False
+
+    return True
+
+DECOMPRESS_CHUNK = 1024 * 1024
+
+def find_decompressor(filename):
+    # External decoders use every core; FAUGUS_DECOMPRESS_THREADS=1 forces tarfile
+    threads = os.environ.get("FAUGUS_DECOMPRESS_THREADS", "0")
+    if threads == "1":
+        return None
+    if filename.endswith(".tar.xz"):
+        candidates = [["xz", "-dc", f"-T{threads}"]]
+    elif filename.endswith(".tar.gz"):
+        candidates = [["pigz", "-dc"] + ([f"-p{threads}"] if threads != "0" else [])]
+    elif filename.endswith(".tar.zst"):
+        candidates = [["zstd", "-dc", f"-T{threads}"]]
+    else:
+        return None
+    for argv in candidates:
+        binary = shutil.which(argv[0])
+        if binary:
+            return [binary] + argv[1:]
+    return None
+
+def extract_archive(source, filename, path):
+    # source is any object with read(); the archive is never seeked, so it can be a download stream
+    argv = find_decompressor(filename)
+    if not argv:
+        mode = "r|xz" if filename.endswith(".tar.xz") else "r|gz"
+        with tarfile.open(fileobj=source, mode=mode) as tar:
+            tar.extractall(path=path, filter="fully_trusted")
+        return
+
+    process = subprocess.Popen(argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    feed_error = []
+
+    def feed():
+        try:
+            while data := source.read(DECOMPRESS_CHUNK):
+                process.stdin.write(data)
+        except Exception as e:
+            feed_error.append(e)
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+
+    feeder = Thread(target=feed, daemon=True)
+    feeder.start()
+    try:
+        with tarfile.open(fileobj=process.stdout, mode="r|") as tar:
+            tar.extractall(path=path, filter="fully_trusted")
+    finally:
+        process.stdout.close()
+        feeder.join()
+        returncode = process.wait()
+    if feed_error:
+        raise feed_error[0]
+    if returncode != 0:
+        raise RuntimeError(f"{os.path.basename(argv[0])} exited with status {returncode}")
+
+FICLONE = 0x40049409
+DEDUP_MIN_SIZE = 4096
+
+def file_digest(path):
+    file_hash = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as f:
+        while data := f.read(DECOMPRESS_CHUNK):
+            file_hash.update(data)
+    return file_hash.hexdigest()
+
+def share_file(source, target):
+    # A reflink gives target its own inode backed by the same extents; filesystems
+    # without FICLONE get a hardlink instead
+    tmp_path = f"{target}.dedup-tmp"
+    try:
+        with open(source, "rb") as src, open(tmp_path, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        shutil.copystat(target, tmp_path)
+        os.replace(tmp_path, target)
+        return True
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    os.link(source, tmp_path)
+    os.replace(tmp_path, target)
+    return False
+
+def deduplicate_runners(root=STEAM_COMPATIBILITY_PATH):
+    # The manager and a detached --dedup run share dedup.json and the .dedup-tmp
+    # paths, so a second pass waits for the first one to finish
+    os.makedirs(dedup_cache_dir, exist_ok=True)
+    with open(os.path.join(dedup_cache_dir, "dedup.lock"), "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        return deduplicate_runners_locked(root)
+
+def deduplicate_runners_locked(root):
+    # Content-addressed pass over every installed runner: files with the same size,
+    # mode and hash end up sharing storage. Returns the number of bytes reclaimed.
+    state_path = os.path.join(dedup_cache_dir, "dedup.json")
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    known = state.get("files", {})
+    # Reflinked files are recorded with their inode and mtime, so a runner reinstalled at
+    # the same path is deduplicated again
+    cloned = {tuple(entry) for entry in state.get("cloned", []) if isinstance(entry, list) and len(entry) == 3}
+
+    if not Path(root).is_dir():
+        return 0
+
+    by_size = {}
+    for runner in sorted(Path(root).iterdir()):
+        if not runner.is_dir() or runner.is_symlink() or runner.name.startswith("temp_"):
+            continue
+        for dirpath, dirnames, filenames in os.walk(runner):
+            dirnames.sort()
+            for name in sorted(filenames):
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.lstat(path)
+                except OSError:
+                    continue
+                if stat.S_ISREG(st.st_mode) and st.st_size >= DEDUP_MIN_SIZE:
+                    by_size.setdefault((st.st_size, stat.S_IMODE(st.st_mode)), []).append((path, st))
+
+    files = {}
+    groups = {}
+    for key, entries in by_size.items():
+        if len(entries) < 2:
+            continue
+        for path, st in entries:
+            signature = [st.st_ino, st.st_size, st.st_mtime_ns]
+            entry = known.get(path)
+            if entry and entry[:3] == signature:
+                digest = entry[3]
+            else:
+                try:
+                    digest = file_digest(path)
+                except OSError:
+                    continue
+            files[path] = signature + [digest]
+            groups.setdefault(key + (digest,), []).append((path, st))
+
+    reclaimed = 0
+    for (size, mode, digest), entries in groups.items():
+        source, source_st = entries[0]
+        for path, st in entries[1:]:
+            if (st.st_dev, st.st_ino) == (source_st.st_dev, source_st.st_ino) or (path, st.st_ino, st.st_mtime_ns) in cloned:
+                continue
+            if st.st_dev != source_st.st_dev:
+                continue
+            try:
+                reflinked = share_file(source, path)
+                new_st = os.lstat(path)
+                if reflinked:
+                    cloned.add((path, new_st.st_ino, new_st.st_mtime_ns))
+                files[path] = [new_st.st_ino, new_st.st_size, new_st.st_mtime_ns, digest]
+                if st.st_nlink == 1:
+                    reclaimed += size
+            except OSError as e:
+                print(f"Failed to deduplicate {path}: {e}")
+
+    tmp_path = f"{state_path}.tmp"
+    try:
+        os.makedirs(dedup_cache_dir, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            current = {(path, entry[0], entry[2]) for path, entry in files.items()}
+            json.dump({"files": files, "cloned": sorted(cloned & current)}, f)
+        os.replace(tmp_path, state_path)
+    except OSError as e:
+        print(f"Failed to save {state_path}: {e}")
+
+    return reclaimed
+
+class ReleaseCache:
+    # Keeps the release pages of one repository with their ETags, so reopening the
+    # manager renders without waiting and revalidation costs a single 304
+    def __init__(self, name):
+        self.path = os.path.join(releases_cache_dir, f"{name}.json")
+        self.pages = []
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.pages = data.get("pages", [])
+        except (OSError, ValueError, AttributeError):
+            self.pages = []
+        return self.releases()
+
+    def save(self, pages):
+        self.pages = pages
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(releases_cache_dir, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"pages": pages}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Failed to save {self.path}: {e}")
+
+    def releases(self):
+        return [release for page in self.pages for release in page.get("releases", [])]
+
+    def etag(self, index):
+        if index < len(self.pages):
+            return self.pages[index].get("etag")
+        return None
+
+    @staticmethod
+    def trim(release):
+        return {
+            "tag_name": release["tag_name"],
+            "assets": [
+                {
+                    "name": asset.get("name", ""),
+                    "browser_download_url": asset.get("browser_download_url", ""),
+                    "size": asset.get("size", 0),
+                    "digest": asset.get("digest"),
+                }
+                for asset in release.get("assets", [])
+            ],
+        }
+
+class ProgressReader:
+    # File-like wrapper handed to tarfile; reports download progress to the main
+    # loop at most every PROGRESS_INTERVAL seconds
+    def __init__(self, raw, total_size, callback):
+        self.raw = raw
+        self.total_size = total_size
+        self.callback = callback
+        self.read_size = 0
+        self.last_update = 0
+
+    def read(self, size=-1):
+        data = self.raw.read(size)
+        self.read_size += len(data)
+        if self.total_size > 0:
+            now = time.monotonic()
+            if now - self.last_update >= PROGRESS_INTERVAL or self.read_size >= self.total_size:
+                self.last_update = now
+                GLib.idle_add(self.callback, min(self.read_size / self.total_size, 1.0))
+        return data
+
+class ResumableDownload:
+    # File-like source for extract_archive. Bytes already in the .part file are
+    # replayed first, the rest is fetched with a Range request and appended, and
+    # everything is hashed on the way through.
+    def __init__(self, url, part_path, algorithm="sha512"):
+        self.url = url
+        self.part_path = part_path
+        self.hash = hashlib.new(algorithm)
+        self.total_size = 0
+        self.local = None
+        self.part = None
+        self.response = None
+        self.network_error = False
+
+    def open(self):
+        os.makedirs(os.path.dirname(self.part_path), exist_ok=True)
+        offset = os.path.getsize(self.part_path) if os.path.exists(self.part_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+        try:
+            self.response = requests.get(self.url, stream=True, headers=headers, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException:
+            self.network_error = True
+            raise
+
+        length = int(self.response.headers.get("content-length", 0))
+        if self.response.status_code == 206:
+            self.total_size = offset + length
+            mode = "ab"
+        elif self.response.status_code == 416 and offset:
+            # The previous attempt already fetched every byte
+            self.response.close()
+            self.response = None
+            self.total_size = offset
+            mode = None
+        elif self.response.status_code == 200:
+            offset = 0
+            self.total_size = length
+            mode = "wb"
+        else:
+            self.network_error = True
+            self.response.raise_for_status()
+            raise requests.HTTPError(f"Unexpected status {self.response.status_code}")
+
+        if offset:
+            self.local = open(self.part_path, "rb")
+        if mode:
+            self.response.raw.decode_content = True
+            self.part = open(self.part_path, mode)
+
+    def read(self, size=-1):
+        if self.local:
+            data = self.local.read(size)
+            if data:
+                self.hash.update(data)
+                return data
+            self.local.close()
+            self.local = None
+
+        if not self.response:
+            return b""
+        try:
+            data = self.response.raw.read(size)
+        except Exception:
+            self.network_error = True
+            raise
+        if data:
+            self.hash.update(data)
+            self.part.write(data)
+        return data
+
+    def finish(self):
+        # tar stops reading at its end-of-archive marker, the hash needs the whole file
+        while self.read(DECOMPRESS_CHUNK):
+            pass
+        self.close()
+        return self.hash.hexdigest()
+
+    def close(self):
+        for handle in (self.local, self.part, self.response):
+            if handle:
+                handle.close()
+        self.local = self.part = self.response = None
+
+def get_expected_checksum(assets, filename):
+    # GE-Proton publishes a .sha512sum file, other releases may carry a GitHub asset digest
+    for asset in assets:
+        if asset["name"].endswith(".sha512sum"):
+            try:
+                response = requests.get(asset["browser_download_url"], timeout=REQUEST_TIMEOUT)
+                if response.status_code == 200 and response.text.split():
+                    return "sha512", response.text.split()[0].lower()
+            except requests.RequestException as e:
+                print(f"Failed to download {asset['name']}: {e}")
+    for asset in assets:
+        if asset["name"] == filename and asset.get("digest"):
+            algorithm, sep, value = asset["digest"].partition(":")
+            if sep and algorithm in hashlib.algorithms_available:
+                return algorithm, value.lower()
+    return None
+
 class ProtonDownloader(Gtk.Dialog):
     def __init__(self):
         super().__init__(title=_("Faugus Proton Manager"))
@@ -156,6 +550,14 @@ class ProtonDownloader(Gtk.Dialog):
         self.progress_bar.set_margin_bottom(10)
         self.content_area.add(self.progress_bar)
 
+        self.button_dedup = Gtk.Button(label=_("Free up space"))
+        self.button_dedup.set_tooltip_text(_("Share identical files between installed runners"))
+        self.button_dedup.set_margin_start(10)
+        self.button_dedup.set_margin_end(10)
+        self.button_dedup.set_margin_bottom(10)
+        self.button_dedup.connect("clicked", self.on_dedup_clicked)
+        self.content_area.add(self.button_dedup)
+
         self.notebook = Gtk.Notebook()
         self.notebook.set_halign(Gtk.Align.FILL)
         self.notebook.set_valign(Gtk.Align.FILL)
@@ -207,6 +609,8 @@ class ProtonDownloader(Gtk.Dialog):
         tab_box_em.show_all()
         self.notebook.append_page(scroll_em, tab_box_em)
 
+        self.busy = False
+        self.pending_renders = {}
         self.load_config()
         self.get_releases()
         self.show_all()
@@ -218,59 +622,69 @@ class ProtonDownloader(Gtk.Dialog):
         self.language = cfg.config.get('language', '')
 
     def get_releases(self):
-        self.fetch_releases_from_url(
-            "https://api.github.com/repos/GloriousEggroll/proton-ge-custom/releases",
-            self.grid_ge
-        )
-        self.fetch_releases_from_url(
-            "https://api.github.com/repos/Etaash-mathamsetty/Proton/releases",
-            self.grid_em
-        )
-
-    def fetch_releases_from_url(self, url, grid):
+        # Both repositories are fetched at the same time, off the main thread
+        for name, url, grid in (("ge-proton", GE_PROTON_URL, self.grid_ge), ("proton-em", PROTON_EM_URL, self.grid_em)):
+            cache = ReleaseCache(name)
+            cached = cache.load()
+            if cached:
+                self.render_releases(url, grid, cached)
+            Thread(target=self.fetch_releases_from_url, args=(url, grid, cache, bool(cached)), daemon=True).start()
+
+    def fetch_releases_from_url(self, url, grid, cache, rendered):
         page = 1
-        releases = []
+        pages = []
         while True:
-            response = requests.get(url, params={"page": page, "per_page": 100})
-            if response.status_code == 200:
-                page_releases = response.json()
+            headers = {"Accept": "application/vnd.github+json"}
+            etag = cache.etag(page - 1)
+            if etag:
+                headers["If-None-Match"] = etag
+            try:
+                response = requests.get(url, params={"page": page, "per_page": 100}, headers=headers, timeout=REQUEST_TIMEOUT)
+            except requests.RequestException as e:
+                print(f"Failed to access {url}: {e}")
+                return
+
+            if response.status_code == 304:
+                # New releases always land on the first page, so an unchanged first page means nothing changed
+                if page == 1:
+                    return
+                pages.append(cache.pages[page - 1])
+                if not cache.pages[page - 1].get("releases"):
+                    break
+            elif response.status_code == 200:
+                page_releases = [ReleaseCache.trim(release) for release in response.json()]
+                pages.append({"etag": response.headers.get("ETag"), "releases": page_releases})
                 if not page_releases:
                     break
-                releases.extend(page_releases)
-                page += 1
+                if not rendered:
+                    GLib.idle_add(self.add_releases_to_grid, url, grid, page_releases)
             else:
-                break
-
+                print(f"Failed to access {url}. Status code: {response.status_code}")
+                return
+            page += 1
+
+        old_releases = cache.releases()
+        cache.save(pages)
+        if rendered and cache.releases() != old_releases:
+            GLib.idle_add(self.render_releases, url, grid, cache.releases())
+
+    def render_releases(self, url, grid, releases):
+        # Rebuilding the grid would drop the button of a running download
+        if self.busy:
+            self.pending_renders[grid] = (url, grid, releases)
+            return False
+        for child in grid.get_children():
+            grid.remove(child)
+        self.add_releases_to_grid(url, grid, releases)
+
+    def add_releases_to_grid(self, url, grid, releases):
         for release in releases:
-            tag_name = release["tag_name"]
-
-            if "GloriousEggroll" in url:
-                # Esperado: GE-Proton8-1
-                if not tag_name.startswith("GE-Proton"):
-                    continue
-                try:
-                    version_str = tag_name.replace("GE-Proton", "")
-                    major, minor = map(int, version_str.split("-"))
-                    if (major, minor) < (8, 1):
-                        continue
-                except Exception:
-                    continue
-
-            elif "Etaash-mathamsetty" in url:
-                # Esperado: EM-10.0-4
-                if not tag_name.startswith("EM-"):
-                    continue
-                try:
-                    version_str = tag_name.replace("EM-", "")
-                    part1, part2 = version_str.split("-")
-                    major, minor = map(int, part1.split("."))
-                    patch = int(part2)
-                    if (major, minor, patch) < (10, 0, 4):
-                        continue
-                except Exception:
-                    continue
-
-            self.add_release_to_grid(release, grid)
+            if is_supported_release(url, release["tag_name"]):
+                self.add_release_to_grid(release, grid)
+        grid.show_all()
+        if self.busy:
+            self.disable_all_buttons()
+        return False
 
     def add_release_to_grid(self, release, grid):
         tag_name = release["tag_name"]
@@ -325,18 +739,21 @@ class ProtonDownloader(Gtk.Dialog):
             self.on_download_clicked(widget, release)
 
     def disable_all_buttons(self):
+        self.button_dedup.set_sensitive(False)
         for grid in (self.grid_ge, self.grid_em):
             for child in grid.get_children():
                 if isinstance(child, Gtk.Button):
                     child.set_sensitive(False)
 
     def enable_all_buttons(self):
+        self.button_dedup.set_sensitive(True)
         for grid in (self.grid_ge, self.grid_em):
             for child in grid.get_children():
                 if isinstance(child, Gtk.Button):
                     child.set_sensitive(True)
 
     def on_download_clicked(self, widget, release):
+        self.busy = True
         self.disable_all_buttons()
         for asset in release["assets"]:
             if asset["name"].endswith((".tar.gz", ".tar.xz")):
@@ -344,103 +761,135 @@ class ProtonDownloader(Gtk.Dialog):
                     asset["browser_download_url"],
                     asset["name"],
                     release["tag_name"],
-                    widget
+                    widget,
+                    release["assets"]
                 )
                 break
+        else:
+            self.finish_busy()
+
+    def finish_busy(self):
+        self.busy = False
+        self.enable_all_buttons()
+        pending, self.pending_renders = self.pending_renders, {}
+        for args in pending.values():
+            self.render_releases(*args)
 
-    def download_and_extract(self, url, filename, tag_name, button):
+    def download_and_extract(self, url, filename, tag_name, button, assets=()):
         button.set_label(_("Downloading..."))
         display_tag_name = f"proton-{tag_name}" if tag_name.startswith("EM-") else tag_name
         self.progress_label.set_text(_("Downloading %s...") % display_tag_name)
         self.progress_label.set_visible(True)
         self.progress_bar.set_visible(True)
         self.progress_bar.set_fraction(0)
+        self.progress_bar.set_text("0%")
         button.set_sensitive(False)
 
-        while Gtk.events_pending():
-            Gtk.main_iteration_do(False)
+        Thread(target=self.install_release, args=(url, filename, tag_name, button, assets), daemon=True).start()
 
-        if not os.path.exists(STEAM_COMPATIBILITY_PATH):
-            os.makedirs(STEAM_COMPATIBILITY_PATH)
+    def install_release(self, url, filename, tag_name, button, assets):
+        # Runs on a worker thread: the archive is unpacked into a staging directory
+        # while it downloads, and only moved into place once the checksum matches
+        temp_dir = os.path.join(STEAM_COMPATIBILITY_PATH, f"temp_{tag_name}")
+        part_path = os.path.join(downloads_cache_dir, f"{filename}.part")
+        expected = get_expected_checksum(assets, filename)
+        download = ResumableDownload(url, part_path, expected[0] if expected else "sha512")
 
-        response = requests.get(url, stream=True)
-        total_size = int(response.headers.get("content-length", 0))
-        downloaded_size = 0
-
-        tar_file_path = os.path.join(os.getcwd(), filename)
-        with open(tar_file_path, "wb") as file:
-            for data in response.iter_content(1024):
-                file.write(data)
-                downloaded_size += len(data)
-                progress = downloaded_size / total_size if total_size > 0 else 0
-                self.progress_bar.set_fraction(progress)
-                self.progress_bar.set_text(f"{int(progress * 100)}%")
-
-                while Gtk.events_pending():
-                    Gtk.main_iteration_do(False)
-            file.flush()
-            os.fsync(file.fileno())
-
-        self.extract_tar_and_update_button(tar_file_path, tag_name, button)
+        try:
+            os.makedirs(STEAM_COMPATIBILITY_PATH, exist_ok=True)
+            if os.path.exists(temp_dir):
+                shutil.rmtree(temp_dir)
+            os.makedirs(temp_dir)
 
-    def extract_tar_and_update_button(self, tar_file_path, tag_name, button):
-        button.set_label(_("Extracting..."))
-        display_tag_name = f"proton-{tag_name}" if tag_name.startswith("EM-") else tag_name
-        self.progress_label.set_text(_("Extracting %s...") % display_tag_name)
-        self.progress_bar.set_fraction(0)
-        self.progress_bar.set_text("0%")
+            download.open()
+            reader = ProgressReader(download, download.total_size, self.on_download_progress)
+            extract_archive(reader, filename, temp_dir)
+            digest = download.finish()
 
-        while Gtk.events_pending():
-            Gtk.main_iteration_do(False)
+            if expected and digest != expected[1]:
+                print(f"Checksum mismatch for {filename}: expected {expected[1]}, got {digest}")
+                os.remove(part_path)
+                shutil.rmtree(temp_dir)
+                GLib.idle_add(self.on_install_finished, button, False, _("Checksum verification failed"))
+                return
+            if not expected:
+                print(f"No checksum published for {filename}, skipping verification")
+            os.remove(part_path)
+
+            extracted_dir = None
+            for item in os.listdir(temp_dir):
+                item_path = os.path.join(temp_dir, item)
+                if os.path.isdir(item_path):
+                    extracted_dir = item_path
+                    break
 
-        mode = 'r:xz' if tar_file_path.endswith('.tar.xz') else 'r:gz'
+            if extracted_dir:
+                final_dir = os.path.join(STEAM_COMPATIBILITY_PATH, os.path.basename(extracted_dir))
+                if os.path.exists(final_dir):
+                    shutil.rmtree(final_dir)
+                shutil.move(extracted_dir, STEAM_COMPATIBILITY_PATH)
 
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        except Exception as e:
+            print(f"Error during extraction: {e}")
+            download.close()
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            # A broken connection keeps the .part file for the next attempt, anything
+            # else means the bytes on disk cannot be trusted
+            if not download.network_error and os.path.exists(part_path):
+                os.remove(part_path)
+            GLib.idle_add(self.on_install_finished, button, False)
+            return
+
+        # The runner is installed at this point, a failed pass only costs disk space
+        GLib.idle_add(self.progress_label.set_text, _("Freeing up space..."))
         try:
-            with tarfile.open(tar_file_path, mode) as tar:
-                total_members = len(tar.getmembers())
-                extracted_members = 0
-
-                temp_dir = os.path.join(STEAM_COMPATIBILITY_PATH, f"temp_{tag_name}")
-                os.makedirs(temp_dir, exist_ok=True)
-
-                for member in tar.getmembers():
-                    tar.extract(member, path=temp_dir, filter="fully_trusted")
-                    extracted_members += 1
-                    progress = extracted_members / total_members
-                    self.progress_bar.set_fraction(progress)
-                    self.progress_bar.set_text(f"{int(progress * 100)}%")
-
-                    while Gtk.events_pending():
-                        Gtk.main_iteration_do(False)
-
-                extracted_dir = None
-                for item in os.listdir(temp_dir):
-                    item_path = os.path.join(temp_dir, item)
-                    if os.path.isdir(item_path):
-                        extracted_dir = item_path
-                        break
-
-                if extracted_dir:
-                    final_dir = os.path.join(STEAM_COMPATIBILITY_PATH, os.path.basename(extracted_dir))
-                    if os.path.exists(final_dir):
-                        shutil.rmtree(final_dir)
-                    shutil.move(extracted_dir, STEAM_COMPATIBILITY_PATH)
-
-                shutil.rmtree(temp_dir)
+            reclaimed = deduplicate_runners()
+        except Exception as e:
+            print(f"Error during deduplication: {e}")
+            reclaimed = 0
+        GLib.idle_add(self.on_install_finished, button, True, None, reclaimed)
 
-            os.remove(tar_file_path)
+    def on_dedup_clicked(self, widget):
+        self.busy = True
+        self.disable_all_buttons()
+        self.progress_label.set_text(_("Freeing up space..."))
+        self.progress_label.set_visible(True)
 
+        def run_dedup():
+            try:
+                reclaimed = deduplicate_runners()
+            except OSError as e:
+                print(f"Error during deduplication: {e}")
+                reclaimed = 0
+            GLib.idle_add(self.on_dedup_finished, reclaimed)
+
+        Thread(target=run_dedup, daemon=True).start()
+
+    def on_dedup_finished(self, reclaimed):
+        self.progress_label.set_text(_("Reclaimed %s") % GLib.format_size(reclaimed))
+        self.finish_busy()
+        return False
+
+    def on_download_progress(self, progress):
+        self.progress_bar.set_fraction(progress)
+        self.progress_bar.set_text(f"{int(progress * 100)}%")
+        return False
+
+    def on_install_finished(self, button, success, message=None, reclaimed=0):
+        if success:
             self.update_button(button, _("Remove"))
             self.progress_bar.set_visible(False)
-            self.progress_label.set_visible(False)
-
-        except Exception as e:
-            print(f"Error during extraction: {e}")
-            self.progress_label.set_text(_("Error during extraction"))
+            if reclaimed:
+                self.progress_label.set_text(_("Reclaimed %s") % GLib.format_size(reclaimed))
+            else:
+                self.progress_label.set_visible(False)
+        else:
+            self.progress_label.set_text(message or _("Error during extraction"))
             self.update_button(button, _("Download"))
-        finally:
-            self.enable_all_buttons()
-            button.set_sensitive(True)
+        self.finish_busy()
+        button.set_sensitive(True)
+        return False
 
     def on_remove_clicked(self, widget, release):
         version_path = self.get_installed_path(release["tag_name"])
@@ -477,6 +926,15 @@ def apply_dark_theme():
             Gtk.Settings.get_default().set_property("gtk-application-prefer-dark-theme", True)
 
 def main():
+    if "--dedup" in sys.argv[1:]:
+        try:
+            reclaimed = deduplicate_runners()
+        except OSError as e:
+            print(f"Error during deduplication: {e}")
+            return
+        print(f"Reclaimed {GLib.format_size(reclaimed)}", flush=True)
+        return
+
     apply_dark_theme()
     win = ProtonDownloader()
     win.connect("destroy", Gtk.main_quit)
@@ -1,18 +1,37 @@
 #!/usr/bin/env python3
 
+import time
+
+# Launch traces measure from here, before anything else is imported
+process_started = time.monotonic()
+
 import gi
 gi.require_version("Gtk", "3.0")
-from gi.repository import Gtk, GLib, GdkPixbuf, Gio
 from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import math
 import sys
 import subprocess
 import argparse
 import re
 import os
+import shlex
+import shutil
+import signal
+import socket
 import gettext
 import locale
 import json
+import traceback
+
+# GTK connects to the display when it is imported, which must not happen in the
+# launch worker before it forks, so it is imported by main()
+Gtk = GLib = GdkPixbuf = Gio = None
+
+def import_gtk():
+    global Gtk, GLib, GdkPixbuf, Gio
+    from gi.repository import Gtk, GLib, GdkPixbuf, Gio
 
 class PathManager:
     @staticmethod
@@ -79,6 +98,7 @@ else:
 config_file_dir = PathManager.user_config('faugus-launcher/config.ini')
 envar_dir = PathManager.user_config('faugus-launcher/envar.txt')
 games_dir = PathManager.user_config('faugus-launcher/games.json')
+games_index = PathManager.user_config('faugus-launcher/games.idx')
 umu_run = PathManager.find_binary('umu-run')
 faugus_launcher_dir = PathManager.user_config('faugus-launcher')
 faugus_components = PathManager.find_binary('faugus-components')
@@ -86,10 +106,38 @@ faugus_proton_downloader = PathManager.find_binary('faugus-proton-downloader')
 prefixes_dir = str(Path.home() / 'Faugus')
 logs_dir = PathManager.user_config('faugus-launcher/logs')
 faugus_notification = PathManager.system_data('faugus-launcher/faugus-notification.ogg')
-eac_dir = f'PROTON_EAC_RUNTIME={PathManager.user_config("faugus-launcher/components/eac")}'
-be_dir = f'PROTON_BATTLEYE_RUNTIME={PathManager.user_config("faugus-launcher/components/be")}'
+eac_dir = PathManager.user_config("faugus-launcher/components/eac")
+worker_socket_path = os.path.join(os.getenv('XDG_RUNTIME_DIR') or faugus_launcher_dir, 'faugus-run.sock')
+be_dir = PathManager.user_config("faugus-launcher/components/be")
 
 compatibility_dir = os.path.expanduser("~/.local/share/Steam/compatibilitytools.d")
+ansi_escape = re.compile(rb'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+READ_SIZE = 65536
+LOG_BUFFER_SIZE = 256 * 1024
+
+# umu.log and Proton's log are moved into <game>/history and compressed once they pass
+# LOG_SEGMENT_BYTES and when a new session starts. The oldest history segments across
+# logs_dir are removed once it holds more than logs-max-mb.
+LOG_SEGMENT_BYTES = 64 * 1024 * 1024
+LOG_CHECK_SECONDS = 15
+
+# Launch traces are kept per game, --trace-report summarises the most recent ones
+traces_dir = f"{logs_dir}/traces"
+TRACE_KEEP = 50
+TRACE_REPORT_LAUNCHES = 20
+
+# Phase name, start mark and end mark. The launcher records "click" through FAUGUS_TRACE.
+TRACE_PHASES = (
+    ("launcher to faugus-run", "click", "faugus-run start"),
+    ("faugus-run startup", "faugus-run start", "faugus-run ready"),
+    ("faugus-proton-downloader", "proton-downloader start", "proton-downloader end"),
+    ("faugus-components", "components start", "components end"),
+    ("umu-run runtime check", "umu-run start", "runtime checked"),
+    ("umu-run proton check", "umu-run start", "proton checked"),
+    ("umu-run first output", "umu-run start", "first output"),
+    ("umu-run to game start", "umu-run start", "game started"),
+    ("click to game start", "click", "game started"),
+)
 os.makedirs(compatibility_dir, exist_ok=True)
 
 def get_system_locale():
@@ -115,27 +163,32 @@ def get_language_from_config():
                     return line.split('=', 1)[1].strip()
     return None
 
-lang = get_language_from_config()
-if not lang:
-    lang = get_system_locale()
-
 LOCALE_DIR = (
     PathManager.system_data('locale')
     if os.path.isdir(PathManager.system_data('locale'))
     else os.path.join(os.path.dirname(__file__), 'locale')
 )
 
-try:
-    translation = gettext.translation(
-        'faugus-run',
-        localedir=LOCALE_DIR,
-        languages=[lang] if lang else ['en_US']
-    )
-    translation.install()
-    globals()['_'] = translation.gettext
-except FileNotFoundError:
-    gettext.install('faugus-run', localedir=LOCALE_DIR)
-    globals()['_'] = gettext.gettext
+def install_translation():
+    # Also run by every launch the worker forks, the language may have changed since it started
+    global lang
+    lang = get_language_from_config()
+    if not lang:
+        lang = get_system_locale()
+
+    try:
+        translation = gettext.translation(
+            'faugus-run',
+            localedir=LOCALE_DIR,
+            languages=[lang] if lang else ['en_US']
+        )
+        translation.install()
+        globals()['_'] = translation.gettext
+    except FileNotFoundError:
+        gettext.install('faugus-run', localedir=LOCALE_DIR)
+        globals()['_'] = gettext.gettext
+
+install_translation()
 
 class ConfigManager:
     def __init__(self):
@@ -163,6 +216,10 @@ class ConfigManager:
             'enable-ntsync': 'False',
             'enable-wow64': 'False',
             'language': lang,
+            'components-check-hours': '24',
+            'echo-output': 'True',
+            'launch-worker': 'False',
+            'logs-max-mb': '512',
         }
 
         self.config = {}
@@ -198,13 +255,308 @@ class ConfigManager:
                 else:
                     f.write(f'{key}={value}\n')
 
+class LaunchSpec:
+    env_name = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+    def __init__(self):
+        self.env = {}
+        self.argv = []
+
+    @classmethod
+    def from_message(cls, message):
+        spec = cls()
+        spec.extend(message)
+        return spec
+
+    def extend(self, fragment):
+        # Accepts the shell-style strings stored in games.json and shortcuts, e.g.
+        # "MANGOHUD=1 gamemoderun '/usr/bin/umu-run' '/path/game.exe' -dx11".
+        # Leading assignments become environment like in a shell, once a command has been
+        # seen they are arguments, e.g. for "gamescope -- FOO=1".
+        if not fragment:
+            return
+        try:
+            tokens = shlex.split(self.expand(fragment))
+        except ValueError:
+            tokens = fragment.split()
+        for token in tokens:
+            name, sep, value = token.partition("=")
+            if sep and not self.argv and self.env_name.fullmatch(name):
+                self.env[name] = value
+            else:
+                self.argv.append(token)
+
+    @staticmethod
+    def expand(fragment):
+        # $VAR, ${VAR} and a leading ~ are expanded the way bash -c used to, e.g.
+        # "LD_PRELOAD=$HOME/x.so" or "~/mods". Single-quoted text and backslash
+        # escapes are left alone, which covers the paths the launcher quotes.
+        result = []
+        plain = []
+        quote = None
+        index = 0
+        while index < len(fragment):
+            char = fragment[index]
+            if quote != "'" and char == "\\" and index + 1 < len(fragment):
+                result.append(os.path.expandvars("".join(plain)))
+                plain.clear()
+                result.append(fragment[index:index + 2])
+                index += 2
+                continue
+            if quote == "'":
+                result.append(char)
+                if char == "'":
+                    quote = None
+            elif char == "'" and quote is None:
+                result.append(os.path.expandvars("".join(plain)))
+                plain.clear()
+                result.append(char)
+                quote = char
+            else:
+                if char == '"':
+                    quote = None if quote == '"' else '"'
+                previous = fragment[index - 1] if index else " "
+                following = fragment[index + 1] if index + 1 < len(fragment) else " "
+                if char == "~" and quote is None and (previous.isspace() or previous == "=") and (following == "/" or following.isspace()):
+                    char = shlex.quote(os.path.expanduser("~"))
+                plain.append(char)
+            index += 1
+        result.append(os.path.expandvars("".join(plain)))
+        return "".join(result)
+
+    def append(self, *args):
+        self.argv.extend(args)
+
+    def setdefault(self, key, value):
+        self.env.setdefault(key, value)
+
+    def has_command(self, name):
+        return any(os.path.basename(arg) == name for arg in self.argv)
+
+    def environment(self):
+        env = dict(os.environ)
+        env.update(self.env)
+        return env
+
+class LaunchTrace:
+    def __init__(self, gameid, started):
+        # Marks are seconds on the monotonic clock since the Play click, or since
+        # faugus-run started when it was not launched from the launcher
+        self.gameid = gameid
+        self.created = time.time()
+        self.marks = {}
+        self.path = None
+        self.origin = started
+        # Popped so the game and anything it starts do not inherit the click time
+        clicked = os.environ.pop("FAUGUS_TRACE", None)
+        if clicked:
+            try:
+                self.origin = float(clicked)
+                self.mark("click", self.origin)
+            except ValueError:
+                pass
+        self.mark("faugus-run start", started)
+
+    def mark(self, name, when=None):
+        # Only the first occurrence of a mark counts
+        if name not in self.marks:
+            when = time.monotonic() if when is None else when
+            self.marks[name] = round(when - self.origin, 4)
+
+    def save(self):
+        directory = os.path.join(traces_dir, self.gameid)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            if self.path is None:
+                stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.created))
+                self.path = os.path.join(directory, f"{stamp}-{os.getpid()}.json")
+                self.prune(directory)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump({"gameid": self.gameid, "created": self.created, "marks": self.marks}, f, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Failed to save the launch trace: {e}")
+
+    def prune(self, directory):
+        traces = sorted(name for name in os.listdir(directory) if name.endswith(".json"))
+        for name in traces[:max(len(traces) - TRACE_KEEP + 1, 0)]:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+def percentile(values, pct):
+    # Nearest-rank percentile of an already sorted list
+    return values[max(math.ceil(pct / 100 * len(values)) - 1, 0)]
+
+def trace_report(gameid, launches=TRACE_REPORT_LAUNCHES):
+    directory = os.path.join(traces_dir, gameid)
+    try:
+        names = sorted(name for name in os.listdir(directory) if name.endswith(".json"))[-launches:]
+    except OSError:
+        names = []
+
+    traces = []
+    for name in names:
+        try:
+            with open(os.path.join(directory, name), "r") as f:
+                traces.append(json.load(f).get("marks", {}))
+        except (OSError, ValueError, AttributeError):
+            continue
+
+    if not traces:
+        print(f"No launch traces for {gameid}.")
+        return
+
+    print(f"{gameid}: {len(traces)} launches")
+    print(f"{'phase':<28}{'launches':>9}{'p50':>10}{'p95':>10}")
+    for phase, start, end in TRACE_PHASES:
+        durations = sorted(marks[end] - marks[start] for marks in traces if start in marks and end in marks)
+        if durations:
+            print(f"{phase:<28}{len(durations):>9}{percentile(durations, 50):>9.2f}s{percentile(durations, 95):>9.2f}s")
+
+def log_compression():
+    # zstd when this Python ships it (3.14 and later), gzip otherwise
+    try:
+        from compression import zstd
+        return ".zst", lambda path: zstd.open(path, "wb")
+    except ImportError:
+        import gzip
+        return ".gz", lambda path: gzip.open(path, "wb", compresslevel=6)
+
+class LogManager:
+    def __init__(self, log_dir, budget_mb):
+        # Segments are named after the time they were closed, so their names sort oldest first.
+        # Moving umu.log aside is a rename, the copying, compressing and pruning happen in order
+        # on one background thread.
+        self.log_dir = log_dir
+        self.history_dir = os.path.join(log_dir, "history")
+        self.budget = budget_mb * 1024 * 1024
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.pending = set()
+
+    def start_session(self):
+        # The previous session's logs become history before umu-run and Proton replace them
+        try:
+            names = os.listdir(self.log_dir)
+        except OSError:
+            names = []
+        for name in names:
+            if name.endswith(".log"):
+                self.archive(os.path.join(self.log_dir, name))
+        self.executor.submit(self.enforce_budget)
+
+    def segment_path(self, path):
+        stem = os.path.basename(path)[:-len(".log")]
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        segment = os.path.join(self.history_dir, f"{stem}.{stamp}.log")
+        count = 1
+        while any(os.path.exists(segment + ext) for ext in ("", ".gz", ".zst")):
+            segment = os.path.join(self.history_dir, f"{stem}.{stamp}-{count}.log")
+            count += 1
+        return segment
+
+    def archive(self, path):
+        # For logs that are closed, or that faugus-run reopens right after
+        try:
+            os.makedirs(self.history_dir, exist_ok=True)
+            segment = self.segment_path(path)
+            os.rename(path, segment)
+        except OSError as e:
+            print(f"Failed to rotate {path}: {e}")
+            return
+        self.executor.submit(self.compress, segment)
+
+    def archive_copy(self, path):
+        # For Proton's log, which stays open in Wine until the game exits
+        if path not in self.pending:
+            self.pending.add(path)
+            self.executor.submit(self.copy_truncate, path)
+
+    def copy_truncate(self, path):
+        # Proton does not open its log for appending, so after the truncation Wine keeps writing
+        # past a hole where the old lines were. Only the part of the file holding data is copied.
+        # Lines written while the copy runs are lost.
+        try:
+            os.makedirs(self.history_dir, exist_ok=True)
+            segment = self.segment_path(path)
+            with open(path, "rb") as source, open(segment, "wb") as target:
+                try:
+                    source.seek(os.lseek(source.fileno(), 0, os.SEEK_DATA))
+                except OSError:
+                    source.seek(0, os.SEEK_END)
+                # The hole ends on a block boundary, the rest of that block is zeros
+                target.write(source.read(READ_SIZE).lstrip(b"\0"))
+                shutil.copyfileobj(source, target, READ_SIZE * 16)
+                os.truncate(path, 0)
+        except OSError as e:
+            print(f"Failed to rotate {path}: {e}")
+            return
+        finally:
+            self.pending.discard(path)
+        self.compress(segment)
+
+    def compress(self, segment):
+        ext, open_compressed = log_compression()
+        temp_path = f"{segment}{ext}.tmp"
+        try:
+            with open(segment, "rb") as source, open_compressed(temp_path) as target:
+                shutil.copyfileobj(source, target, READ_SIZE * 16)
+            os.replace(temp_path, segment + ext)
+            os.remove(segment)
+        except OSError as e:
+            print(f"Failed to compress {segment}: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        self.enforce_budget()
+
+    def enforce_budget(self):
+        # Everything under logs_dir counts against the budget, only history segments are removed
+        total = 0
+        segments = []
+        for root, dirs, files in os.walk(logs_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                size = stat.st_blocks * 512
+                total += size
+                if os.path.basename(root) == "history" and not name.endswith(".tmp"):
+                    segments.append((stat.st_mtime, size, path))
+
+        for mtime, size, path in sorted(segments):
+            if total <= self.budget:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
 class FaugusRun:
-    def __init__(self, message):
-        self.message = message
+    def __init__(self, spec, trace=None):
+        self.spec = spec
+        self.trace = trace
         self.process = None
         self.warning_dialog = None
         self.log_window = None
         self.text_view = None
+        self.output_watches = {}
+        self.output_pipes = {}
+        self.partial_lines = {}
+        self.log_file = None
+        self.log_flush_id = None
+        self.log_manager = None
+        self.log_bytes = 0
+        self.log_check_id = None
         self.load_config()
 
     def show_error_dialog(self, protonpath):
@@ -256,7 +608,7 @@ class FaugusRun:
         Gtk.main_quit()
         sys.exit()
 
-    def update_protonpath(self, message):
+    def update_protonpath(self):
 
         versions = [
             d for d in os.listdir(compatibility_dir)
@@ -264,19 +616,18 @@ class FaugusRun:
         ]
 
         if not versions:
-            return message
+            return
 
         versions.sort(key=lambda v: [int(x) for x in re.findall(r'\d+', v)], reverse=True)
-        latest_version = versions[0]
-        updated_message = re.sub(r'PROTONPATH=Proton-EM\b', f'PROTONPATH={latest_version}', message)
-        return updated_message
+        self.spec.env["PROTONPATH"] = versions[0]
 
     def update_test(self):
-        if "Proton-EM" in self.message:
-            self.message = self.update_protonpath(self.message)
+        if self.spec.env.get("PROTONPATH") == "Proton-EM":
+            self.update_protonpath()
 
     def start_process(self, command):
-        protonpath = next((part.split('=')[1] for part in self.message.split() if part.startswith("PROTONPATH=")), None)
+        env = self.spec.env
+        protonpath = env.get("PROTONPATH")
         if protonpath and protonpath != "GE-Proton" and protonpath != "Proton-EM":
             protonpath_path = Path(share_dir) / 'Steam/compatibilitytools.d' / protonpath
             if not protonpath_path.is_dir():
@@ -290,54 +641,41 @@ class FaugusRun:
         if self.default_runner == "Proton-EM Latest":
             self.default_runner = "Proton-EM"
 
-        self.discrete_gpu = "DRI_PRIME=1"
-        if not self.discrete_gpu:
-            self.discrete_gpu = "DRI_PRIME=0"
-        if self.discrete_gpu:
-            self.discrete_gpu = "DRI_PRIME=1"
-        if self.discrete_gpu == None:
-            self.discrete_gpu = "DRI_PRIME=1"
-
-        if "WINEPREFIX" not in self.message:
-            if self.default_runner:
-                if "PROTONPATH" not in self.message:
-                    if "UMU_NO_PROTON" not in self.message:
-                        self.message = f'WINEPREFIX="{self.default_prefix}/default" PROTONPATH={self.default_runner} {self.message}'
-                else:
-                    self.message = f'WINEPREFIX="{self.default_prefix}/default" {self.message}'
+        # Values from the game entry always win over the defaults below
+        if "WINEPREFIX" not in env:
+            if self.default_runner and "PROTONPATH" not in env:
+                if "UMU_NO_PROTON" not in env:
+                    env["WINEPREFIX"] = f"{self.default_prefix}/default"
+                    env["PROTONPATH"] = self.default_runner
             else:
-                self.message = f'WINEPREFIX="{self.default_prefix}/default" {self.message}'
-        if "gamemoderun" in self.message:
+                env["WINEPREFIX"] = f"{self.default_prefix}/default"
+        if self.spec.has_command("gamemoderun"):
             self.set_ld_preload()
-            self.message = f'LD_PRELOAD={self.ld_preload} {self.message}'
+            # An LD_PRELOAD from the launch arguments came later in the old command line and won
+            self.spec.setdefault("LD_PRELOAD", self.ld_preload)
 
-        if not "winetricks-gui" in self.message:
-            for part in self.message.split():
-                if part.startswith("GAMEID="):
-                    game_id = part.split("=")[1]
-                    if "umu" not in game_id:
-                        self.message = f'PROTONFIXES_DISABLE=1 {self.message}'
-                    break
+        game_id = env.get("GAMEID")
+        if game_id and game_id != "winetricks-gui" and "umu" not in game_id:
+            self.spec.setdefault("PROTONFIXES_DISABLE", "1")
 
-        if "proton-cachyos" in self.message:
-            if "slr" not in self.message:
-                self.message = f'UMU_NO_RUNTIME=1 {self.message}'
+        protonpath = env.get("PROTONPATH", "")
+        if "proton-cachyos" in protonpath and "slr" not in protonpath:
+            self.spec.setdefault("UMU_NO_RUNTIME", "1")
 
         if self.wayland_driver:
-            self.message = f'PROTON_ENABLE_WAYLAND=1 {self.message}'
+            self.spec.setdefault("PROTON_ENABLE_WAYLAND", "1")
             if self.enable_hdr:
-                self.message = f'PROTON_ENABLE_HDR=1 {self.message}'
+                self.spec.setdefault("PROTON_ENABLE_HDR", "1")
         if self.enable_ntsync:
-            self.message = f'PROTON_USE_NTSYNC=1 {self.message}'
+            self.spec.setdefault("PROTON_USE_NTSYNC", "1")
         if self.enable_wow64:
-            self.message = f'PROTON_USE_WOW64=1 {self.message}'
+            self.spec.setdefault("PROTON_USE_WOW64", "1")
         if self.lossless_location:
-            self.message = f'LSFG_DLL_PATH="{self.lossless_location}" {self.message}'
+            self.spec.setdefault("LSFG_DLL_PATH", self.lossless_location)
 
-        if self.enable_logging:
-            match = re.search(r"FAUGUS_LOG=(?:'([^']*)'|\"([^\"]*)\"|(\S+))", self.message)
-            if match:
-                self.game_title = next(g for g in match.groups() if g).split("/")[-1]
+        if self.enable_logging and env.get("FAUGUS_LOG"):
+            self.game_title = env["FAUGUS_LOG"].split("/")[-1]
+            self.log_manager = LogManager(f"{logs_dir}/{self.game_title}", self.logs_max_mb)
 
         self.load_env_from_file(envar_dir)
         self.run_processes_sequentially()
@@ -356,82 +694,92 @@ class FaugusRun:
             pass
 
     def run_processes_sequentially(self):
-        if "UMU_NO_PROTON" not in self.message:
-            if self.enable_logging:
-                self.message = f'UMU_LOG=1 PROTON_LOG_DIR={logs_dir}/{self.game_title} PROTON_LOG=1 {self.message}'
-
-        if "Proton-EM" in self.message:
-            self.process = subprocess.Popen(
-                [PathManager.find_binary("bash"), "-c", f"{faugus_proton_downloader}"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                bufsize=8192,
-                text=True
-            )
+        if self.log_manager:
+            self.log_manager.start_session()
+            self.log_check_id = GLib.timeout_add_seconds(LOG_CHECK_SECONDS, self.check_log_sizes)
 
-            self.stdout_watch_id = GLib.io_add_watch(
-                self.process.stdout,
-                GLib.PRIORITY_LOW,
-                GLib.IO_IN,
-                self.on_output
-            )
-            self.stderr_watch_id = GLib.io_add_watch(
-                self.process.stderr,
-                GLib.PRIORITY_LOW,
-                GLib.IO_IN,
-                self.on_output
-            )
+        if "UMU_NO_PROTON" not in self.spec.env:
+            if self.enable_logging:
+                self.spec.setdefault("UMU_LOG", "1")
+                self.spec.setdefault("PROTON_LOG_DIR", f"{logs_dir}/{self.game_title}")
+                self.spec.setdefault("PROTON_LOG", "1")
 
-            GLib.child_watch_add(
-                GLib.PRIORITY_DEFAULT,
-                self.process.pid,
-                self.on_proton_downloader_finished
-            )
+        if self.spec.env.get("PROTONPATH") == "Proton-EM":
+            self.mark_trace("proton-downloader start")
+            self.spawn([faugus_proton_downloader], self.on_proton_downloader_finished)
         else:
-            self.execute_final_command()
+            self.run_components()
 
     def on_proton_downloader_finished(self, pid, status):
-        if hasattr(self, 'stdout_watch_id'):
-            GLib.source_remove(self.stdout_watch_id)
-        if hasattr(self, 'stderr_watch_id'):
-            GLib.source_remove(self.stderr_watch_id)
+        self.finish_output()
+        self.mark_trace("proton-downloader end")
         self.update_test()
 
+        self.run_components()
+
+    def run_components(self):
+        if "UMU_NO_PROTON" in self.spec.env:
+            self.execute_final_command()
+        else:
+            self.mark_trace("components start")
+            self.spawn([faugus_components], self.on_components_finished)
+
+    def on_components_finished(self, pid, status):
+        self.finish_output()
+        self.mark_trace("components end")
         self.execute_final_command()
 
     def execute_final_command(self):
-        if "UMU_NO_PROTON" not in self.message:
-            cmd = f"{faugus_components}; {self.discrete_gpu} {eac_dir} {be_dir} {self.message}"
-        else:
-            cmd = f"{self.discrete_gpu} {eac_dir} {be_dir} {self.message}"
-
-        self.process = subprocess.Popen(
-            [PathManager.find_binary("bash"), "-c", cmd],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            bufsize=8192,
-            text=True
-        )
+        self.spec.setdefault("DRI_PRIME", "1")
+        self.spec.setdefault("PROTON_EAC_RUNTIME", eac_dir)
+        self.spec.setdefault("PROTON_BATTLEYE_RUNTIME", be_dir)
 
-        self.stdout_watch_id = GLib.io_add_watch(
-            self.process.stdout,
-            GLib.PRIORITY_LOW,
-            GLib.IO_IN,
-            self.on_output
-        )
-        self.stderr_watch_id = GLib.io_add_watch(
-            self.process.stderr,
-            GLib.PRIORITY_LOW,
-            GLib.IO_IN,
-            self.on_output
-        )
+        self.mark_trace("umu-run start")
+        self.spawn(self.spec.argv, self.on_process_exit, self.spec.environment())
+
+    def spawn(self, argv, on_exit, env=None):
+        try:
+            self.process = subprocess.Popen(
+                argv,
+                env=env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+        except (OSError, IndexError) as e:
+            print(f"Failed to run {argv[0] if argv else 'command'}: {e}")
+            GLib.idle_add(on_exit, 0, 127)
+            return
+
+        # The pipes are read with os.read, never through the file objects
+        for pipe in (self.process.stdout, self.process.stderr):
+            fd = pipe.fileno()
+            os.set_blocking(fd, False)
+            self.partial_lines[fd] = b""
+            self.output_pipes[fd] = pipe
+            self.output_watches[fd] = GLib.io_add_watch(
+                fd,
+                GLib.PRIORITY_LOW,
+                GLib.IO_IN | GLib.IO_HUP | GLib.IO_ERR,
+                self.on_output
+            )
 
         GLib.child_watch_add(
             GLib.PRIORITY_DEFAULT,
             self.process.pid,
-            self.on_process_exit
+            on_exit
         )
 
+    def mark_trace(self, name):
+        if self.trace:
+            self.trace.mark(name)
+
+    def finish_output(self):
+        # The child can exit before its last output was read
+        for fd in list(self.output_watches):
+            GLib.source_remove(self.output_watches[fd])
+            self.drain_output(fd)
+            self.close_output(fd)
+
     def set_ld_preload(self):
         lib_paths = [
             PathManager.find_library('libgamemode.so.0'),
@@ -455,6 +803,11 @@ class FaugusRun:
         self.enable_ntsync = cfg.config.get('enable-ntsync', 'False') == 'True'
         self.enable_wow64 = cfg.config.get('enable-wow64', 'False') == 'True'
         self.language = cfg.config.get('language', '')
+        self.echo_output = cfg.config.get('echo-output', 'True') == 'True'
+        try:
+            self.logs_max_mb = max(float(cfg.config.get('logs-max-mb', '512')), 0)
+        except ValueError:
+            self.logs_max_mb = 512
 
     def show_warning_dialog(self):
         self.warning_dialog = Gtk.Window(title="Faugus Launcher")
@@ -484,11 +837,11 @@ class FaugusRun:
         image.set_margin_bottom(20)
         grid.attach(image, 0, 0, 1, 1)
 
-        protonpath = next((part.split('=')[1] for part in self.message.split() if part.startswith("PROTONPATH=")), None)
+        protonpath = self.spec.env.get("PROTONPATH")
         if protonpath == "Using UMU-Proton":
             protonpath = "UMU-Proton Latest"
         if not protonpath:
-            if "UMU_NO_PROTON" in self.message:
+            if "UMU_NO_PROTON" in self.spec.env:
                 protonpath = "Linux Native"
             else:
                 protonpath = "Using UMU-Proton Latest"
@@ -529,41 +882,125 @@ class FaugusRun:
         self.log_window.connect("delete-event", self.on_log_window_delete_event)
         self.log_window.show_all()
 
-    def on_output(self, source, condition):
-        if self.enable_logging:
-            log_dir = f"{logs_dir}/{self.game_title}"
-            if not os.path.exists(log_dir):
-                os.makedirs(log_dir)
-
-            if not hasattr(self, "_log_file_cleaned"):
-                with open(f"{log_dir}/umu.log", "w") as log_file:
-                    log_file.write("")
-                self._log_file_cleaned = True
+    def on_output(self, fd, condition):
+        if self.drain_output(fd):
+            return True
+        self.close_output(fd)
+        return False
 
-        def remove_ansi_escape(text):
-            ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-            return ansi_escape.sub('', text)
+    def drain_output(self, fd):
+        # Read everything the pipe holds in one wakeup and handle it line by line
+        chunks = []
+        open_pipe = True
+        while True:
+            try:
+                data = os.read(fd, READ_SIZE)
+            except BlockingIOError:
+                break
+            except OSError:
+                open_pipe = False
+                break
+            if not data:
+                open_pipe = False
+                break
+            chunks.append(data)
+
+        data = self.partial_lines.get(fd, b"") + b"".join(chunks)
+        lines = data.split(b"\n")
+        self.partial_lines[fd] = lines.pop() if open_pipe else b""
+        if lines and lines[-1] == b"" and not open_pipe:
+            lines.pop()
+        if lines:
+            self.process_lines(lines)
+        return open_pipe
+
+    def close_output(self, fd):
+        self.output_watches.pop(fd, None)
+        self.partial_lines.pop(fd, None)
+        pipe = self.output_pipes.pop(fd, None)
+        if pipe:
+            pipe.close()
+
+    def process_lines(self, lines):
+        clean_lines = [ansi_escape.sub(b"", line).decode("utf-8", "replace").strip() for line in lines]
 
-        if line := source.readline():
-            clean_line = remove_ansi_escape(line).strip()
+        if self.enable_logging:
+            self.write_log(clean_lines)
 
-            if self.enable_logging:
-                with open(f"{log_dir}/umu.log", "a") as log_file:
-                    log_file.write(clean_line + "\n")
-                    log_file.flush()
+        if self.trace and "umu-run start" in self.trace.marks:
+            self.trace.mark("first output")
 
-            self.check_game_output(clean_line)
+        winetricks = "winetricks" in self.spec.env.get("GAMEID", "")
+        echo = []
+        for line, clean_line in zip(lines, clean_lines):
+            if self.warning_dialog:
+                self.check_game_output(clean_line)
 
-            if "libgamemode.so.0" in clean_line or "libgamemodeauto.so.0" in clean_line or "libgamemode.so" in clean_line:
-                return True
+            if "libgamemode.so" in clean_line or "libgamemodeauto.so.0" in clean_line:
+                continue
 
-            if "winetricks" in self.message:
+            if winetricks:
                 self.append_to_text_view(clean_line)
-            else:
-                print(line, end='')
+            elif self.echo_output:
+                echo.append(line)
 
+        if echo:
+            sys.stdout.buffer.write(b"\n".join(echo) + b"\n")
+            sys.stdout.flush()
+
+    def write_log(self, clean_lines):
+        if self.log_file is None:
+            log_dir = f"{logs_dir}/{self.game_title}"
+            os.makedirs(log_dir, exist_ok=True)
+            self.log_file = open(f"{log_dir}/umu.log", "w", encoding="utf-8", buffering=LOG_BUFFER_SIZE)
+            self.log_bytes = 0
+            if self.log_flush_id is None:
+                self.log_flush_id = GLib.timeout_add_seconds(1, self.flush_log)
+        text = "\n".join(clean_lines) + "\n"
+        self.log_file.write(text)
+        self.log_bytes += len(text.encode("utf-8"))
+
+        # The next line starts a new umu.log
+        if self.log_manager and self.log_bytes >= LOG_SEGMENT_BYTES:
+            self.log_file.close()
+            self.log_file = None
+            self.log_manager.archive(f"{logs_dir}/{self.game_title}/umu.log")
+
+    def check_log_sizes(self):
+        # Proton writes its own log, so its size is checked from here
+        log_dir = f"{logs_dir}/{self.game_title}"
+        try:
+            names = os.listdir(log_dir)
+        except OSError:
+            return True
+        for name in names:
+            if name.startswith("steam-") and name.endswith(".log"):
+                path = os.path.join(log_dir, name)
+                try:
+                    if os.stat(path).st_blocks * 512 >= LOG_SEGMENT_BYTES:
+                        self.log_manager.archive_copy(path)
+                except OSError:
+                    pass
         return True
 
+    def flush_log(self):
+        if self.log_file:
+            self.log_file.flush()
+            return True
+        self.log_flush_id = None
+        return False
+
+    def close_log(self):
+        if self.log_flush_id:
+            GLib.source_remove(self.log_flush_id)
+            self.log_flush_id = None
+        if self.log_check_id:
+            GLib.source_remove(self.log_check_id)
+            self.log_check_id = None
+        if self.log_file:
+            self.log_file.close()
+            self.log_file = None
+
     def check_game_output(self, clean_line):
         if "Downloading" in clean_line or "Updating BattlEye..." in clean_line or "Updating Easy Anti-Cheat..." in clean_line:
             self.warning_dialog.show_all()
@@ -604,13 +1041,26 @@ class FaugusRun:
         if "Proton installed successfully" in clean_line:
             self.label.set_text(_("Proton-EM is up to date"))
 
-        if "UMU_NO_PROTON" in self.message:
+        if self.trace:
+            if "steamrt3 is up to date" in clean_line or "mtree is OK" in clean_line:
+                self.trace.mark("runtime checked")
+            if "Proton is up to date" in clean_line or ("->" in clean_line and "Proton" in clean_line):
+                self.trace.mark("proton checked")
+
+        if "UMU_NO_PROTON" in self.spec.env:
             if "steamrt3 is up to date" in clean_line or "mtree is OK" in clean_line:
+                self.trace_game_started()
                 GLib.timeout_add_seconds(0, self.close_warning_dialog)
         else:
             if "fsync: up and running." in clean_line or "Command exited with status: 0" in clean_line or "SingleInstance" in clean_line or "Using winetricks" in clean_line:
+                self.trace_game_started()
                 GLib.timeout_add_seconds(0, self.close_warning_dialog)
 
+    def trace_game_started(self):
+        if self.trace and "game started" not in self.trace.marks:
+            self.trace.mark("game started")
+            self.trace.save()
+
     def append_to_text_view(self, clean_line):
         if self.text_view:
 
@@ -638,9 +1088,9 @@ class FaugusRun:
         return True
 
     def show_exit_warning(self):
-        parts = self.message.split()
+        parts = self.spec.argv
         if parts:
-            last_part = parts[-1].strip('"')
+            last_part = parts[-1]
 
             if last_part.endswith(".reg"):
                 dialog = Gtk.Dialog(title="Faugus Launcher", modal=True)
@@ -687,16 +1137,20 @@ class FaugusRun:
                 sys.exit()
 
     def on_process_exit(self, pid, condition):
-        if self.process.poll() is not None:
-            GLib.idle_add(self.close_warning_dialog)
-            GLib.idle_add(self.close_log_window)
-            GLib.idle_add(self.show_exit_warning)
-            GLib.idle_add(Gtk.main_quit)
+        self.finish_output()
+        self.close_log()
+        if self.trace:
+            self.trace.mark("exit")
+            self.trace.save()
+        GLib.idle_add(self.close_warning_dialog)
+        GLib.idle_add(self.close_log_window)
+        GLib.idle_add(self.show_exit_warning)
+        GLib.idle_add(Gtk.main_quit)
         return False
 
 
-def handle_command(message, command=None):
-    updater = FaugusRun(message)
+def handle_command(spec, command=None, trace=None):
+    updater = FaugusRun(spec, trace)
     updater.show_warning_dialog()
     if command == "winetricks":
         updater.show_log_window()
@@ -707,12 +1161,15 @@ def handle_command(message, command=None):
     process_thread = Thread(target=run_process)
 
     def start_thread():
+        updater.mark_trace("faugus-run ready")
         process_thread.start()
 
     GLib.idle_add(start_thread)
     Gtk.main()
 
     process_thread.join()
+    if updater.log_manager:
+        updater.log_manager.close()
     sys.exit(0)
 
 def apply_dark_theme():
@@ -740,7 +1197,7 @@ def apply_dark_theme():
         if is_dark_theme:
             Gtk.Settings.get_default().set_property("gtk-application-prefer-dark-theme", True)
 
-def build_launch_command(game):
+def build_launch_spec(game):
     gameid = game.get("gameid", "")
     path = game.get("path", "")
     prefix = game.get("prefix", "")
@@ -755,59 +1212,97 @@ def build_launch_command(game):
     addapp_checkbox = game.get("addapp_checkbox", "")
     lossless = game.get("lossless", "")
 
-    if lossless == "Off":
-        lossless = ""
-    elif lossless == "X1":
-        lossless = "LSFG_LEGACY=1 LSFG_MULTIPLIER=1"
-    elif lossless == "X2":
-        lossless = "LSFG_LEGACY=1 LSFG_MULTIPLIER=2"
-    elif lossless == "X3":
-        lossless = "LSFG_LEGACY=1 LSFG_MULTIPLIER=3"
-    elif lossless == "X4":
-        lossless = "LSFG_LEGACY=1 LSFG_MULTIPLIER=4"
-
-    command_parts = []
+    spec = LaunchSpec()
 
     if gameid:
-        command_parts.append(f"FAUGUS_LOG='{gameid}'")
-    if mangohud:
-        command_parts.append(mangohud)
-    if disable_hidraw:
-        command_parts.append(disable_hidraw)
+        spec.env["FAUGUS_LOG"] = gameid
+    # mangohud, disable_hidraw and gamemode are stored as ready-made fragments
+    spec.extend(mangohud)
+    spec.extend(disable_hidraw)
     if runner != "Linux-Native" and prefix:
-        command_parts.append(f"WINEPREFIX='{prefix}'")
-    if protonfix:
-        command_parts.append(f"GAMEID={protonfix}")
-    else:
-        command_parts.append(f"GAMEID={game['gameid']}")
+        spec.env["WINEPREFIX"] = prefix
+    spec.env["GAMEID"] = protonfix or gameid
     if runner:
         if runner == "Linux-Native":
-            command_parts.append('UMU_NO_PROTON=1')
+            spec.env["UMU_NO_PROTON"] = "1"
         else:
-            command_parts.append(f"PROTONPATH={runner}")
-    if gamemode:
-        command_parts.append(gamemode)
-    if launch_arguments:
-        command_parts.append(launch_arguments)
-    if lossless:
-        command_parts.append(lossless)
+            spec.env["PROTONPATH"] = runner
+    spec.extend(gamemode)
+    spec.extend(launch_arguments)
+    if lossless in ("X1", "X2", "X3", "X4"):
+        spec.env["LSFG_LEGACY"] = "1"
+        spec.env["LSFG_MULTIPLIER"] = lossless[1:]
 
-    command_parts.append(f"'{umu_run}'")
+    spec.append(umu_run)
 
     if addapp_checkbox == "addapp_enabled":
-        command_parts.append(f"'{addapp_bat}'")
+        spec.append(addapp_bat)
     else:
-        command_parts.append(f"'{path}'")
+        spec.append(path)
+
+    spec.extend(game_arguments)
 
-    if game_arguments:
-        command_parts.append(game_arguments)
+    return spec
+
+def load_game_from_index(gameid):
+    # games.idx holds the byte range of every entry, valid only while games.json is unchanged
+    try:
+        with open(games_index, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        stat = os.stat(games_dir)
+        if index.get("size") != stat.st_size or index.get("mtime_ns") != stat.st_mtime_ns:
+            return None
+        entry = index.get("games", {}).get(gameid)
+        if not entry:
+            return None
+        offset, length = entry
+        with open(games_dir, "rb") as f:
+            f.seek(offset)
+            game = json.loads(f.read(length).decode("utf-8"))
+    except (OSError, ValueError, TypeError, AttributeError):
+        return None
+
+    if isinstance(game, dict) and game.get("gameid") == gameid:
+        return game
+    return None
+
+# Every game by id, kept up to date by the launch worker before each fork
+games_cache = None
+
+def refresh_games_cache():
+    global games_cache
+    try:
+        stat = os.stat(games_dir)
+        stamp = (stat.st_size, stat.st_mtime_ns)
+        if games_cache and games_cache[0] == stamp:
+            return
+        with open(games_dir, "r", encoding="utf-8") as f:
+            games = json.load(f)
+        games_cache = (stamp, {game.get("gameid"): game for game in games if isinstance(game, dict)})
+    except (OSError, ValueError, TypeError):
+        games_cache = None
 
-    return " ".join(command_parts)
+def load_game_from_cache(gameid):
+    try:
+        stat = os.stat(games_dir)
+    except OSError:
+        return None
+    if games_cache and games_cache[0] == (stat.st_size, stat.st_mtime_ns):
+        return games_cache[1].get(gameid)
+    return None
 
 def load_game_from_json(gameid):
     if not os.path.exists(games_dir):
         return None
 
+    game = load_game_from_cache(gameid)
+    if game is not None:
+        return game
+
+    game = load_game_from_index(gameid)
+    if game is not None:
+        return game
+
     try:
         with open(games_dir, "r", encoding="utf-8") as f:
             games = json.load(f)
@@ -820,25 +1315,163 @@ def load_game_from_json(gameid):
 
     return None
 
-def main():
-    apply_dark_theme()
+def open_worker_socket():
+    # systemd socket activation hands over the listening socket as fd 3
+    if os.environ.get("LISTEN_PID") == str(os.getpid()) and os.environ.get("LISTEN_FDS", "0") != "0":
+        for key in ("LISTEN_PID", "LISTEN_FDS", "LISTEN_FDNAMES"):
+            os.environ.pop(key, None)
+        return socket.socket(fileno=3)
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(worker_socket_path)
+        print("The faugus-run worker is already running.")
+        return None
+    except OSError:
+        pass
+    finally:
+        probe.close()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        os.makedirs(os.path.dirname(worker_socket_path), exist_ok=True)
+        if os.path.exists(worker_socket_path):
+            os.unlink(worker_socket_path)
+        server.bind(worker_socket_path)
+        os.chmod(worker_socket_path, 0o600)
+        server.listen(8)
+    except OSError as e:
+        server.close()
+        print(f"Failed to open {worker_socket_path}: {e}")
+        return None
+    return server
+
+def read_worker_request(conn):
+    # One JSON line with argv, cwd and env, sent along with the client's stdin, stdout and stderr
+    conn.settimeout(5)
+    data, fds, flags, address = socket.recv_fds(conn, READ_SIZE, 3)
+    try:
+        while data and not data.endswith(b"\n"):
+            chunk = conn.recv(READ_SIZE)
+            if not chunk:
+                break
+            data += chunk
+        request = json.loads(data)
+        if not isinstance(request, dict) or len(fds) != 3:
+            raise ValueError("malformed request")
+    except (OSError, ValueError):
+        for fd in fds:
+            os.close(fd)
+        raise
+    return request, fds
+
+def run_worker():
+    # Keeps the interpreter and libraries loaded and forks a faugus-run per request, so a
+    # launch only pays for what happens after GTK is initialized
+    server = open_worker_socket()
+    if server is None:
+        return
+
+    repository = gi.Repository.get_default()
+    for namespace, version in (("GLib", "2.0"), ("Gio", "2.0"), ("GdkPixbuf", "2.0"), ("Gdk", "3.0"), ("Gtk", "3.0")):
+        try:
+            repository.require(namespace, version)
+        except Exception as e:
+            print(f"Failed to preload {namespace}: {e}")
+
+    # Forked launches are reaped by the kernel
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+
+    while True:
+        try:
+            conn, address = server.accept()
+        except InterruptedError:
+            continue
+
+        try:
+            request, fds = read_worker_request(conn)
+        except (OSError, ValueError) as e:
+            print(f"Invalid launch request: {e}")
+            conn.close()
+            continue
+
+        refresh_games_cache()
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+        pid = os.fork()
+        if pid == 0:
+            server.close()
+            run_worker_launch(conn, request, fds)
+        conn.close()
+        for fd in fds:
+            os.close(fd)
+
+def run_worker_launch(conn, request, fds):
+    # Runs in the forked process and never returns. The client is told the pid first
+    # and the exit status last, so it can treat the launch like its own child process.
+    global process_started
+    process_started = time.monotonic()
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    code = 1
+    try:
+        os.setsid()
+        for target, fd in enumerate(fds):
+            if fd != target:
+                os.dup2(fd, target)
+                os.close(fd)
+        conn.settimeout(None)
+        conn.sendall(f"pid {os.getpid()}\n".encode("ascii"))
+
+        os.environ.clear()
+        os.environ.update(request.get("env", {}))
+        os.chdir(request.get("cwd") or os.path.expanduser("~"))
+        sys.argv = [sys.argv[0]] + list(request.get("argv", []))
+        install_translation()
+
+        main()
+        code = 0
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else int(e.code is not None)
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            conn.sendall(f"exit {code}\n".encode("ascii"))
+        except (OSError, ValueError):
+            pass
+        os._exit(code)
 
+def main():
     parser = argparse.ArgumentParser(description=None)
     parser.add_argument("message", nargs='?')
     parser.add_argument("command", nargs='?', default=None)
     parser.add_argument("--game")
+    parser.add_argument("--worker", action="store_true", help="fork launches from a pre-loaded process")
+    parser.add_argument("--trace-report", metavar="GAMEID", help="summarise the recent launch traces of a game")
 
     args = parser.parse_args()
 
+    if args.worker:
+        run_worker()
+        return
+    if args.trace_report:
+        trace_report(args.trace_report)
+        return
+
+    import_gtk()
+    apply_dark_theme()
+
     if args.game:
         game = load_game_from_json(args.game)
         if not game:
             return
 
-        launch_options = build_launch_command(game)
-        handle_command(launch_options, None)
+        handle_command(build_launch_spec(game), None, LaunchTrace(args.game, process_started))
     else:
-        handle_command(args.message, args.command)
+        handle_command(LaunchSpec.from_message(args.message), args.command)
 
 if __name__ == "__main__":
     main()